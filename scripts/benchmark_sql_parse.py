@@ -0,0 +1,122 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Measure the time spent parsing SQL, with and without the parse cache, over a corpus
+of queries: either the ``.sql`` files given, one query per file, or the latest
+queries run in SQL Lab, read from the metadata database.
+
+    python scripts/benchmark_sql_parse.py queries/*.sql
+    python scripts/benchmark_sql_parse.py --query-history 1000
+"""
+import statistics
+import time
+from typing import Callable, List
+
+import click
+
+from superset import sql_parse
+from superset.sql_parse import ParsedQuery
+
+# Number of times the same query is parsed while being run in SQL Lab: access
+# check, statement splitting, limit, read-only check, comments and metadata
+PARSES_PER_QUERY = 6
+
+
+def load_query_history(limit: int) -> List[str]:
+    # pylint: disable=import-outside-toplevel
+    from superset.app import create_app
+
+    app = create_app()
+    with app.app_context():
+        from superset.extensions import db
+        from superset.models.sql_lab import Query
+
+        queries = (
+            db.session.query(Query.sql).order_by(Query.id.desc()).limit(limit).all()
+        )
+    return [sql for (sql,) in queries if sql]
+
+
+def clear_cache() -> None:
+    sql_parse._parse.cache.clear()  # pylint: disable=protected-access
+    sql_parse._format_without_comments.cache.clear()  # pylint: disable=protected-access
+
+
+def run_query(sql: str, cached: bool = True) -> None:
+    for _ in range(PARSES_PER_QUERY):
+        if not cached:
+            clear_cache()
+        query = ParsedQuery(sql)
+        query.tables  # pylint: disable=pointless-statement
+        query.get_statements()
+        query.is_select()
+        query.is_explain()
+        query.limit  # pylint: disable=pointless-statement
+
+
+def measure(corpus: List[str], run: Callable[[str], None]) -> List[float]:
+    timings = []
+    for sql in corpus:
+        start = time.perf_counter()
+        run(sql)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(name: str, timings: List[float]) -> None:
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    click.echo(
+        f"{name:<10} total {sum(timings):8.3f}s  "
+        f"mean {statistics.mean(timings) * 1000:8.3f}ms  "
+        f"median {statistics.median(timings) * 1000:8.3f}ms  "
+        f"p95 {p95 * 1000:8.3f}ms"
+    )
+
+
+@click.command()
+@click.argument("paths", nargs=-1, type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--query-history",
+    type=int,
+    default=0,
+    help="Number of the latest SQL Lab queries to use as corpus",
+)
+def main(paths: List[str], query_history: int) -> None:
+    corpus = []
+    for path in paths:
+        with open(path) as sql_file:
+            corpus.append(sql_file.read())
+    if query_history:
+        corpus.extend(load_query_history(query_history))
+    if not corpus:
+        raise click.UsageError("Give .sql files or --query-history")
+
+    sizes = [len(sql) for sql in corpus]
+    click.echo(
+        f"{len(corpus)} queries, {min(sizes)} to {max(sizes)} characters, "
+        f"each parsed {PARSES_PER_QUERY} times"
+    )
+
+    report("uncached", measure(corpus, lambda sql: run_query(sql, cached=False)))
+    clear_cache()
+    report("cold", measure(corpus, run_query))
+    report("warm", measure(corpus, run_query))
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,78 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Measure the time spent turning a wide query result into the payload of a time series
+line chart: pivoting the result into one column per series, building the series and
+serializing them to JSON.
+
+    python scripts/benchmark_viz_to_series.py --series 500 --points 10000
+"""
+import time
+from typing import Any, Callable
+from unittest.mock import Mock
+
+import click
+import numpy as np
+import pandas as pd
+
+from superset.utils.core import DTTM_ALIAS
+
+
+def make_df(series: int, points: int) -> pd.DataFrame:
+    """A query result in long format: one row per series and timestamp"""
+    timestamps = pd.date_range("2020-01-01", periods=points, freq="min")
+    return pd.DataFrame(
+        {
+            DTTM_ALIAS: np.tile(timestamps, series),
+            "name": np.repeat([f"series {i}" for i in range(series)], points),
+            "sum__num": np.random.default_rng(0).random(series * points),
+        }
+    )
+
+
+def measure(name: str, func: Callable[[], Any]) -> Any:
+    start = time.perf_counter()
+    result = func()
+    click.echo(f"{name:<14} {time.perf_counter() - start:8.3f}s")
+    return result
+
+
+@click.command()
+@click.option("--series", type=int, default=500, help="Number of series")
+@click.option("--points", type=int, default=10000, help="Number of points per series")
+def main(series: int, points: int) -> None:
+    # pylint: disable=import-outside-toplevel
+    from superset.app import create_app
+
+    app = create_app()
+    with app.app_context():
+        from superset import viz
+
+        df = make_df(series, points)
+        click.echo(f"{series} series of {points} points")
+
+        form_data = {"groupby": ["name"], "metrics": ["sum__num"]}
+        datasource = Mock(type="table")
+        viz_obj = viz.NVD3TimeSeriesViz(datasource, form_data)
+
+        pivoted = measure("process_data", lambda: viz_obj.process_data(df))
+        chart_data = measure("to_series", lambda: viz_obj.to_series(pivoted))
+        measure("json_dumps", lambda: viz_obj.json_dumps(chart_data))
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -35,6 +35,7 @@ from superset.extensions import (
     celery_app,
     csrf,
     db,
+    engine_manager,
     feature_flag_manager,
     machine_auth_provider_factory,
     manifest_processor,
@@ -580,6 +581,7 @@ class SupersetAppInitializer:
 
     def configure_cache(self) -> None:
         cache_manager.init_app(self.flask_app)
+        engine_manager.init_app(self.flask_app)
         results_backend_manager.init_app(self.flask_app)
 
     def configure_feature_flags(self) -> None:
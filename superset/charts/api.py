@@ -486,7 +486,10 @@ class ChartRestApi(BaseSupersetModelRestApi):
             data = result["queries"][0]["data"]
             return CsvResponse(data, headers=generate_download_headers("csv"))
 
-        if result_format == ChartDataResultFormat.JSON:
+        if result_format in (
+            ChartDataResultFormat.JSON,
+            ChartDataResultFormat.JSON_COLUMNAR,
+        ):
             response_data = simplejson.dumps(
                 {"result": result["queries"]},
                 default=json_int_dttm_ser,
@@ -575,7 +578,8 @@ class ChartRestApi(BaseSupersetModelRestApi):
         # TODO: support CSV, SQL query and other non-JSON types
         if (
             is_feature_enabled("GLOBAL_ASYNC_QUERIES")
-            and query_context.result_format == ChartDataResultFormat.JSON
+            and query_context.result_format
+            in (ChartDataResultFormat.JSON, ChartDataResultFormat.JSON_COLUMNAR)
             and query_context.result_type == ChartDataResultType.FULL
         ):
 
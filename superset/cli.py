@@ -575,6 +575,7 @@ def update_datasources_cache() -> None:
     for database in db.session.query(Database).all():
         if database.allow_multi_schema_metadata_fetch:
             print("Fetching {} datasources ...".format(database.name))
+            start = datetime.now()
             try:
                 database.get_all_table_names_in_database(
                     force=True, cache=True, cache_timeout=24 * 60 * 60
@@ -584,6 +585,11 @@ def update_datasources_cache() -> None:
                 )
             except Exception as ex:  # pylint: disable=broad-except
                 print("{}".format(str(ex)))
+            print(
+                "Fetched {} datasources in {}".format(
+                    database.name, datetime.now() - start
+                )
+            )
 
 
 @superset.command()
@@ -14,11 +14,13 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import copy
 import logging
 from typing import Any, ClassVar, Dict, List, Optional, Union
 
 import numpy as np
 import pandas as pd
+from flask import g
 from flask_babel import _
 
 from superset import app, db, is_feature_enabled
@@ -28,6 +30,7 @@ from superset.common.query_actions import get_query_results
 from superset.common.query_object import QueryObject
 from superset.connectors.base.models import BaseDatasource
 from superset.connectors.connector_registry import ConnectorRegistry
+from superset.dataframe import df_to_columns, df_to_records
 from superset.exceptions import (
     CacheLoadError,
     QueryObjectValidationError,
@@ -36,7 +39,15 @@ from superset.exceptions import (
 from superset.extensions import cache_manager, security_manager
 from superset.stats_logger import BaseStatsLogger
 from superset.utils import csv
-from superset.utils.cache import generate_cache_key, set_and_log_cache
+from superset.utils.cache import (
+    acquire_cache_lock,
+    decode_dataframe,
+    encode_dataframe,
+    generate_cache_key,
+    is_stale,
+    release_cache_lock,
+    set_and_log_cache,
+)
 from superset.utils.core import (
     ChartDataResultFormat,
     ChartDataResultType,
@@ -46,8 +57,10 @@ from superset.utils.core import (
     get_column_names_from_metrics,
     get_stacktrace,
     normalize_dttm_col,
+    parallel_map,
     QueryStatus,
 )
+from superset.utils.decorators import stats_timing
 from superset.views.utils import get_viz
 
 config = app.config
@@ -149,7 +162,9 @@ class QueryContext:
                 # will stay as strings if conversion fails
                 df[col] = df[col].infer_objects()
 
-    def get_data(self, df: pd.DataFrame,) -> Union[str, List[Dict[str, Any]]]:
+    def get_data(
+        self, df: pd.DataFrame,
+    ) -> Union[str, List[Dict[str, Any]], List[List[Any]]]:
         if self.result_format == ChartDataResultFormat.CSV:
             include_index = not isinstance(df.index, pd.RangeIndex)
             result = csv.df_to_escaped_csv(
@@ -157,20 +172,30 @@ class QueryContext:
             )
             return result or ""
 
-        return df.to_dict(orient="records")
+        if self.result_format == ChartDataResultFormat.JSON_COLUMNAR:
+            return df_to_columns(df)
+
+        return df_to_records(df)
 
     def get_payload(
         self, cache_query_context: Optional[bool] = False, force_cached: bool = False,
     ) -> Dict[str, Any]:
         """Returns the query results with both metadata and data"""
 
-        # Get all the payloads from the QueryObjects
-        query_results = [
-            get_query_results(
-                query_obj.result_type or self.result_type, self, query_obj, force_cached
-            )
-            for query_obj in self.queries
-        ]
+        def get_query_object_results(query_obj: QueryObject) -> Dict[str, Any]:
+            with stats_timing("chart_data.query", stats_logger):
+                return get_query_results(
+                    query_obj.result_type or self.result_type,
+                    self.bind_to_current_session(),
+                    query_obj,
+                    force_cached,
+                )
+
+        # Get all the payloads from the QueryObjects, running the independent
+        # queries concurrently if configured to
+        query_results = parallel_map(
+            get_query_object_results, self.queries, config["CHART_DATA_MAX_WORKERS"]
+        )
         return_value = {"queries": query_results}
 
         if cache_query_context:
@@ -185,6 +210,20 @@ class QueryContext:
 
         return return_value
 
+    def bind_to_current_session(self) -> "QueryContext":
+        """
+        Returns a query context whose datasource belongs to the current session.
+
+        Sessions are scoped to threads, so the datasource is merged into the
+        session of the thread running the query when it isn't the one that loaded
+        the query context.
+        """
+        if self.datasource in db.session:
+            return self
+        query_context = copy.copy(self)
+        query_context.datasource = db.session.merge(self.datasource, load=False)
+        return query_context
+
     @property
     def cache_timeout(self) -> int:
         if self.custom_cache_timeout is not None:
@@ -210,6 +249,33 @@ class QueryContext:
 
         return generate_cache_key(cache_dict, key_prefix)
 
+    def refresh_in_background(self) -> None:
+        """
+        Refresh the cached data of the query context in a Celery task as the current
+        user, unless a refresh was already requested by a concurrent request of the
+        same user.
+        """
+        from superset.tasks.async_queries import (  # pylint: disable=import-outside-toplevel
+            load_chart_data_into_cache,
+        )
+
+        # the row level security filters and impersonation of the user are part of
+        # the cache keys of the queries, so they are refreshed as the same user
+        user_id = getattr(getattr(g, "user", None), "id", None)
+        refresh_key = f"{self.cache_key(user_id=user_id)}__refresh"
+        try:
+            if not cache_manager.data_cache.add(
+                refresh_key, True, timeout=config["DATA_CACHE_REFRESH_TIMEOUT"]
+            ):
+                return
+            form_data: Dict[str, Any] = {**self.cache_values, "force": True}
+            load_chart_data_into_cache.delay(
+                None, form_data, user_id=user_id, refresh_key=refresh_key
+            )
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.warning("Could not refresh cache key %s", refresh_key)
+            logger.exception(ex)
+
     def query_cache_key(self, query_obj: QueryObject, **kwargs: Any) -> Optional[str]:
         """
         Returns a QueryObject cache key for objects in self.queries
@@ -293,15 +359,23 @@ class QueryContext:
         :return:
         """
         annotation_data: Dict[str, Any] = self.get_native_annotation_data(query_obj)
-        for annotation_layer in [
+        viz_annotation_layers = [
             layer
             for layer in query_obj.annotation_layers
             if layer["sourceType"] in ("line", "table")
-        ]:
-            name = annotation_layer["name"]
-            annotation_data[name] = self.get_viz_annotation_data(
-                annotation_layer, self.force
-            )
+        ]
+
+        def get_viz_annotation_layer_data(layer: Dict[str, Any]) -> Dict[str, Any]:
+            with stats_timing("chart_data.annotation_layer", stats_logger):
+                return self.get_viz_annotation_data(layer, self.force)
+
+        viz_annotation_data = parallel_map(
+            get_viz_annotation_layer_data,
+            viz_annotation_layers,
+            config["CHART_DATA_MAX_WORKERS"],
+        )
+        for annotation_layer, data in zip(viz_annotation_layers, viz_annotation_data):
+            annotation_data[annotation_layer["name"]] = data
         return annotation_data
 
     def get_df_payload(  # pylint: disable=too-many-statements,too-many-locals
@@ -318,17 +392,25 @@ class QueryContext:
         query = ""
         annotation_data = {}
         error_message = None
+        lock_token = None
         if cache_key and cache_manager.data_cache and not self.force:
             cache_value = cache_manager.data_cache.get(cache_key)
+            if not cache_value and not force_cached:
+                lock_token, cache_value = acquire_cache_lock(
+                    cache_manager.data_cache, cache_key
+                )
             if cache_value:
                 stats_logger.incr("loading_from_cache")
                 try:
-                    df = cache_value["df"]
+                    df = decode_dataframe(cache_value["df"])
                     query = cache_value["query"]
                     annotation_data = cache_value.get("annotation_data", {})
                     status = QueryStatus.SUCCESS
                     is_loaded = True
                     stats_logger.incr("loaded_from_cache")
+                    if is_stale(cache_value):
+                        stats_logger.incr("loaded_stale_from_cache")
+                        self.refresh_in_background()
                 except KeyError as ex:
                     logger.exception(ex)
                     logger.error(
@@ -384,10 +466,17 @@ class QueryContext:
                 set_and_log_cache(
                     cache_manager.data_cache,
                     cache_key,
-                    {"df": df, "query": query, "annotation_data": annotation_data},
+                    {
+                        "df": encode_dataframe(df),
+                        "query": query,
+                        "annotation_data": annotation_data,
+                    },
                     self.cache_timeout,
                     self.datasource.uid,
+                    stale_timeout=config["DATA_CACHE_STALE_TIMEOUT"],
                 )
+            if lock_token and cache_key:
+                release_cache_lock(cache_manager.data_cache, cache_key, lock_token)
         return {
             "cache_key": cache_key,
             "cached_dttm": cache_value["dttm"] if cache_value is not None else None,
@@ -55,6 +55,8 @@ if TYPE_CHECKING:
 
 # Realtime stats logger, a StatsD implementation exists
 STATS_LOGGER = DummyStatsLogger()
+# superset.utils.log.BufferedDBEventLogger writes the logs in batches, from a
+# background thread, rather than in the requests logging them
 EVENT_LOGGER = DBEventLogger()
 
 SUPERSET_LOG_VIEW = True
@@ -123,6 +125,10 @@ VIZ_ROW_LIMIT = 10000
 SAMPLES_ROW_LIMIT = 1000
 # max rows retrieved by filter select auto complete
 FILTER_SELECT_ROW_LIMIT = 10000
+# Maximum number of threads used to run the independent queries of a chart data
+# request (multiple query objects, chart-based annotation layers) concurrently.
+# With the default of 1, queries are run one after another.
+CHART_DATA_MAX_WORKERS = 1
 SUPERSET_WORKERS = 2  # deprecated
 SUPERSET_CELERY_WORKERS = 32  # deprecated
 
@@ -450,6 +456,9 @@ THUMBNAIL_CACHE_CONFIG: CacheConfig = {
 # for that element to load for an alert screenshot.
 SCREENSHOT_LOCATE_WAIT = 10
 SCREENSHOT_LOAD_WAIT = 60
+# Time in seconds none of the elements of the page must have been loading for, once
+# the element is located, for the page to be considered rendered.
+SCREENSHOT_RENDER_SETTLE = 1
 
 # ---------------------------------------------------
 # Image and file configuration
@@ -466,6 +475,28 @@ IMG_UPLOAD_URL = "/static/uploads/"
 # Setup image size default is (300, 200, True)
 # IMG_SIZE = (300, 200, True)
 
+# Maximum number of threads fetching the table or view names of the schemas of a
+# database concurrently, e.g. when refreshing the SQL Lab datasources cache, and
+# maximum number of schemas fetched per second and database (None for no limit).
+# Schemas failing to be fetched are logged and skipped.
+METADATA_CRAWL_MAX_WORKERS = 1
+METADATA_CRAWL_RATE_LIMIT: Optional[float] = None
+
+# Whether to keep the table and view names listed in SQL Lab in the metadata
+# database, refreshing the listing of a schema once it is older than the table
+# cache timeout of its database (or TABLE_LISTING_TIMEOUT, in seconds), unless the
+# engine reports that no table or view was created or dropped in the schema since.
+# Searches for tables and views are then answered by the metadata database.
+TABLE_LISTING_STORE_ENABLED = False
+TABLE_LISTING_TIMEOUT = 24 * 60 * 60
+
+# Each worker keeps an index of the table and view names of the most recently
+# searched databases (or schemas) in SQL Lab, up to TABLE_SEARCH_INDEX_CACHE_SIZE
+# indexes. An index is rebuilt after the table cache timeout of its database, or
+# TABLE_SEARCH_INDEX_TIMEOUT (in seconds), or when the listing is forced to refresh.
+TABLE_SEARCH_INDEX_CACHE_SIZE = 100
+TABLE_SEARCH_INDEX_TIMEOUT = 5 * 60
+
 # Default cache timeout (in seconds), applies to all cache backends unless
 # specifically overridden in each cache config.
 CACHE_DEFAULT_TIMEOUT = 60 * 60 * 24  # 1 day
@@ -476,6 +507,50 @@ CACHE_CONFIG: CacheConfig = {"CACHE_TYPE": "null"}
 # Cache for datasource metadata and query results
 DATA_CACHE_CONFIG: CacheConfig = {"CACHE_TYPE": "null"}
 
+# Size in bytes of an in-process cache kept by each worker in front of the data
+# cache. It holds the most recently used values already deserialized, for at most
+# DATA_CACHE_LOCAL_TIMEOUT seconds. Set to 0 to disable it.
+DATA_CACHE_LOCAL_MAX_BYTES = 0
+DATA_CACHE_LOCAL_TIMEOUT = 60
+
+# Store the DataFrames of chart data in the data cache as Arrow IPC streams, their
+# column buffers compressed with DATA_CACHE_ARROW_COMPRESSION ("zstd", "lz4" or
+# None), rather than pickling them. DataFrames Arrow can't represent faithfully,
+# e.g. holding nested values, are still pickled.
+DATA_CACHE_USE_ARROW = False
+DATA_CACHE_ARROW_COMPRESSION: Optional[str] = "zstd"
+
+# Concurrent chart data requests missing the data cache on the same key are
+# coalesced: the first request takes a lock in the data cache and runs the query,
+# while the others poll the data cache for its result, for at most
+# DATA_CACHE_LOCK_TIMEOUT seconds. Waiting requests hold their web server worker, so
+# keep this to a few seconds, well below SUPERSET_WEBSERVER_TIMEOUT. Off (0) by
+# default: every request runs its own query. The lock expires after
+# DATA_CACHE_LOCK_EXPIRY seconds should its holder die, which should cover the run
+# time of the slowest queries.
+DATA_CACHE_LOCK_TIMEOUT = 0
+DATA_CACHE_LOCK_EXPIRY = SUPERSET_WEBSERVER_TIMEOUT
+DATA_CACHE_LOCK_POLL_INTERVAL = 0.5
+
+# When set, chart data cached through the chart data API or by legacy charts
+# (explore_json) is kept for this many seconds past its cache timeout. During that
+# time, it is still served as cached while a Celery worker refreshes it in the
+# background. A single refresh is queued per chart and user at a time, and another
+# one can be queued once it completes or after DATA_CACHE_REFRESH_TIMEOUT seconds,
+# should it be lost.
+DATA_CACHE_STALE_TIMEOUT: Optional[int] = None
+DATA_CACHE_REFRESH_TIMEOUT = 300
+
+# Have the cache-warmup Celery task run the queries of charts in the worker rather
+# than request their URLs from the web server one at a time. At most
+# CACHE_WARMUP_CONCURRENCY queries run at the same time against each database, and
+# against at most CACHE_WARMUP_MAX_DATABASES databases at a time, so that a worker
+# runs up to CACHE_WARMUP_CONCURRENCY * CACHE_WARMUP_MAX_DATABASES threads. Charts
+# whose data is already cached, and not stale, are skipped.
+CACHE_WARMUP_IN_PROCESS = False
+CACHE_WARMUP_CONCURRENCY = 4
+CACHE_WARMUP_MAX_DATABASES = 4
+
 # store cache keys by datasource UID (via CacheKey) for custom processing/invalidation
 STORE_CACHE_KEYS_IN_METADATA_DB = False
 
@@ -597,6 +672,12 @@ MAPBOX_API_KEY = os.environ.get("MAPBOX_API_KEY", "")
 # in the results backend. This also becomes the limit when exporting CSVs
 SQL_MAX_ROW = 100000
 
+# When set, SQL Lab fetches query results in batches of this many rows, converting
+# each batch to Arrow as it arrives, and CSV exports that need to re-run the query
+# are streamed batch by batch. This keeps the memory footprint of workers
+# proportional to the batch size rather than to SQL_MAX_ROW.
+SQLLAB_FETCH_BATCH_SIZE: Optional[int] = None
+
 # Maximum number of rows displayed in SQL Lab UI
 # Is set to avoid out of memory/localstorage issues in browsers. Does not affect
 # exported CSVs
@@ -667,6 +748,25 @@ DEFAULT_HTTP_HEADERS: Dict[str, Any] = {}
 OVERRIDE_HTTP_HEADERS: Dict[str, Any] = {}
 HTTP_HEADERS: Dict[str, Any] = {}
 
+# Engines returned by Database.get_sqla_engine are memoized per database, schema,
+# effective user and source. Each worker keeps at most DB_ENGINE_CACHE_SIZE of them
+# for at most DB_ENGINE_CACHE_MAX_AGE seconds, disposing of those evicted.
+DB_ENGINE_CACHE_SIZE = 100
+DB_ENGINE_CACHE_MAX_AGE = 60 * 60
+
+# Reuse pooled SQLAlchemy engines to run chart queries, fetch column values and
+# inspect the metadata of databases, rather than connecting anew for each query.
+# Engines are kept per database, effective user and schema, with pools of
+# DB_ENGINE_POOL_SIZE connections, plus up to DB_ENGINE_MAX_OVERFLOW more at peak
+# times. Both can be set for a database through "engine_params" in its extra.
+# Engines unused for DB_ENGINE_IDLE_TIMEOUT seconds are disposed of, as are the
+# least recently used ones past DB_ENGINE_MAX_ENGINES_PER_DATABASE per database.
+DB_ENGINE_POOLING = False
+DB_ENGINE_POOL_SIZE = 5
+DB_ENGINE_MAX_OVERFLOW = 10
+DB_ENGINE_IDLE_TIMEOUT = 600
+DB_ENGINE_MAX_ENGINES_PER_DATABASE = 10
+
 # The db id here results in selecting this one as a default in SQL Lab
 DEFAULT_DB_ID = None
 
@@ -755,6 +855,15 @@ RESULTS_BACKEND: Optional[BaseCache] = None
 # in order to disable should breaking issues be discovered.
 RESULTS_BACKEND_USE_MSGPACK = True
 
+# Store the data of async query results as compressed Arrow IPC streams, apart from
+# the query metadata. The data is split in chunks of RESULTS_BACKEND_CHUNK_SIZE rows
+# stored under their own keys, so results can be read a page at a time without
+# loading the whole payload. RESULTS_BACKEND_ARROW_COMPRESSION is the codec applied
+# to each column buffer, either "zstd", "lz4" or None.
+RESULTS_BACKEND_USE_ARROW_IPC = False
+RESULTS_BACKEND_ARROW_COMPRESSION: Optional[str] = "zstd"
+RESULTS_BACKEND_CHUNK_SIZE = 10000
+
 # The S3 bucket where you want to store your external hive tables created
 # from CSV files. For example, 'companyname-superset'
 CSV_TO_HIVE_UPLOAD_S3_BUCKET = None
@@ -985,6 +1094,15 @@ WEBDRIVER_AUTH_FUNC = None
 # Any config options to be passed as-is to the webdriver
 WEBDRIVER_CONFIGURATION: Dict[Any, Any] = {}
 
+# Keep up to WEBDRIVER_POOL_SIZE webdrivers open, logged in as the user screenshots
+# are taken for, in each worker taking screenshots for thumbnails and reports,
+# rather than starting one for each screenshot. A webdriver is quit once used
+# WEBDRIVER_POOL_MAX_USES times, or unused for WEBDRIVER_POOL_MAX_IDLE seconds. Set
+# to 0 to disable the pool.
+WEBDRIVER_POOL_SIZE = 0
+WEBDRIVER_POOL_MAX_USES = 50
+WEBDRIVER_POOL_MAX_IDLE = 10 * 60
+
 # Additional args to be passed as arguments to the config object
 # Note: these options are Chrome-specific. For FF, these should
 # only include the "--headless" arg
@@ -20,7 +20,17 @@ from collections import defaultdict, OrderedDict
 from contextlib import closing
 from dataclasses import dataclass, field  # pylint: disable=wrong-import-order
 from datetime import datetime, timedelta
-from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Tuple, Union
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import pandas as pd
 import sqlalchemy as sa
@@ -52,7 +62,7 @@ from sqlalchemy.sql.elements import ColumnClause
 from sqlalchemy.sql.expression import Label, Select, TextAsFrom, TextClause
 from sqlalchemy.types import TypeEngine
 
-from superset import app, db, is_feature_enabled, security_manager
+from superset import app, db, is_feature_enabled, security_manager, sql_parse
 from superset.connectors.base.models import BaseColumn, BaseDatasource, BaseMetric
 from superset.db_engine_specs.base import TimestampExpression
 from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
@@ -765,7 +775,7 @@ class SqlaTable(  # pylint: disable=too-many-public-methods,too-many-instance-at
         if self.fetch_values_predicate:
             qry = qry.where(self.get_fetch_values_predicate())
 
-        engine = self.database.get_sqla_engine()
+        engine = self.database.get_sqla_engine(pooled=True)
         sql = "{}".format(qry.compile(engine, compile_kwargs={"literal_binds": True}))
         sql = self.mutate_query_from_config(sql)
 
@@ -1511,6 +1521,34 @@ class SqlaTable(  # pylint: disable=too-many-public-methods,too-many-instance-at
             query = query.filter_by(schema=schema)
         return query.all()
 
+    @classmethod
+    def query_datasources_by_names(
+        cls, session: Session, database: Database, tables: Iterable[sql_parse.Table],
+    ) -> List["SqlaTable"]:
+        """
+        Return the datasources of several tables in a single query, the datasources
+        of tables without schema being those with the same name in any schema.
+
+        :param session: The SQLAlchemy session
+        :param database: The database of the tables
+        :param tables: The tables
+        :returns: The datasources of the tables
+        """
+        conditions = [
+            and_(cls.table_name == table.table, cls.schema == table.schema)
+            if table.schema
+            else cls.table_name == table.table
+            for table in tables
+        ]
+        if not conditions:
+            return []
+        return (
+            session.query(cls)
+            .filter_by(database_id=database.id)
+            .filter(or_(*conditions))
+            .all()
+        )
+
     @staticmethod
     def default_query(qry: Query) -> Query:
         return qry.filter_by(is_sqllab_view=False)
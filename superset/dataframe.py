@@ -19,6 +19,7 @@
 import warnings
 from typing import Any, Dict, List
 
+import numpy as np
 import pandas as pd
 
 from superset.utils.core import JS_MAX_INTEGER
@@ -32,7 +33,35 @@ def _convert_big_integers(val: Any) -> Any:
     :returns: the same value but recast as a string if it was an integer over
         ``JS_MAX_INTEGER``
     """
-    return str(val) if isinstance(val, int) and abs(val) > JS_MAX_INTEGER else val
+    return (
+        str(val)
+        if isinstance(val, (int, np.integer)) and abs(val) > JS_MAX_INTEGER
+        else val
+    )
+
+
+def _column_to_list(series: pd.Series) -> List[Any]:
+    """
+    Convert a column to a list of Python objects, casting integers larger than
+    ``JS_MAX_INTEGER`` to strings.
+
+    NumPy integer columns are checked with a mask, so only the offending values
+    are touched. Nullable integer columns, which may hold ``pd.NA``, and object
+    columns, which may hold arbitrary Python integers, are checked value by value.
+
+    :param series: the column to convert
+    :returns: the values of the column
+    """
+    values = series.tolist()
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind in "iu":
+        array = series.to_numpy()
+        mask = (array > JS_MAX_INTEGER) | (array < -JS_MAX_INTEGER)
+        for idx in np.flatnonzero(mask):
+            values[idx] = str(values[idx])
+        return values
+    if series.dtype.kind in "iuO":
+        return list(map(_convert_big_integers, values))
+    return values
 
 
 def df_to_records(dframe: pd.DataFrame) -> List[Dict[str, Any]]:
@@ -49,7 +78,22 @@ def df_to_records(dframe: pd.DataFrame) -> List[Dict[str, Any]]:
             stacklevel=2,
         )
     columns = dframe.columns
-    return list(
-        dict(zip(columns, map(_convert_big_integers, row)))
-        for row in zip(*[dframe[col] for col in columns])
-    )
+    return [
+        dict(zip(columns, row))
+        for row in zip(
+            *[_column_to_list(dframe.iloc[:, i]) for i in range(len(columns))]
+        )
+    ]
+
+
+def df_to_columns(dframe: pd.DataFrame) -> List[List[Any]]:
+    """
+    Convert a DataFrame to a list of columns, in the order of ``dframe.columns``.
+
+    This column-oriented format avoids building a dictionary per row and is
+    considerably more compact once serialized.
+
+    :param dframe: the DataFrame to convert
+    :returns: a list holding the values of each column of the DataFrame
+    """
+    return [_column_to_list(dframe.iloc[:, i]) for i in range(len(dframe.columns))]
@@ -17,6 +17,7 @@
 # pylint: disable=unused-argument
 import dataclasses
 import hashlib
+import itertools
 import json
 import logging
 import re
@@ -26,6 +27,7 @@ from typing import (
     Any,
     Callable,
     Dict,
+    Iterator,
     List,
     Match,
     NamedTuple,
@@ -59,6 +61,7 @@ from superset.models.sql_types.base import literal_dttm_type_factory
 from superset.sql_parse import ParsedQuery, Table
 from superset.utils import core as utils
 from superset.utils.core import ColumnSpec, GenericDataType
+from superset.utils.dates import now_as_float
 
 if TYPE_CHECKING:
     # prevent circular imports
@@ -289,7 +292,11 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
     ) -> Engine:
         user_name = utils.get_username()
         return database.get_sqla_engine(
-            schema=schema, nullpool=True, user_name=user_name, source=source
+            schema=schema,
+            nullpool=True,
+            user_name=user_name,
+            source=source,
+            pooled=True,
         )
 
     @classmethod
@@ -474,6 +481,34 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
         except Exception as ex:
             raise cls.get_dbapi_mapped_exception(ex)
 
+    @classmethod
+    def fetch_data_in_batches(
+        cls, cursor: Any, limit: Optional[int] = None, batch_size: Optional[int] = None
+    ) -> Iterator[List[Tuple[Any, ...]]]:
+        """
+        Fetch the result of a query in batches, so the whole result never has to
+        be held in memory as Python objects at once.
+
+        :param cursor: Cursor instance
+        :param limit: Maximum number of rows to be returned by the cursor
+        :param batch_size: Number of rows per batch, defaults to the cursor arraysize
+        :return: Iterator over batches of rows
+        """
+        if cls.arraysize:
+            cursor.arraysize = cls.arraysize
+        batch_size = batch_size or cursor.arraysize
+        row_count = 0
+        while not limit or row_count < limit:
+            size = min(batch_size, limit - row_count) if limit else batch_size
+            try:
+                data = cursor.fetchmany(size)
+            except Exception as ex:
+                raise cls.get_dbapi_mapped_exception(ex)
+            if not data:
+                break
+            row_count += len(data)
+            yield data
+
     @classmethod
     def expand_data(
         cls, columns: List[Dict[Any, Any]], data: List[Dict[Any, Any]]
@@ -701,25 +736,58 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
             cache_timeout=database.schema_cache_timeout,
             force=True,
         )
-        all_datasources: List[utils.DatasourceName] = []
-        for schema in schemas:
-            if datasource_type == "table":
-                all_datasources += database.get_all_table_names_in_schema(
+        if datasource_type == "table":
+            get_names = database.get_all_table_names_in_schema
+        elif datasource_type == "view":
+            get_names = database.get_all_view_names_in_schema
+        else:
+            raise Exception(f"Unsupported datasource_type: {datasource_type}")
+
+        rate_limiter = utils.RateLimiter(config["METADATA_CRAWL_RATE_LIMIT"])
+        fetched = itertools.count(1)
+
+        def get_names_in_schema(schema: str) -> List[utils.DatasourceName]:
+            rate_limiter.wait()
+            try:
+                names = get_names(
                     schema=schema,
                     force=True,
                     cache=database.table_cache_enabled,
                     cache_timeout=database.table_cache_timeout,
                 )
-            elif datasource_type == "view":
-                all_datasources += database.get_all_view_names_in_schema(
-                    schema=schema,
-                    force=True,
-                    cache=database.table_cache_enabled,
-                    cache_timeout=database.table_cache_timeout,
+            except Exception as ex:  # pylint: disable=broad-except
+                logger.warning(
+                    "Could not fetch the %s names of schema %s in database %s: %s",
+                    datasource_type,
+                    schema,
+                    database.database_name,
+                    ex,
                 )
-            else:
-                raise Exception(f"Unsupported datasource_type: {datasource_type}")
-        return all_datasources
+                names = []
+            logger.info(
+                "Fetched the %s names of schema %s in database %s (%i/%i)",
+                datasource_type,
+                schema,
+                database.database_name,
+                next(fetched),
+                len(schemas),
+            )
+            return names
+
+        start = now_as_float()
+        names_by_schema = utils.parallel_map(
+            get_names_in_schema, schemas, config["METADATA_CRAWL_MAX_WORKERS"]
+        )
+        duration = now_as_float() - start
+        config["STATS_LOGGER"].timing("metadata_crawl.database", duration)
+        logger.info(
+            "Fetched the %s names of %i schemas in database %s in %.0f ms",
+            datasource_type,
+            len(schemas),
+            database.database_name,
+            duration,
+        )
+        return list(itertools.chain.from_iterable(names_by_schema))
 
     @classmethod
     def handle_cursor(cls, cursor: Any, query: Query, session: Session) -> None:
@@ -821,6 +889,22 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
             views = [re.sub(f"^{schema}\\.", "", view) for view in views]
         return sorted(views)
 
+    @classmethod
+    def get_schema_change_marker(  # pylint: disable=unused-argument
+        cls, database: "Database", inspector: Inspector, schema: str
+    ) -> Optional[str]:
+        """
+        Get a value that changes whenever tables or views are created, renamed or
+        dropped in a schema, letting listings of the schema be kept as long as it
+        doesn't change. Engines not exposing such information return None.
+
+        :param database: Database instance
+        :param inspector: SqlAlchemy inspector
+        :param schema: Schema name
+        :return: Change marker of the schema
+        """
+        return None
+
     @classmethod
     def get_table_comment(
         cls, inspector: Inspector, table_name: str, schema: Optional[str]
@@ -16,7 +16,17 @@
 # under the License.
 import re
 from datetime import datetime
-from typing import Any, Callable, Dict, Match, Optional, Pattern, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Match,
+    Optional,
+    Pattern,
+    Tuple,
+    TYPE_CHECKING,
+    Union,
+)
 from urllib import parse
 
 from sqlalchemy.dialects.mysql import (
@@ -31,13 +41,18 @@ from sqlalchemy.dialects.mysql import (
     TINYINT,
     TINYTEXT,
 )
+from sqlalchemy.engine.reflection import Inspector
 from sqlalchemy.engine.url import URL
+from sqlalchemy.sql import text
 from sqlalchemy.types import TypeEngine
 
 from superset.db_engine_specs.base import BaseEngineSpec
 from superset.utils import core as utils
 from superset.utils.core import ColumnSpec, GenericDataType
 
+if TYPE_CHECKING:
+    from superset.models.core import Database  # pragma: no cover
+
 
 class MySQLEngineSpec(BaseEngineSpec):
     engine = "mysql"
@@ -131,6 +146,21 @@ class MySQLEngineSpec(BaseEngineSpec):
     def epoch_to_dttm(cls) -> str:
         return "from_unixtime({col})"
 
+    @classmethod
+    def get_schema_change_marker(
+        cls, database: "Database", inspector: Inspector, schema: str
+    ) -> Optional[str]:
+        # renaming a table changes neither the count nor the latest creation time
+        # of the tables, hence the checksum of their names
+        row = inspector.bind.execute(
+            text(
+                "SELECT COUNT(*), MAX(CREATE_TIME), SUM(CRC32(TABLE_NAME)) "
+                "FROM information_schema.TABLES WHERE TABLE_SCHEMA = :schema"
+            ),
+            schema=schema,
+        ).fetchone()
+        return ":".join(str(value) for value in row)
+
     @classmethod
     def _extract_error_message(cls, ex: Exception) -> str:
         """Extract error message for queries"""
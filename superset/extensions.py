@@ -29,6 +29,7 @@ from werkzeug.local import LocalProxy
 
 from superset.utils.async_query_manager import AsyncQueryManager
 from superset.utils.cache_manager import CacheManager
+from superset.utils.engine_manager import EngineManager
 from superset.utils.feature_flag_manager import FeatureFlagManager
 from superset.utils.machine_auth import MachineAuthProviderFactory
 
@@ -37,10 +38,12 @@ class ResultsBackendManager:
     def __init__(self) -> None:
         self._results_backend = None
         self._use_msgpack = False
+        self._use_arrow_ipc = False
 
     def init_app(self, app: Flask) -> None:
         self._results_backend = app.config["RESULTS_BACKEND"]
         self._use_msgpack = app.config["RESULTS_BACKEND_USE_MSGPACK"]
+        self._use_arrow_ipc = app.config["RESULTS_BACKEND_USE_ARROW_IPC"]
 
     @property
     def results_backend(self) -> Optional[BaseCache]:
@@ -50,6 +53,10 @@ class ResultsBackendManager:
     def should_use_msgpack(self) -> bool:
         return self._use_msgpack
 
+    @property
+    def should_use_arrow_ipc(self) -> bool:
+        return self._use_arrow_ipc
+
 
 class UIManifestProcessor:
     def __init__(self, app_dir: str) -> None:
@@ -103,6 +110,7 @@ cache_manager = CacheManager()
 celery_app = celery.Celery()
 csrf = CSRFProtect()
 db = SQLA()
+engine_manager = EngineManager()
 _event_logger: Dict[str, Any] = {}
 event_logger = LocalProxy(lambda: _event_logger.get("event_logger"))
 feature_flag_manager = FeatureFlagManager()
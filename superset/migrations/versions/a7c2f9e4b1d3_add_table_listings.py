@@ -0,0 +1,69 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""add schema_listings and table_listings tables
+
+Revision ID: a7c2f9e4b1d3
+Revises: 301362411006
+Create Date: 2021-03-29 10:12:41.276405
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "a7c2f9e4b1d3"
+down_revision = "301362411006"
+
+import sqlalchemy as sa
+from alembic import op
+
+
+def upgrade():
+    op.create_table(
+        "schema_listings",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("database_id", sa.Integer(), nullable=False),
+        sa.Column("schema", sa.String(length=255), nullable=False),
+        sa.Column("refreshed_on", sa.DateTime(), nullable=False),
+        sa.Column("change_marker", sa.String(length=256), nullable=True),
+        sa.ForeignKeyConstraint(["database_id"], ["dbs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("database_id", "schema"),
+    )
+    op.create_table(
+        "table_listings",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("schema_listing_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=250), nullable=False),
+        sa.Column("type", sa.String(length=16), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["schema_listing_id"], ["schema_listings.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_table_listings_schema_listing_id"),
+        "table_listings",
+        ["schema_listing_id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(
+        op.f("ix_table_listings_schema_listing_id"), table_name="table_listings"
+    )
+    op.drop_table("table_listings")
+    op.drop_table("schema_listings")
@@ -23,7 +23,18 @@ from contextlib import closing
 from copy import deepcopy
 from datetime import datetime
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
 
 import numpy
 import pandas as pd
@@ -43,12 +54,12 @@ from sqlalchemy import (
     Table,
     Text,
 )
-from sqlalchemy.engine import Dialect, Engine, url
+from sqlalchemy.engine import Connection, Dialect, Engine, url
 from sqlalchemy.engine.reflection import Inspector
 from sqlalchemy.engine.url import make_url, URL
 from sqlalchemy.exc import ArgumentError
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Mapper, relationship
 from sqlalchemy.pool import NullPool
 from sqlalchemy.schema import UniqueConstraint
 from sqlalchemy.sql import expression, Select
@@ -56,7 +67,7 @@ from sqlalchemy_utils import EncryptedType
 
 from superset import app, db_engine_specs, is_feature_enabled
 from superset.db_engine_specs.base import TimeGrain
-from superset.extensions import cache_manager, security_manager
+from superset.extensions import cache_manager, engine_manager, security_manager
 from superset.models.helpers import AuditMixinNullable, ImportExportMixin
 from superset.models.tags import FavStarUpdater
 from superset.result_set import SupersetResultSet
@@ -298,14 +309,28 @@ class Database(
                 effective_username = g.user.username
         return effective_username
 
-    @utils.memoized(watch=("impersonate_user", "sqlalchemy_uri_decrypted", "extra"))
+    @utils.memoized(
+        watch=("impersonate_user", "sqlalchemy_uri_decrypted", "extra"),
+        max_size=config["DB_ENGINE_CACHE_SIZE"],
+        max_age=config["DB_ENGINE_CACHE_MAX_AGE"],
+        on_evict=lambda engine: engine_manager.release(engine),
+        stats_key="engine_cache",
+    )
     def get_sqla_engine(
         self,
         schema: Optional[str] = None,
         nullpool: bool = True,
         user_name: Optional[str] = None,
         source: Optional[utils.QuerySource] = None,
+        pooled: bool = False,
     ) -> Engine:
+        """
+        Return an engine connecting to the database.
+
+        :param pooled: get a pooled engine kept across calls when `DB_ENGINE_POOLING`
+            is enabled, rather than a new one
+        """
+        use_pool = pooled and engine_manager.enabled and self.id is not None
         extra = self.get_extra()
         sqlalchemy_url = make_url(self.sqlalchemy_uri_decrypted)
         self.db_engine_spec.adjust_database_uri(sqlalchemy_url, schema)
@@ -321,7 +346,7 @@ class Database(
         logger.debug("Database.get_sqla_engine(). Masked URL: %s", str(masked_url))
 
         params = extra.get("engine_params", {})
-        if nullpool:
+        if nullpool and not use_pool:
             params["poolclass"] = NullPool
 
         connect_args = params.get("connect_args", {})
@@ -348,6 +373,8 @@ class Database(
                 sqlalchemy_url, params, effective_username, security_manager, source
             )
 
+        if use_pool:
+            return engine_manager.get_engine(self.id, sqlalchemy_url, params)
         return create_engine(sqlalchemy_url, **params)
 
     def get_reserved_words(self) -> Set[str]:
@@ -356,15 +383,32 @@ class Database(
     def get_quoter(self) -> Callable[[str, Any], str]:
         return self.get_dialect().identifier_preparer.quote
 
-    def get_df(  # pylint: disable=too-many-locals
+    def get_df(
         self,
         sql: str,
         schema: Optional[str] = None,
         mutator: Optional[Callable[[pd.DataFrame], None]] = None,
     ) -> pd.DataFrame:
+        with closing(self._iter_df(sql, schema, mutator)) as dfs:
+            return next(dfs)
+
+    def iter_df(
+        self, sql: str, batch_size: int, schema: Optional[str] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Runs the SQL and yields its result as DataFrames of at most
+        ``batch_size`` rows, always yielding at least one (possibly empty) frame"""
+        return self._iter_df(sql, schema, batch_size=batch_size)
+
+    def _iter_df(  # pylint: disable=too-many-locals
+        self,
+        sql: str,
+        schema: Optional[str] = None,
+        mutator: Optional[Callable[[pd.DataFrame], None]] = None,
+        batch_size: Optional[int] = None,
+    ) -> Generator[pd.DataFrame, None, None]:
         sqls = [str(s).strip(" ;") for s in sqlparse.parse(sql)]
 
-        engine = self.get_sqla_engine(schema=schema)
+        engine = self.get_sqla_engine(schema=schema, pooled=True)
         username = utils.get_username()
 
         def needs_conversion(df_series: pd.Series) -> bool:
@@ -378,17 +422,7 @@ class Database(
             if log_query:
                 log_query(engine.url, sql, schema, username, __name__, security_manager)
 
-        with closing(engine.raw_connection()) as conn:
-            cursor = conn.cursor()
-            for sql_ in sqls[:-1]:
-                _log_query(sql_)
-                self.db_engine_spec.execute(cursor, sql_)
-                cursor.fetchall()
-
-            _log_query(sqls[-1])
-            self.db_engine_spec.execute(cursor, sqls[-1])
-
-            data = self.db_engine_spec.fetch_data(cursor)
+        def _to_df(data: List[Tuple[Any, ...]]) -> pd.DataFrame:
             result_set = SupersetResultSet(
                 data, cursor.description, self.db_engine_spec
             )
@@ -402,6 +436,29 @@ class Database(
 
             return df
 
+        with closing(engine.raw_connection()) as conn:
+            cursor = conn.cursor()
+            for sql_ in sqls[:-1]:
+                _log_query(sql_)
+                self.db_engine_spec.execute(cursor, sql_)
+                cursor.fetchall()
+
+            _log_query(sqls[-1])
+            self.db_engine_spec.execute(cursor, sqls[-1])
+
+            if not batch_size:
+                yield _to_df(self.db_engine_spec.fetch_data(cursor))
+                return
+
+            is_empty = True
+            for data in self.db_engine_spec.fetch_data_in_batches(
+                cursor, batch_size=batch_size
+            ):
+                is_empty = False
+                yield _to_df(data)
+            if is_empty:
+                yield _to_df([])
+
     def compile_sqla_query(self, qry: Select, schema: Optional[str] = None) -> str:
         engine = self.get_sqla_engine(schema=schema)
 
@@ -446,7 +503,7 @@ class Database(
 
     @property
     def inspector(self) -> Inspector:
-        engine = self.get_sqla_engine()
+        engine = self.get_sqla_engine(pooled=True)
         return sqla.inspect(engine)
 
     @cache_util.memoized_func(
@@ -693,8 +750,16 @@ class Database(
         return sqla_url.get_dialect()()  # pylint: disable=no-member
 
 
+def dispose_engines(_mapper: Mapper, _connection: Connection, target: Database) -> None:
+    """Dispose of the pooled engines of a database once it is edited or deleted,
+    rather than keeping them open until they are evicted"""
+    engine_manager.dispose(target.id)
+
+
 sqla.event.listen(Database, "after_insert", security_manager.set_perm)
 sqla.event.listen(Database, "after_update", security_manager.set_perm)
+sqla.event.listen(Database, "after_update", dispose_engines)
+sqla.event.listen(Database, "after_delete", dispose_engines)
 
 
 class Log(Model):  # pylint: disable=too-few-public-methods
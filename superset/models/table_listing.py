@@ -0,0 +1,52 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from datetime import datetime
+
+from flask_appbuilder import Model
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, UniqueConstraint
+
+
+class SchemaListing(Model):  # pylint: disable=too-few-public-methods
+
+    """Records when the tables and views of a schema were last listed."""
+
+    __tablename__ = "schema_listings"
+    __table_args__ = (UniqueConstraint("database_id", "schema"),)
+    id = Column(Integer, primary_key=True)
+    database_id = Column(
+        Integer, ForeignKey("dbs.id", ondelete="CASCADE"), nullable=False
+    )
+    schema = Column(String(255), nullable=False)
+    refreshed_on = Column(DateTime, default=datetime.now, nullable=False)
+    change_marker = Column(String(256), nullable=True)
+
+
+class TableListing(Model):  # pylint: disable=too-few-public-methods
+
+    """Stores the name of a table or view listed in a schema."""
+
+    __tablename__ = "table_listings"
+    id = Column(Integer, primary_key=True)
+    schema_listing_id = Column(
+        Integer,
+        ForeignKey("schema_listings.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    name = Column(String(250), nullable=False)
+    # either "table" or "view"
+    type = Column(String(16), nullable=False)
@@ -19,7 +19,7 @@
 import datetime
 import json
 import logging
-from typing import Any, Dict, List, Optional, Tuple, Type
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type, Union
 
 import numpy as np
 import pandas as pd
@@ -62,29 +62,86 @@ def stringify(obj: Any) -> str:
     return json.dumps(obj, default=utils.json_iso_dttm_ser)
 
 
-def stringify_values(array: np.ndarray) -> np.ndarray:
-    vstringify = np.vectorize(stringify)
-    return vstringify(array)
-
-
 def destringify(obj: str) -> Any:
     return json.loads(obj)
 
 
+def transpose_rows(data: DbapiResult, num_columns: int) -> List[Sequence[Any]]:
+    """Transposes a row-oriented DBAPI result into one sequence per column
+
+    The values are not copied or converted, each column simply references the
+    objects returned by the driver.
+
+    >>> transpose_rows([(1, "a"), (2, "b")], 2)
+    [(1, 2), ('a', 'b')]
+    """
+    if not data:
+        return [[] for _ in range(num_columns)]
+    return list(zip(*data))
+
+
+def column_to_pa_array(values: Sequence[Any]) -> pa.Array:
+    """Converts a single column of Python values to a pyarrow array, falling
+    back to JSON serialization of the values when pyarrow can't infer a type"""
+    try:
+        return pa.array(values)
+    except (
+        pa.lib.ArrowInvalid,
+        pa.lib.ArrowTypeError,
+        pa.lib.ArrowNotImplementedError,
+        TypeError,  # this is super hackey,
+        # https://issues.apache.org/jira/browse/ARROW-7855
+    ):
+        # attempt serialization of values as strings
+        return pa.array([stringify(value) for value in values])
+
+
+def concat_columns(chunks: List[pa.Array]) -> pa.Array:
+    """Concatenates the chunks of a column converted batch by batch
+
+    Batches may infer different types for the same column, e.g. when a batch only
+    contains nulls or mixes ints and floats. Chunks are cast to a common type,
+    falling back to strings when the types can't be reconciled.
+    """
+    types = {chunk.type for chunk in chunks if not pa.types.is_null(chunk.type)}
+    if not types:
+        return pa.concat_arrays(chunks)
+    if len(types) == 1:
+        target_type = types.pop()
+    elif all(pa.types.is_integer(type_) for type_ in types):
+        target_type = pa.int64()
+    elif all(
+        pa.types.is_integer(type_) or pa.types.is_floating(type_) for type_ in types
+    ):
+        target_type = pa.float64()
+    else:
+        target_type = pa.string()
+
+    arrays = []
+    for chunk in chunks:
+        if chunk.type == target_type:
+            arrays.append(chunk)
+        elif pa.types.is_null(chunk.type):
+            arrays.append(pa.nulls(len(chunk), type=target_type))
+        else:
+            try:
+                arrays.append(chunk.cast(target_type))
+            except (pa.lib.ArrowInvalid, pa.lib.ArrowNotImplementedError):
+                arrays.append(pa.array([stringify(v) for v in chunk.to_pylist()]))
+    return pa.concat_arrays(arrays)
+
+
 class SupersetResultSet:
     def __init__(  # pylint: disable=too-many-locals,too-many-branches
         self,
-        data: DbapiResult,
+        data: Union[DbapiResult, pa.Table, pa.RecordBatch],
         cursor_description: DbapiDescription,
         db_engine_spec: Type[db_engine_specs.BaseEngineSpec],
     ):
         self.db_engine_spec = db_engine_spec
-        data = data or []
         column_names: List[str] = []
         pa_data: List[pa.Array] = []
         deduped_cursor_desc: List[Tuple[Any, ...]] = []
-        numpy_dtype: List[Tuple[str, ...]] = []
-        stringified_arr: np.ndarray
 
         if cursor_description:
             # get deduped list of column names
@@ -96,27 +153,29 @@ class SupersetResultSet:
                 for column_name, description in zip(column_names, cursor_description)
             ]
 
-            # generate numpy structured array dtype
-            numpy_dtype = [(column_name, "object") for column_name in column_names]
-
-        # only do expensive recasting if datatype is not standard list of tuples
-        if data and (not isinstance(data, list) or not isinstance(data[0], tuple)):
-            data = [tuple(row) for row in data]
-        array = np.array(data, dtype=numpy_dtype)
-        if array.size > 0:
-            for column in column_names:
-                try:
-                    pa_data.append(pa.array(array[column].tolist()))
-                except (
-                    pa.lib.ArrowInvalid,
-                    pa.lib.ArrowTypeError,
-                    pa.lib.ArrowNotImplementedError,
-                    TypeError,  # this is super hackey,
-                    # https://issues.apache.org/jira/browse/ARROW-7855
-                ):
-                    # attempt serialization of values as strings
-                    stringified_arr = stringify_values(array[column])
-                    pa_data.append(pa.array(stringified_arr.tolist()))
+        columns: List[Sequence[Any]] = []
+        if isinstance(data, (pa.Table, pa.RecordBatch)):
+            # drivers that support Arrow natively hand over columnar data, which
+            # is used as is instead of being boxed into Python objects
+            if not column_names:
+                column_names = dedup(data.schema.names)
+            if data.num_rows > 0:
+                pa_data = [
+                    pa.concat_arrays(column.chunks)
+                    if isinstance(column, pa.ChunkedArray)
+                    else column
+                    for column in data.columns
+                ]
+        else:
+            data = data or []
+            # transpose the rows once into columns, so each column is converted
+            # to arrow independently and only the ones that fail are stringified
+            columns = transpose_rows(data, len(column_names))
+            if data:
+                pa_data = [
+                    column_to_pa_array(values)
+                    for _, values in zip(column_names, columns)
+                ]
 
         if pa_data:  # pylint: disable=too-many-nested-blocks
             for i, column in enumerate(column_names):
@@ -124,20 +183,22 @@ class SupersetResultSet:
                     # TODO: revisit nested column serialization once nested types
                     #  are added as a natively supported column type in Superset
                     #  (superset.utils.core.GenericDataType).
-                    stringified_arr = stringify_values(array[column])
-                    pa_data[i] = pa.array(stringified_arr.tolist())
+                    values = columns[i] if columns else pa_data[i].to_pylist()
+                    pa_data[i] = pa.array([stringify(value) for value in values])
 
-                elif pa.types.is_temporal(pa_data[i].type):
+                elif columns and pa.types.is_temporal(pa_data[i].type):
                     # workaround for bug converting
                     # `psycopg2.tz.FixedOffsetTimezone` tzinfo values.
                     # related: https://issues.apache.org/jira/browse/ARROW-5248
-                    sample = self.first_nonempty(array[column])
+                    values = columns[i]
+                    sample = self.first_nonempty(values)
                     if sample and isinstance(sample, datetime.datetime):
                         try:
                             if sample.tzinfo:
                                 tz = sample.tzinfo
                                 series = pd.Series(
-                                    array[column], dtype="datetime64[ns]"
+                                    np.array(values, dtype="object"),
+                                    dtype="datetime64[ns]",
                                 )
                                 series = pd.to_datetime(series).dt.tz_localize(tz)
                                 pa_data[i] = pa.Array.from_pandas(
@@ -158,6 +219,33 @@ class SupersetResultSet:
         except Exception as ex:  # pylint: disable=broad-except
             logger.exception(ex)
 
+    @classmethod
+    def from_batches(
+        cls,
+        batches: Iterable[DbapiResult],
+        cursor_description: DbapiDescription,
+        db_engine_spec: Type[db_engine_specs.BaseEngineSpec],
+    ) -> "SupersetResultSet":
+        """Builds a result set from batches of rows, converting each batch to
+        Arrow as it arrives so only a single batch is held as Python objects"""
+        chunks: List[List[pa.Array]] = []
+        for batch in batches:
+            if not batch:
+                continue
+            table = cls(batch, cursor_description, db_engine_spec).pa_table
+            chunks.append([pa.concat_arrays(column.chunks) for column in table.columns])
+
+        if not chunks:
+            return cls([], cursor_description, db_engine_spec)
+
+        columns = [concat_columns(list(column)) for column in zip(*chunks)]
+        names = [str(i) for i in range(len(columns))]
+        return cls(
+            pa.Table.from_arrays(columns, names=names),
+            cursor_description,
+            db_engine_spec,
+        )
+
     @staticmethod
     def convert_pa_dtype(pa_dtype: pa.DataType) -> Optional[str]:
         if pa.types.is_boolean(pa_dtype):
@@ -16,19 +16,35 @@
 # under the License.
 # pylint: disable=too-few-public-methods
 """A set of constants and methods to manage permissions and security"""
+import itertools
 import logging
 import re
-from typing import Any, Callable, cast, List, Optional, Set, Tuple, TYPE_CHECKING, Union
+import uuid
+from typing import (
+    Any,
+    Callable,
+    cast,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    TYPE_CHECKING,
+    Union,
+)
 
 from flask import current_app, g
+from flask.globals import _app_ctx_stack
 from flask_appbuilder import Model
 from flask_appbuilder.security.sqla.manager import SecurityManager
 from flask_appbuilder.security.sqla.models import (
     assoc_permissionview_role,
-    assoc_user_role,
+    Permission,
     PermissionView,
     Role,
     User,
+    ViewMenu,
 )
 from flask_appbuilder.security.views import (
     PermissionModelView,
@@ -38,17 +54,17 @@ from flask_appbuilder.security.views import (
     ViewMenuModelView,
 )
 from flask_appbuilder.widgets import ListWidget
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, event, or_
 from sqlalchemy.engine.base import Connection
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.mapper import Mapper
-from sqlalchemy.orm.query import Query as SqlaQuery
 
 from superset import sql_parse
 from superset.connectors.connector_registry import ConnectorRegistry
 from superset.constants import RouteMethod
 from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
 from superset.exceptions import SupersetSecurityException
+from superset.extensions import cache_manager
 from superset.utils.core import DatasourceName, RowLevelSecurityFilterType
 
 if TYPE_CHECKING:
@@ -64,6 +80,14 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+RLS_FILTERS_VERSION_KEY = "rls_filters_version"
+
+
+class RLSFilter(NamedTuple):
+    id: int
+    group_key: Optional[str]
+    clause: str
+
 
 class SupersetSecurityListWidget(ListWidget):
     """
@@ -193,6 +217,115 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         "all_query_access",
     )
 
+    def __init__(self, appbuilder: Any) -> None:
+        super().__init__(appbuilder)
+        # bumped whenever users, roles or permissions are flushed, invalidating the
+        # permissions of roles kept in the application context
+        self._permissions_version = 0
+        # same for row level security filters, whose version shared by the workers
+        # is only bumped once changes are committed
+        self._rls_filters_version = 0
+        event.listen(Session, "after_flush", self._on_flush)
+        event.listen(Session, "after_commit", self._on_commit)
+        event.listen(Session, "after_rollback", self._on_rollback)
+
+    def _on_flush(self, session: Session, flush_context: Any) -> None:
+        from superset.connectors.sqla.models import RowLevelSecurityFilter
+
+        objs = list(itertools.chain(session.new, session.dirty, session.deleted))
+        if any(
+            isinstance(obj, (Permission, PermissionView, Role, User, ViewMenu))
+            for obj in objs
+        ):
+            self._permissions_version += 1
+        if any(isinstance(obj, RowLevelSecurityFilter) for obj in objs):
+            self._rls_filters_version += 1
+            session.info["rls_filters_changed"] = True
+
+    @staticmethod
+    def _on_commit(session: Session) -> None:
+        if session.info.pop("rls_filters_changed", False):
+            cache_manager.cache.set(RLS_FILTERS_VERSION_KEY, uuid.uuid4().hex)
+
+    @staticmethod
+    def _on_rollback(session: Session) -> None:
+        session.info.pop("rls_filters_changed", None)
+
+    def get_role_permissions(
+        self, role_ids: List[Optional[int]]
+    ) -> Dict[Optional[int], Set[Tuple[str, str]]]:
+        """
+        Return the (permission name, view-menu name) pairs granted to each role.
+
+        The pairs of all the roles are fetched with a single query, then kept in the
+        application context (i.e. for the duration of a request) until users, roles or
+        permissions change.
+
+        :param role_ids: The ids of the roles, None standing for the public role
+        :returns: The permission/view pairs of each role
+        """
+
+        # kept on the context rather than in g, which tests replace with mocks
+        app_ctx = _app_ctx_stack.top
+        cache: Dict[Optional[int], Set[Tuple[str, str]]]
+        version, cache = getattr(app_ctx, "role_permissions", (None, {}))
+        if version != self._permissions_version:
+            cache = {}
+            if app_ctx is not None:
+                app_ctx.role_permissions = (self._permissions_version, cache)
+
+        if None in role_ids and None not in cache:
+            public_role = self.get_public_role()
+            cache[None] = (
+                self.get_role_permissions([public_role.id])[public_role.id]
+                if public_role
+                else set()
+            )
+
+        missing_ids = [
+            role_id
+            for role_id in role_ids
+            if role_id is not None and role_id not in cache
+        ]
+        if missing_ids:
+            for role_id in missing_ids:
+                cache[role_id] = set()
+            query = (
+                self.get_session.query(
+                    assoc_permissionview_role.c.role_id,
+                    self.permission_model.name,
+                    self.viewmenu_model.name,
+                )
+                .select_from(self.permissionview_model)
+                .join(self.permission_model)
+                .join(self.viewmenu_model)
+                .join(assoc_permissionview_role)
+                .filter(assoc_permissionview_role.c.role_id.in_(missing_ids))
+            )
+            for role_id, permission_name, view_menu_name in query:
+                cache[role_id].add((permission_name, view_menu_name))
+
+        return {role_id: cache[role_id] for role_id in role_ids}
+
+    def _has_view_access(
+        self, user: object, permission_name: str, view_name: str
+    ) -> bool:
+        # same as FAB's, except that the permissions of roles are cached
+        db_role_ids: List[Optional[int]] = []
+        for role in user.roles:  # type: ignore
+            if role.name in self.builtin_roles:
+                if self._has_access_builtin_roles(role, permission_name, view_name):
+                    return True
+            else:
+                db_role_ids.append(role.id)
+        return any(
+            (permission_name, view_name) in permissions
+            for permissions in self.get_role_permissions(db_role_ids).values()
+        )
+
+    def is_item_public(self, permission_name: str, view_name: str) -> bool:
+        return (permission_name, view_name) in self.get_role_permissions([None])[None]
+
     def get_schema_perm(  # pylint: disable=no-self-use
         self, database: Union["Database", str], schema: Optional[str] = None
     ) -> Optional[str]:
@@ -421,35 +554,15 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         return True
 
     def user_view_menu_names(self, permission_name: str) -> Set[str]:
-        base_query = (
-            self.get_session.query(self.viewmenu_model.name)
-            .join(self.permissionview_model)
-            .join(self.permission_model)
-            .join(assoc_permissionview_role)
-            .join(self.role_model)
+        role_ids: List[Optional[int]] = (
+            [None] if g.user.is_anonymous else [role.id for role in g.user.roles]
         )
-
-        if not g.user.is_anonymous:
-            # filter by user id
-            view_menu_names = (
-                base_query.join(assoc_user_role)
-                .join(self.user_model)
-                .filter(self.user_model.id == g.user.id)
-                .filter(self.permission_model.name == permission_name)
-            ).all()
-            return {s.name for s in view_menu_names}
-
-        # Properly treat anonymous user
-        public_role = self.get_public_role()
-        if public_role:
-            # filter by public role
-            view_menu_names = (
-                base_query.filter(self.role_model.id == public_role.id).filter(
-                    self.permission_model.name == permission_name
-                )
-            ).all()
-            return {s.name for s in view_menu_names}
-        return set()
+        return {
+            view_menu_name
+            for permissions in self.get_role_permissions(role_ids).values()
+            for name, view_menu_name in permissions
+            if name == permission_name
+        }
 
     def get_schemas_accessible_by_user(
         self, database: "Database", schemas: List[str], hierarchical: bool = True
@@ -964,22 +1077,26 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
             elif table:
                 tables = {table}
 
-            denied = set()
-
+            tables_without_schema_access = []
             for table_ in tables:
                 schema_perm = self.get_schema_perm(database, schema=table_.schema)
-
                 if not (schema_perm and self.can_access("schema_access", schema_perm)):
-                    datasources = SqlaTable.query_datasources_by_name(
-                        self.get_session, database, table_.table, schema=table_.schema
-                    )
+                    tables_without_schema_access.append(table_)
 
-                    # Access to any datasource is suffice.
-                    for datasource_ in datasources:
-                        if self.can_access("datasource_access", datasource_.perm):
-                            break
-                    else:
-                        denied.add(table_)
+            # the datasources of all the tables are fetched at once
+            datasources = SqlaTable.query_datasources_by_names(
+                self.get_session, database, tables_without_schema_access
+            )
+            denied = set()
+            for table_ in tables_without_schema_access:
+                # Access to any datasource is suffice.
+                if not any(
+                    datasource_.table_name == table_.table
+                    and (not table_.schema or datasource_.schema == table_.schema)
+                    and self.can_access("datasource_access", datasource_.perm)
+                    for datasource_ in datasources
+                ):
+                    denied.add(table_)
 
             if denied:
                 raise SupersetSecurityException(
@@ -1017,7 +1134,7 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
             .one_or_none()
         )
 
-    def get_rls_filters(self, table: "BaseDatasource") -> List[SqlaQuery]:
+    def get_rls_filters(self, table: "BaseDatasource") -> List[RLSFilter]:
         """
         Retrieves the appropriate row level security filters for the current user and
         the passed table.
@@ -1025,67 +1142,129 @@ class SupersetSecurityManager(  # pylint: disable=too-many-public-methods
         :param table: The table to check against
         :returns: A list of filters
         """
-        if hasattr(g, "user") and hasattr(g.user, "id"):
-            from superset.connectors.sqla.models import (
-                RLSFilterRoles,
-                RLSFilterTables,
-                RowLevelSecurityFilter,
-            )
+        return self.get_rls_filters_by_table([table])[table.id]
+
+    def get_rls_filters_by_table(
+        self, tables: List["BaseDatasource"]
+    ) -> Dict[int, List[RLSFilter]]:
+        """
+        Retrieves the appropriate row level security filters for the current user and
+        each of the passed tables, e.g. the datasources of a dashboard.
+
+        Filters are cached per set of roles and table, both in the application context
+        and in the cache shared by the workers, until row level security filters are
+        changed. The filters of the tables missing from the caches are fetched with a
+        single query.
+
+        :param tables: The tables to check against
+        :returns: The filters of each table, by table id
+        """
+        table_ids = {table.id for table in tables}
+        if not (hasattr(g, "user") and hasattr(g.user, "id")):
+            return {table_id: [] for table_id in table_ids}
+
+        from superset.connectors.sqla.models import (
+            RLSFilterRoles,
+            RLSFilterTables,
+            RowLevelSecurityFilter,
+        )
 
-            user_roles = (
-                self.get_session.query(assoc_user_role.c.role_id)
-                .filter(assoc_user_role.c.user_id == g.user.id)
-                .subquery()
+        role_ids = sorted(role.id for role in g.user.roles)
+        roles_key = ",".join(str(role_id) for role_id in role_ids)
+        app_ctx = _app_ctx_stack.top
+        local_cache: Dict[Tuple[str, int], List[RLSFilter]]
+        version, local_cache = getattr(app_ctx, "rls_filters", (None, {}))
+        if version != self._rls_filters_version:
+            local_cache = {}
+            if app_ctx is not None:
+                app_ctx.rls_filters = (self._rls_filters_version, local_cache)
+
+        filters: Dict[int, List[RLSFilter]] = {
+            table_id: local_cache[(roles_key, table_id)]
+            for table_id in table_ids
+            if (roles_key, table_id) in local_cache
+        }
+        if len(filters) == len(table_ids):
+            return filters
+
+        cache = cache_manager.cache
+        shared_version = cache.get(RLS_FILTERS_VERSION_KEY)
+        if shared_version is None:
+            cache.add(RLS_FILTERS_VERSION_KEY, uuid.uuid4().hex)
+            shared_version = cache.get(RLS_FILTERS_VERSION_KEY)
+        # the cache is shared with other features, only trust values of the
+        # expected types
+        use_shared_cache = isinstance(shared_version, str)
+
+        def get_cache_key(table_id: int) -> str:
+            return f"rls_filters:{shared_version}:{roles_key}:{table_id}"
+
+        for table_id in table_ids - filters.keys():
+            cached = cache.get(get_cache_key(table_id)) if use_shared_cache else None
+            if isinstance(cached, list) and all(
+                isinstance(rls_filter, RLSFilter) for rls_filter in cached
+            ):
+                filters[table_id] = local_cache[(roles_key, table_id)] = cached
+
+        missing_ids = table_ids - filters.keys()
+        if not missing_ids:
+            return filters
+
+        regular_filter_roles = (
+            self.get_session.query(RLSFilterRoles.c.rls_filter_id)
+            .join(RowLevelSecurityFilter)
+            .filter(
+                RowLevelSecurityFilter.filter_type == RowLevelSecurityFilterType.REGULAR
             )
-            regular_filter_roles = (
-                self.get_session.query(RLSFilterRoles.c.rls_filter_id)
-                .join(RowLevelSecurityFilter)
-                .filter(
-                    RowLevelSecurityFilter.filter_type
-                    == RowLevelSecurityFilterType.REGULAR
-                )
-                .filter(RLSFilterRoles.c.role_id.in_(user_roles))
-                .subquery()
+            .filter(RLSFilterRoles.c.role_id.in_(role_ids))
+            .subquery()
+        )
+        base_filter_roles = (
+            self.get_session.query(RLSFilterRoles.c.rls_filter_id)
+            .join(RowLevelSecurityFilter)
+            .filter(
+                RowLevelSecurityFilter.filter_type == RowLevelSecurityFilterType.BASE
             )
-            base_filter_roles = (
-                self.get_session.query(RLSFilterRoles.c.rls_filter_id)
-                .join(RowLevelSecurityFilter)
-                .filter(
-                    RowLevelSecurityFilter.filter_type
-                    == RowLevelSecurityFilterType.BASE
-                )
-                .filter(RLSFilterRoles.c.role_id.in_(user_roles))
-                .subquery()
+            .filter(RLSFilterRoles.c.role_id.in_(role_ids))
+            .subquery()
+        )
+        query = (
+            self.get_session.query(
+                RLSFilterTables.c.table_id,
+                RowLevelSecurityFilter.id,
+                RowLevelSecurityFilter.group_key,
+                RowLevelSecurityFilter.clause,
             )
-            filter_tables = (
-                self.get_session.query(RLSFilterTables.c.rls_filter_id)
-                .filter(RLSFilterTables.c.table_id == table.id)
-                .subquery()
+            .join(
+                RLSFilterTables,
+                RLSFilterTables.c.rls_filter_id == RowLevelSecurityFilter.id,
             )
-            query = (
-                self.get_session.query(
-                    RowLevelSecurityFilter.id,
-                    RowLevelSecurityFilter.group_key,
-                    RowLevelSecurityFilter.clause,
-                )
-                .filter(RowLevelSecurityFilter.id.in_(filter_tables))
-                .filter(
-                    or_(
-                        and_(
-                            RowLevelSecurityFilter.filter_type
-                            == RowLevelSecurityFilterType.REGULAR,
-                            RowLevelSecurityFilter.id.in_(regular_filter_roles),
-                        ),
-                        and_(
-                            RowLevelSecurityFilter.filter_type
-                            == RowLevelSecurityFilterType.BASE,
-                            RowLevelSecurityFilter.id.notin_(base_filter_roles),
-                        ),
-                    )
+            .filter(RLSFilterTables.c.table_id.in_(missing_ids))
+            .filter(
+                or_(
+                    and_(
+                        RowLevelSecurityFilter.filter_type
+                        == RowLevelSecurityFilterType.REGULAR,
+                        RowLevelSecurityFilter.id.in_(regular_filter_roles),
+                    ),
+                    and_(
+                        RowLevelSecurityFilter.filter_type
+                        == RowLevelSecurityFilterType.BASE,
+                        RowLevelSecurityFilter.id.notin_(base_filter_roles),
+                    ),
                 )
             )
-            return query.all()
-        return []
+            .order_by(RowLevelSecurityFilter.id)
+        )
+        for table_id in missing_ids:
+            filters[table_id] = []
+        for table_id, filter_id, group_key, clause in query:
+            filters[table_id].append(RLSFilter(filter_id, group_key, clause))
+        for table_id in missing_ids:
+            local_cache[(roles_key, table_id)] = filters[table_id]
+            if use_shared_cache:
+                cache.set(get_cache_key(table_id), filters[table_id])
+        return filters
 
     def get_rls_ids(self, table: "BaseDatasource") -> List[int]:
         """
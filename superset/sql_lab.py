@@ -18,6 +18,7 @@ import logging
 import uuid
 from contextlib import closing
 from datetime import datetime
+from itertools import chain
 from sys import getsizeof
 from typing import Any, cast, Dict, List, Optional, Tuple, Union
 
@@ -34,11 +35,12 @@ from werkzeug.local import LocalProxy
 from superset import app, results_backend, results_backend_use_msgpack, security_manager
 from superset.dataframe import df_to_records
 from superset.db_engine_specs import BaseEngineSpec
-from superset.extensions import celery_app
+from superset.extensions import celery_app, results_backend_manager
 from superset.models.core import Database
 from superset.models.sql_lab import Query
 from superset.result_set import SupersetResultSet
 from superset.sql_parse import CtasMethod, ParsedQuery
+from superset.utils import arrow_ipc
 from superset.utils.celery import session_scope
 from superset.utils.core import (
     json_iso_dttm_ser,
@@ -67,6 +69,7 @@ SQLLAB_TIMEOUT = config["SQLLAB_ASYNC_TIME_LIMIT_SEC"]
 SQLLAB_HARD_TIMEOUT = SQLLAB_TIMEOUT + 60
 SQL_MAX_ROW = config["SQL_MAX_ROW"]
 SQLLAB_CTAS_NO_LIMIT = config["SQLLAB_CTAS_NO_LIMIT"]
+SQLLAB_FETCH_BATCH_SIZE = config["SQLLAB_FETCH_BATCH_SIZE"]
 SQL_QUERY_MUTATOR = config.get("SQL_QUERY_MUTATOR") or dummy_sql_query_mutator
 log_query = config["QUERY_LOGGER"]
 logger = logging.getLogger(__name__)
@@ -236,6 +239,17 @@ def execute_sql_statement(
                 query.id,
                 str(query.to_dict()),
             )
+            if SQLLAB_FETCH_BATCH_SIZE:
+                # convert the rows to arrow batch by batch to keep the memory
+                # footprint proportional to the batch size rather than the limit
+                batches = db_engine_spec.fetch_data_in_batches(
+                    cursor, query.limit, SQLLAB_FETCH_BATCH_SIZE
+                )
+                # some drivers only populate the description once rows are fetched
+                first_batch: List[Tuple[Any, ...]] = next(batches, [])
+                return SupersetResultSet.from_batches(
+                    chain([first_batch], batches), cursor.description, db_engine_spec
+                )
             data = db_engine_spec.fetch_data(cursor, query.limit)
 
     except SoftTimeLimitExceeded as ex:
@@ -303,6 +317,26 @@ def _serialize_and_expand_data(
     return (data, selected_columns, all_columns, expanded_columns)
 
 
+def _store_arrow_ipc_data(
+    key: str, result_set: SupersetResultSet, cache_timeout: int
+) -> List[int]:
+    """Stores the data of a result set as compressed Arrow IPC chunks
+
+    :returns: the number of rows in each chunk, to be kept with the metadata
+    """
+    with stats_timing(
+        "sqllab.query.results_backend_arrow_ipc_serialization", stats_logger
+    ):
+        return arrow_ipc.write_table(
+            results_backend,
+            key,
+            result_set.pa_table,
+            config["RESULTS_BACKEND_CHUNK_SIZE"],
+            compression=config["RESULTS_BACKEND_ARROW_COMPRESSION"],
+            timeout=cache_timeout,
+        )
+
+
 def execute_sql_statements(  # pylint: disable=too-many-arguments, too-many-locals, too-many-statements, too-many-branches
     query_id: int,
     rendered_query: str,
@@ -433,12 +467,24 @@ def execute_sql_statements(  # pylint: disable=too-many-arguments, too-many-loca
         )
     query.end_time = now_as_float()
 
+    use_arrow_ipc = store_results and results_backend_manager.should_use_arrow_ipc
     use_arrow_data = store_results and cast(bool, results_backend_use_msgpack)
-    data, selected_columns, all_columns, expanded_columns = _serialize_and_expand_data(
-        result_set, db_engine_spec, use_arrow_data, expand_data
-    )
+    data: Union[bytes, str, List[Any]]
+    expanded_columns: List[Any]
+    if use_arrow_ipc:
+        # the data is stored apart from the metadata, see `_store_arrow_ipc_data`
+        data, expanded_columns = [], []
+        selected_columns = all_columns = result_set.columns
+    else:
+        (
+            data,
+            selected_columns,
+            all_columns,
+            expanded_columns,
+        ) = _serialize_and_expand_data(
+            result_set, db_engine_spec, use_arrow_data, expand_data
+        )
 
-    # TODO: data should be saved separately from metadata (likely in Parquet)
     payload.update(
         {
             "status": QueryStatus.SUCCESS,
@@ -457,15 +503,22 @@ def execute_sql_statements(  # pylint: disable=too-many-arguments, too-many-loca
             "Query %s: Storing results in results backend, key: %s", str(query_id), key
         )
         with stats_timing("sqllab.query.results_backend_write", stats_logger):
+            cache_timeout = database.cache_timeout
+            if cache_timeout is None:
+                cache_timeout = config["CACHE_DEFAULT_TIMEOUT"]
+
+            if use_arrow_ipc:
+                # write the data first, so the metadata is only visible once the
+                # data is complete
+                payload["data_chunks"] = _store_arrow_ipc_data(
+                    key, result_set, cache_timeout
+                )
             with stats_timing(
                 "sqllab.query.results_backend_write_serialization", stats_logger
             ):
                 serialized_payload = _serialize_payload(
                     payload, cast(bool, results_backend_use_msgpack)
                 )
-            cache_timeout = database.cache_timeout
-            if cache_timeout is None:
-                cache_timeout = config["CACHE_DEFAULT_TIMEOUT"]
 
             compressed = zlib_compress(serialized_payload)
             logger.debug(
@@ -480,7 +533,8 @@ def execute_sql_statements(  # pylint: disable=too-many-arguments, too-many-loca
 
     if return_results:
         # since we're returning results we need to create non-arrow data
-        if use_arrow_data:
+        if use_arrow_data or use_arrow_ipc:
+            payload.pop("data_chunks", None)
             (
                 data,
                 selected_columns,
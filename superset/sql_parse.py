@@ -17,10 +17,11 @@
 import logging
 from dataclasses import dataclass  # pylint: disable=wrong-import-order
 from enum import Enum
-from typing import List, Optional, Set
+from typing import Any, FrozenSet, List, NamedTuple, Optional, Set, Tuple
 from urllib import parse
 
 import sqlparse
+from sqlparse.lexer import tokenize
 from sqlparse.sql import (
     Identifier,
     IdentifierList,
@@ -29,13 +30,25 @@ from sqlparse.sql import (
     Token,
     TokenList,
 )
-from sqlparse.tokens import Keyword, Name, Punctuation, String, Whitespace
+from sqlparse.tokens import (
+    Comment,
+    Keyword,
+    Name,
+    Number,
+    Punctuation,
+    String,
+    Whitespace,
+)
 from sqlparse.utils import imt
 
+from superset.utils.core import memoized
+
 RESULT_OPERATIONS = {"UNION", "INTERSECT", "EXCEPT", "SELECT"}
 ON_KEYWORD = "ON"
 PRECEDES_TABLE_NAME = {"FROM", "JOIN", "DESCRIBE", "WITH", "LEFT JOIN", "RIGHT JOIN"}
 CTE_PREFIX = "CTE__"
+# Number of distinct SQL texts whose parse results are kept by each worker
+PARSE_CACHE_SIZE = 1000
 logger = logging.getLogger(__name__)
 
 
@@ -65,6 +78,77 @@ def _extract_limit_from_query(statement: TokenList) -> Optional[int]:
     return None
 
 
+class LimitClause(NamedTuple):
+    """
+    The LIMIT clause ending a statement, as found by its tokens only.
+    """
+
+    # None when the statement has no LIMIT clause
+    limit: Optional[int] = None
+    # the offset of "LIMIT <offset>, <limit>"
+    offset: Optional[str] = None
+    # the position in the SQL text of the value(s) following LIMIT
+    start: int = 0
+    end: int = 0
+
+
+@memoized(max_size=PARSE_CACHE_SIZE, stats_key="sql_parse_cache")
+def _scan_limit_clause(sql: str) -> Optional[LimitClause]:
+    """
+    Find the LIMIT clause of a single statement by tokenizing it, which is an order
+    of magnitude faster than the grouping of tokens done by ``sqlparse.parse``.
+
+    Only a LIMIT outside brackets followed by ``<limit>``, ``<limit> OFFSET <n>``
+    or ``<offset>, <limit>`` and comments at most is handled, for the other cases,
+    e.g. several statements or a non literal limit, the statement needs to be parsed.
+
+    :param sql: The SQL text, stripped
+    :returns: The LIMIT clause, or None if the statement needs to be parsed
+    """
+    depth = 0
+    position = 0
+    limit_position: Optional[int] = None
+    trailing: List[Tuple[Any, str, int]] = []
+    for ttype, value in tokenize(sql):
+        if ttype in Punctuation:
+            if value == ";":
+                return None
+            if value == "(":
+                depth += 1
+            elif value == ")":
+                depth -= 1
+                if depth < 0:
+                    return None
+        if ttype is Keyword and depth == 0 and value.upper() == "LIMIT":
+            if limit_position is not None:
+                return None
+            limit_position = position
+        elif limit_position is not None and ttype not in Whitespace:
+            trailing.append((ttype, value, position))
+        position += len(value)
+
+    if depth:
+        return None
+    if limit_position is None:
+        return LimitClause()
+
+    while trailing and trailing[-1][0] in Comment:
+        trailing.pop()
+    types = [ttype for ttype, _, _ in trailing]
+    values = [value.upper() for _, value, _ in trailing]
+    if types == [Number.Integer] or (
+        types == [Number.Integer, Keyword, Number.Integer] and values[1] == "OFFSET"
+    ):
+        _, value, start = trailing[0]
+        return LimitClause(limit=int(value), start=start, end=start + len(value))
+    if types == [Number.Integer, Punctuation, Number.Integer] and values[1] == ",":
+        (_, offset, start), _, (_, value, end) = trailing
+        return LimitClause(
+            limit=int(value), offset=offset, start=start, end=end + len(value)
+        )
+    return None
+
+
 def strip_comments_from_sql(statement: str) -> str:
     """
     Strips comments from a SQL statement, does a simple test first
@@ -78,6 +162,11 @@ def strip_comments_from_sql(statement: str) -> str:
     return ParsedQuery(statement).strip_comments() if "--" in statement else statement
 
 
+@memoized(max_size=PARSE_CACHE_SIZE, stats_key="sql_parse_cache")
+def _format_without_comments(sql: str) -> str:
+    return sqlparse.format(sql, strip_comments=True)
+
+
 @dataclass(eq=True, frozen=True)
 class Table:  # pylint: disable=too-few-public-methods
     """
@@ -100,88 +189,137 @@ class Table:  # pylint: disable=too-few-public-methods
         )
 
 
+class ParseResult(NamedTuple):
+    """
+    What is derived from parsing a SQL text, immutable so that it can be shared by
+    all the ``ParsedQuery`` instances built for the same text.
+    """
+
+    statements: List[str]
+    statement_types: List[str]
+    limit: Optional[int]
+    tables: FrozenSet[Table]
+
+
+@memoized(max_size=PARSE_CACHE_SIZE, stats_key="sql_parse_cache")
+def _parse(sql: str) -> ParseResult:
+    """
+    Parse a SQL text. The results are kept for the ``PARSE_CACHE_SIZE`` most
+    recently parsed texts, as the same query is parsed by the SQL Lab handlers, the
+    security manager and the engine specs while being run.
+
+    :param sql: The SQL text, stripped
+    :returns: The statements, their types, limit and tables of the SQL text
+    """
+    logger.debug("Parsing with sqlparse statement: %s", sql)
+    parsed = sqlparse.parse(sql)
+    statements = []
+    for statement in parsed:
+        if statement:
+            statement_sql = str(statement).strip(" \n;\t")
+            if statement_sql:
+                statements.append(statement_sql)
+    limit = None
+    for statement in parsed:
+        limit = _extract_limit_from_query(statement)
+    return ParseResult(
+        statements=statements,
+        statement_types=[statement.get_type() for statement in parsed],
+        limit=limit,
+        tables=frozenset(
+            ParsedQuery._extract_tables(parsed)  # pylint: disable=protected-access
+        ),
+    )
+
+
 class ParsedQuery:
     def __init__(self, sql_statement: str, strip_comments: bool = False):
         if strip_comments:
-            sql_statement = sqlparse.format(sql_statement, strip_comments=True)
+            sql_statement = _format_without_comments(sql_statement)
 
         self.sql: str = sql_statement
         self._tables: Set[Table] = set()
         self._alias_names: Set[str] = set()
-        self._limit: Optional[int] = None
+        self._result: Optional[ParseResult] = None
+        self._statements: Optional[List[TokenList]] = None
 
-        logger.debug("Parsing with sqlparse statement: %s", self.sql)
-        self._parsed = sqlparse.parse(self.stripped())
-        for statement in self._parsed:
-            self._limit = _extract_limit_from_query(statement)
+    @property
+    def _parse_result(self) -> ParseResult:
+        if self._result is None:
+            self._result = _parse(self.stripped())
+        return self._result
 
     @property
-    def tables(self) -> Set[Table]:
-        if not self._tables:
-            for statement in self._parsed:
-                self._extract_from_token(statement)
+    def _parsed(self) -> List[TokenList]:
+        """
+        The token trees of the statements, parsed again for each instance as they
+        are modified in place, e.g. when setting the limit.
+        """
+        if self._statements is None:
+            self._statements = list(sqlparse.parse(self.stripped()))
+        return self._statements
 
-            self._tables = {
-                table for table in self._tables if str(table) not in self._alias_names
-            }
-        return self._tables
+    @property
+    def tables(self) -> Set[Table]:
+        return set(self._parse_result.tables)
 
     @property
     def limit(self) -> Optional[int]:
-        return self._limit
+        if self._result is None:
+            limit_clause = _scan_limit_clause(self.stripped())
+            if limit_clause is not None:
+                return limit_clause.limit
+        return self._parse_result.limit
 
     def is_select(self) -> bool:
-        return self._parsed[0].get_type() == "SELECT"
+        return self._parse_result.statement_types[0] == "SELECT"
 
     def is_valid_ctas(self) -> bool:
-        return self._parsed[-1].get_type() == "SELECT"
+        return self._parse_result.statement_types[-1] == "SELECT"
 
     def is_valid_cvas(self) -> bool:
-        return len(self._parsed) == 1 and self._parsed[0].get_type() == "SELECT"
+        statement_types = self._parse_result.statement_types
+        return len(statement_types) == 1 and statement_types[0] == "SELECT"
 
     def is_explain(self) -> bool:
-        # Remove comments
-        statements_without_comments = sqlparse.format(
-            self.stripped(), strip_comments=True
-        )
-
         # Explain statements will only be the first statement
-        return statements_without_comments.startswith("EXPLAIN")
+        return self.strip_comments().startswith("EXPLAIN")
 
     def is_show(self) -> bool:
-        # Remove comments
-        statements_without_comments = sqlparse.format(
-            self.stripped(), strip_comments=True
-        )
         # Show statements will only be the first statement
-        return statements_without_comments.upper().startswith("SHOW")
+        return self.strip_comments().upper().startswith("SHOW")
 
     def is_set(self) -> bool:
-        # Remove comments
-        statements_without_comments = sqlparse.format(
-            self.stripped(), strip_comments=True
-        )
         # Set statements will only be the first statement
-        return statements_without_comments.upper().startswith("SET")
+        return self.strip_comments().upper().startswith("SET")
 
     def is_unknown(self) -> bool:
-        return self._parsed[0].get_type() == "UNKNOWN"
+        return self._parse_result.statement_types[0] == "UNKNOWN"
 
     def stripped(self) -> str:
         return self.sql.strip(" \t\n;")
 
     def strip_comments(self) -> str:
-        return sqlparse.format(self.stripped(), strip_comments=True)
+        return _format_without_comments(self.stripped())
 
     def get_statements(self) -> List[str]:
         """Returns a list of SQL statements as strings, stripped"""
-        statements = []
-        for statement in self._parsed:
-            if statement:
-                sql = str(statement).strip(" \n;\t")
-                if sql:
-                    statements.append(sql)
-        return statements
+        return list(self._parse_result.statements)
+
+    @classmethod
+    def _extract_tables(cls, statements: List[TokenList]) -> Set[Table]:
+        """
+        Return the tables referenced by the parsed statements, excluding aliases.
+
+        :param statements: The token trees of the statements
+        :returns: The tables referenced
+        """
+        query = cls("")
+        for statement in statements:
+            query._extract_from_token(statement)
+        return {
+            table for table in query._tables if str(table) not in query._alias_names
+        }
 
     @staticmethod
     def _get_table(tlist: TokenList) -> Optional[Table]:
@@ -321,8 +459,19 @@ class ParsedQuery:
         :param new_limit: Limit to be incorporated into returned query
         :return: The original query with new limit
         """
-        if not self._limit:
+        if not self.limit:
             return f"{self.stripped()}\nLIMIT {new_limit}"
+        sql = self.stripped()
+        limit_clause = _scan_limit_clause(sql)
+        if limit_clause is not None and limit_clause.limit is not None:
+            if limit_clause.offset is not None:
+                value = f"{limit_clause.offset}, {new_limit}"
+            elif new_limit < limit_clause.limit:
+                value = str(new_limit)
+            else:
+                return sql
+            return f"{sql[:limit_clause.start]}{value}{sql[limit_clause.end:]}"
+
         limit_pos = None
         statement = self._parsed[0]
         # Add all items to before_str until there is a limit
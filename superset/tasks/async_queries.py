@@ -18,11 +18,16 @@
 import logging
 from typing import Any, cast, Dict, Optional
 
-from flask import current_app
+from flask import current_app, g
 
 from superset import app
 from superset.exceptions import SupersetVizException
-from superset.extensions import async_query_manager, cache_manager, celery_app
+from superset.extensions import (
+    async_query_manager,
+    cache_manager,
+    celery_app,
+    security_manager,
+)
 from superset.utils.cache import generate_cache_key, set_and_log_cache
 from superset.views.utils import get_datasource_info, get_viz
 
@@ -34,16 +39,30 @@ query_timeout = current_app.config[
 
 @celery_app.task(name="load_chart_data_into_cache", soft_time_limit=query_timeout)
 def load_chart_data_into_cache(
-    job_metadata: Dict[str, Any], form_data: Dict[str, Any],
+    job_metadata: Optional[Dict[str, Any]],
+    form_data: Dict[str, Any],
+    user_id: Optional[int] = None,
+    refresh_key: Optional[str] = None,
 ) -> None:
+    """
+    Run a chart data query, caching its results. Without job metadata, the query
+    refreshes stale cached results, as the user with the given id, and no async
+    query event is emitted. The refresh key taken to request the refresh is deleted
+    once done, so that another refresh can be requested.
+    """
     from superset.charts.commands.data import (
         ChartDataCommand,
     )  # load here due to circular imports
 
     with app.app_context():  # type: ignore
+        if user_id is not None:
+            g.user = security_manager.get_user_by_id(user_id)
         try:
             command = ChartDataCommand()
             command.set_query_context(form_data)
+            if job_metadata is None:
+                command.run()
+                return None
             result = command.run(cache=True)
             cache_key = result["cache_key"]
             result_url = f"/api/v1/chart/data/{cache_key}"
@@ -54,22 +73,36 @@ def load_chart_data_into_cache(
             # TODO: QueryContext should support SIP-40 style errors
             error = exc.message if hasattr(exc, "message") else str(exc)  # type: ignore # pylint: disable=no-member
             errors = [{"message": error}]
-            async_query_manager.update_job(
-                job_metadata, async_query_manager.STATUS_ERROR, errors=errors
-            )
+            if job_metadata is not None:
+                async_query_manager.update_job(
+                    job_metadata, async_query_manager.STATUS_ERROR, errors=errors
+                )
             raise exc
+        finally:
+            if refresh_key:
+                cache_manager.data_cache.delete(refresh_key)
 
         return None
 
 
 @celery_app.task(name="load_explore_json_into_cache", soft_time_limit=query_timeout)
-def load_explore_json_into_cache(
-    job_metadata: Dict[str, Any],
+def load_explore_json_into_cache(  # pylint: disable=too-many-arguments
+    job_metadata: Optional[Dict[str, Any]],
     form_data: Dict[str, Any],
     response_type: Optional[str] = None,
     force: bool = False,
+    user_id: Optional[int] = None,
+    refresh_key: Optional[str] = None,
 ) -> None:
+    """
+    Run the queries of a legacy chart, caching their results. Without job metadata,
+    the queries refresh stale cached results, as the user with the given id, and no
+    async query event is emitted. The refresh key taken to request the refresh is
+    deleted once done, so that another refresh can be requested.
+    """
     with app.app_context():  # type: ignore
+        if user_id is not None:
+            g.user = security_manager.get_user_by_id(user_id)
         cache_key_prefix = "ejr-"  # ejr: explore_json request
         try:
             datasource_id, datasource_type = get_datasource_info(None, None, form_data)
@@ -84,6 +117,8 @@ def load_explore_json_into_cache(
             payload = viz_obj.get_payload()
             if viz_obj.has_error(payload):
                 raise SupersetVizException(errors=payload["errors"])
+            if job_metadata is None:
+                return None
 
             # cache form_data for async retrieval
             cache_value = {"form_data": form_data, "response_type": response_type}
@@ -102,9 +137,13 @@ def load_explore_json_into_cache(
                 )
                 errors = [error]
 
-            async_query_manager.update_job(
-                job_metadata, async_query_manager.STATUS_ERROR, errors=errors
-            )
+            if job_metadata is not None:
+                async_query_manager.update_job(
+                    job_metadata, async_query_manager.STATUS_ERROR, errors=errors
+                )
             raise exc
+        finally:
+            if refresh_key:
+                cache_manager.data_cache.delete(refresh_key)
 
         return None
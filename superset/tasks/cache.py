@@ -18,21 +18,30 @@
 
 import json
 import logging
-from typing import Any, Dict, List, Optional, Union
+from collections import defaultdict
+from datetime import datetime
+from timeit import default_timer
+from typing import Any, DefaultDict, Dict, List, Optional, Tuple, Union
 from urllib import request
 from urllib.error import URLError
 
 from celery.utils.log import get_task_logger
+from flask import g
 from sqlalchemy import and_, func
 
 from superset import app, db
-from superset.extensions import celery_app
+from superset.exceptions import SupersetException
+from superset.extensions import cache_manager, celery_app
+from superset.models.cache import CacheKey
 from superset.models.core import Log
 from superset.models.dashboard import Dashboard
 from superset.models.slice import Slice
 from superset.models.tags import Tag, TaggedObject
+from superset.utils.cache import is_stale
+from superset.utils.core import error_msg_from_exception, parallel_map
 from superset.utils.date_parser import parse_human_datetime
-from superset.views.utils import build_extra_filters
+from superset.utils.hashing import md5_sha_from_dict
+from superset.views.utils import build_extra_filters, get_viz
 
 logger = get_task_logger(__name__)
 logger.setLevel(logging.INFO)
@@ -85,12 +94,109 @@ def get_url(chart: Slice, extra_filters: Optional[Dict[str, Any]] = None) -> str
         return f"{baseurl}{chart.get_explore_url(overrides=extra_filters)}"
 
 
+def warm_up_chart(chart_id: int, form_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run the query of a chart in process, caching its data, unless its data is
+    already cached and not stale.
+
+    :param chart_id: The chart id
+    :param form_data: The form data overriding the chart's, e.g. extra filters
+    :returns: The chart id, whether it was skipped, the duration and the error
+    """
+    start = default_timer()
+    result: Dict[str, Any] = {"chart_id": chart_id, "skipped": False, "error": None}
+    try:
+        chart = db.session.query(Slice).get(chart_id)
+        if not chart:
+            raise SupersetException(f"Chart {chart_id} not found")
+        form_data = {**chart.form_data, **form_data}
+        viz_obj = get_viz(
+            datasource_type=chart.datasource_type,
+            datasource_id=chart.datasource_id,
+            form_data=form_data,
+        )
+        query_obj = viz_obj.query_obj()
+        cache_key = viz_obj.cache_key(query_obj) if query_obj else None
+        cache_value = cache_manager.data_cache.get(cache_key) if cache_key else None
+        if cache_value and not is_stale(cache_value):
+            result["skipped"] = True
+        else:
+            viz_obj.force = True
+            g.form_data = form_data
+            try:
+                payload = viz_obj.get_payload()
+            finally:
+                delattr(g, "form_data")
+            if payload["errors"]:
+                result["error"] = payload["errors"][0]["message"]
+    except Exception as ex:  # pylint: disable=broad-except
+        logger.exception("Error warming up chart %s", chart_id)
+        result["error"] = error_msg_from_exception(ex)
+
+    result["duration"] = default_timer() - start
+    logger.info(
+        "Warmed up chart %s in %.3fs%s",
+        chart_id,
+        result["duration"],
+        " (skipped)" if result["skipped"] else "",
+    )
+    return result
+
+
+def warm_up_charts(
+    payloads: List[Dict[str, Any]], concurrency: int, max_databases: int
+) -> List[Dict[str, Any]]:
+    """
+    Warm up charts in process, running the queries against up to `max_databases`
+    databases concurrently, and at most `concurrency` of them at the same time
+    against each, i.e. at most `concurrency * max_databases` queries in total.
+
+    :param payloads: The charts to warm up, as returned by `Strategy.get_payloads`
+    :param concurrency: The number of queries to run against each database
+    :param max_databases: The number of databases to query at the same time
+    :returns: The results of `warm_up_chart`, in the order of the payloads
+    """
+    session = db.create_scoped_session()
+    chart_ids = {payload["chart_id"] for payload in payloads}
+    charts = {
+        chart.id: chart
+        for chart in session.query(Slice).filter(Slice.id.in_(chart_ids)).all()
+    }
+
+    indexes_by_database: DefaultDict[Optional[int], List[int]] = defaultdict(list)
+    for index, payload in enumerate(payloads):
+        chart = charts.get(payload["chart_id"])
+        database_id = getattr(chart.datasource, "database_id", None) if chart else None
+        indexes_by_database[database_id].append(index)
+
+    def warm_up_database(indexes: List[int]) -> List[Dict[str, Any]]:
+        return parallel_map(
+            lambda index: warm_up_chart(
+                payloads[index]["chart_id"], payloads[index]["form_data"]
+            ),
+            indexes,
+            concurrency,
+        )
+
+    database_indexes = list(indexes_by_database.values())
+    results: Dict[int, Dict[str, Any]] = {}
+    for indexes, database_results in zip(
+        database_indexes,
+        parallel_map(warm_up_database, database_indexes, max_databases),
+    ):
+        results.update(zip(indexes, database_results))
+
+    return [results[index] for index in range(len(payloads))]
+
+
 class Strategy:
     """
     A cache warm up strategy.
 
-    Each strategy defines a `get_urls` method that returns a list of URLs to
-    be fetched from the `/superset/warm_up_cache/` endpoint.
+    Each strategy defines a `get_payloads` method that returns the charts to warm
+    up, along with the form data overriding theirs. Their URLs are fetched from the
+    web server, or their queries run in process when `CACHE_WARMUP_IN_PROCESS` is
+    set.
 
     Strategies can be configured in `superset/config.py`:
 
@@ -111,8 +217,22 @@ class Strategy:
     def __init__(self) -> None:
         pass
 
+    def get_payloads(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError("Subclasses must implement get_payloads!")
+
     def get_urls(self) -> List[str]:
-        raise NotImplementedError("Subclasses must implement get_urls!")
+        payloads = self.get_payloads()
+        session = db.create_scoped_session()
+        chart_ids = {payload["chart_id"] for payload in payloads}
+        charts = {
+            chart.id: chart
+            for chart in session.query(Slice).filter(Slice.id.in_(chart_ids)).all()
+        }
+
+        return [
+            get_url(charts[payload["chart_id"]], payload["form_data"])
+            for payload in payloads
+        ]
 
 
 class DummyStrategy(Strategy):
@@ -133,11 +253,14 @@ class DummyStrategy(Strategy):
 
     name = "dummy"
 
-    def get_urls(self) -> List[str]:
+    def get_payloads(self) -> List[Dict[str, Any]]:
         session = db.create_scoped_session()
         charts = session.query(Slice).all()
 
-        return [get_url(chart) for chart in charts]
+        return [
+            {"chart_id": chart.id, "form_data": {"slice_id": chart.id}}
+            for chart in charts
+        ]
 
 
 class TopNDashboardsStrategy(Strategy):
@@ -165,8 +288,8 @@ class TopNDashboardsStrategy(Strategy):
         self.top_n = top_n
         self.since = parse_human_datetime(since) if since else None
 
-    def get_urls(self) -> List[str]:
-        urls = []
+    def get_payloads(self) -> List[Dict[str, Any]]:
+        payloads = []
         session = db.create_scoped_session()
 
         records = (
@@ -182,9 +305,11 @@ class TopNDashboardsStrategy(Strategy):
         for dashboard in dashboards:
             for chart in dashboard.slices:
                 form_data_with_filters = get_form_data(chart.id, dashboard)
-                urls.append(get_url(chart, form_data_with_filters))
+                payloads.append(
+                    {"chart_id": chart.id, "form_data": form_data_with_filters}
+                )
 
-        return urls
+        return payloads
 
 
 class DashboardTagsStrategy(Strategy):
@@ -209,8 +334,8 @@ class DashboardTagsStrategy(Strategy):
         super(DashboardTagsStrategy, self).__init__()
         self.tags = tags or []
 
-    def get_urls(self) -> List[str]:
-        urls = []
+    def get_payloads(self) -> List[Dict[str, Any]]:
+        payloads = []
         session = db.create_scoped_session()
 
         tags = session.query(Tag).filter(Tag.name.in_(self.tags)).all()
@@ -231,7 +356,9 @@ class DashboardTagsStrategy(Strategy):
         tagged_dashboards = session.query(Dashboard).filter(Dashboard.id.in_(dash_ids))
         for dashboard in tagged_dashboards:
             for chart in dashboard.slices:
-                urls.append(get_url(chart))
+                payloads.append(
+                    {"chart_id": chart.id, "form_data": {"slice_id": chart.id}}
+                )
 
         # add charts that are tagged
         tagged_objects = (
@@ -247,18 +374,138 @@ class DashboardTagsStrategy(Strategy):
         chart_ids = [tagged_object.object_id for tagged_object in tagged_objects]
         tagged_charts = session.query(Slice).filter(Slice.id.in_(chart_ids))
         for chart in tagged_charts:
-            urls.append(get_url(chart))
+            payloads.append({"chart_id": chart.id, "form_data": {"slice_id": chart.id}})
+
+        return payloads
+
+
+class HotCacheKeysStrategy(Strategy):
+    """
+    Warm up the chart queries users wait for the most.
+
+    The chart data requests logged since `since` are grouped by chart and form
+    data, i.e. by the filters and time range users applied. Each group is scored
+    with the time users waited for its requests, a request counting half as much
+    every `half_life` hours. Scores are weighted by the share of the requests on
+    their datasource which missed the cache, estimated from the `CacheKey` records
+    when `STORE_CACHE_KEYS_IN_METADATA_DB` is set. At most `budget` queries are
+    warmed up against each database, the highest scored first.
+
+        CELERYBEAT_SCHEDULE = {
+            'cache-warmup-hourly': {
+                'task': 'cache-warmup',
+                'schedule': crontab(minute=1, hour='*'),  # @hourly
+                'kwargs': {
+                    'strategy_name': 'hot_cache_keys',
+                    'since': '7 days ago',
+                    'half_life': 24,
+                    'budget': 100,
+                },
+            },
+        }
 
-        return urls
+    """
 
+    name = "hot_cache_keys"
 
-strategies = [DummyStrategy, TopNDashboardsStrategy, DashboardTagsStrategy]
+    def __init__(
+        self, since: str = "7 days ago", half_life: float = 24, budget: int = 100
+    ) -> None:
+        super(HotCacheKeysStrategy, self).__init__()
+        self.since = parse_human_datetime(since) if since else None
+        self.half_life = half_life
+        self.budget = budget
+
+    def get_payloads(self) -> List[Dict[str, Any]]:
+        session = db.create_scoped_session()
+        now = datetime.utcnow()
+
+        scores: DefaultDict[Tuple[int, str], float] = defaultdict(float)
+        form_datas: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        requests: DefaultDict[int, int] = defaultdict(int)
+        logs = (
+            session.query(Log.slice_id, Log.dttm, Log.duration_ms, Log.json)
+            .filter(
+                and_(
+                    Log.action == "explore_json",
+                    Log.slice_id > 0,
+                    Log.dttm >= self.since,
+                )
+            )
+            .order_by(Log.dttm.desc())
+        )
+        for chart_id, dttm, duration_ms, json_string in logs.yield_per(1000):
+            try:
+                form_data = json.loads(json_string)["form_data"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            if not isinstance(form_data, dict):
+                continue
+            key = (chart_id, md5_sha_from_dict(form_data))
+            age = (now - dttm).total_seconds() / 3600
+            scores[key] += 0.5 ** (age / self.half_life) * (duration_ms or 1)
+            # keep the latest form data, as logs are the most recent first
+            form_datas.setdefault(key, form_data)
+            requests[chart_id] += 1
+
+        charts = {
+            chart.id: chart
+            for chart in session.query(Slice).filter(Slice.id.in_(requests)).all()
+            if chart.datasource
+        }
+        requests_by_datasource: DefaultDict[str, int] = defaultdict(int)
+        for chart_id, count in requests.items():
+            if chart_id in charts:
+                requests_by_datasource[charts[chart_id].datasource.uid] += count
+        misses_by_datasource = dict(
+            session.query(CacheKey.datasource_uid, func.count(CacheKey.id))
+            .filter(
+                and_(
+                    CacheKey.datasource_uid.in_(requests_by_datasource),
+                    CacheKey.created_on >= self.since,
+                )
+            )
+            .group_by(CacheKey.datasource_uid)
+            .all()
+        )
+
+        def miss_rate(chart: Slice) -> float:
+            uid = chart.datasource.uid
+            if uid not in misses_by_datasource:
+                return 1.0
+            return min(1.0, misses_by_datasource[uid] / requests_by_datasource[uid])
+
+        ranked = sorted(
+            (
+                (score * miss_rate(charts[key[0]]), key)
+                for key, score in scores.items()
+                if key[0] in charts
+            ),
+            reverse=True,
+        )
+        payloads = []
+        queries: DefaultDict[Optional[int], int] = defaultdict(int)
+        for _, key in ranked:
+            database_id = getattr(charts[key[0]].datasource, "database_id", None)
+            if queries[database_id] < self.budget:
+                queries[database_id] += 1
+                payloads.append({"chart_id": key[0], "form_data": form_datas[key]})
+
+        return payloads
+
+
+strategies = [
+    DummyStrategy,
+    TopNDashboardsStrategy,
+    DashboardTagsStrategy,
+    HotCacheKeysStrategy,
+]
 
 
 @celery_app.task(name="cache-warmup")
 def cache_warmup(
     strategy_name: str, *args: Any, **kwargs: Any
-) -> Union[Dict[str, List[str]], str]:
+) -> Union[Dict[str, List[Any]], str]:
     """
     Warm up cache.
 
@@ -284,7 +531,23 @@ def cache_warmup(
         logger.exception(message)
         return message
 
-    results: Dict[str, List[str]] = {"success": [], "errors": []}
+    if app.config["CACHE_WARMUP_IN_PROCESS"]:
+        chart_results = warm_up_charts(
+            strategy.get_payloads(),
+            app.config["CACHE_WARMUP_CONCURRENCY"],
+            app.config["CACHE_WARMUP_MAX_DATABASES"],
+        )
+        return {
+            "success": [
+                result
+                for result in chart_results
+                if not result["skipped"] and not result["error"]
+            ],
+            "skipped": [result for result in chart_results if result["skipped"]],
+            "errors": [result for result in chart_results if result["error"]],
+        }
+
+    results: Dict[str, List[Any]] = {"success": [], "errors": []}
     for url in strategy.get_urls():
         try:
             logger.info("Fetching %s", url)
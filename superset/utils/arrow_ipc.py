@@ -0,0 +1,130 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Storage of Arrow tables in a cache as compressed Arrow IPC streams.
+
+Tables are split into chunks of a fixed number of rows, each chunk being stored
+under its own key. Readers only need the row counts of the chunks (kept in the
+metadata stored alongside) to fetch the chunks covering a range of rows.
+"""
+from typing import List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+from cachelib.base import BaseCache
+
+from superset.exceptions import SerializationError
+
+
+def chunk_key(key: str, index: int) -> str:
+    return f"{key}:{index}"
+
+
+def serialize_table(table: pa.Table, compression: Optional[str] = None) -> bytes:
+    """Serializes a table to the Arrow IPC stream format, compressing each
+    column buffer with the given codec (``zstd`` or ``lz4``)"""
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def deserialize_table(blob: bytes, columns: Optional[List[str]] = None) -> pa.Table:
+    """Deserializes an Arrow IPC stream, optionally keeping only some columns"""
+    try:
+        table = pa.ipc.open_stream(blob).read_all()
+    except (pa.ArrowInvalid, OSError) as ex:
+        raise SerializationError("Unable to deserialize table") from ex
+    if columns is not None:
+        table = table.select([name for name in columns if name in table.column_names])
+    return table
+
+
+def serialize_dataframe(df: pd.DataFrame, compression: Optional[str] = None) -> bytes:
+    """Serializes a DataFrame along with the pandas metadata needed to restore its
+    index and dtypes
+
+    :raises ValueError: if the DataFrame holds nested values, which wouldn't be
+        restored as they were
+    """
+    table = pa.Table.from_pandas(df)
+    if any(pa.types.is_nested(field.type) for field in table.schema):
+        raise ValueError("Nested values can't be serialized")
+    return serialize_table(table, compression)
+
+
+def deserialize_dataframe(blob: bytes) -> pd.DataFrame:
+    # integers with nulls are kept as Python ints, as in `SupersetResultSet`,
+    # rather than turned into floats losing precision on big values
+    return deserialize_table(blob).to_pandas(integer_object_nulls=True)
+
+
+def write_table(  # pylint: disable=too-many-arguments
+    cache: BaseCache,
+    key: str,
+    table: pa.Table,
+    chunk_size: int,
+    compression: Optional[str] = None,
+    timeout: Optional[int] = None,
+) -> List[int]:
+    """Stores a table in chunks of at most ``chunk_size`` rows
+
+    :returns: the number of rows in each of the stored chunks
+    """
+    chunk_rows: List[int] = []
+    for offset in range(0, max(table.num_rows, 1), chunk_size):
+        chunk = table.slice(offset, chunk_size)
+        cache.set(
+            chunk_key(key, len(chunk_rows)),
+            serialize_table(chunk, compression),
+            timeout=timeout,
+        )
+        chunk_rows.append(chunk.num_rows)
+    return chunk_rows
+
+
+def read_table(
+    cache: BaseCache,
+    key: str,
+    chunk_rows: List[int],
+    offset: int = 0,
+    limit: Optional[int] = None,
+    columns: Optional[List[str]] = None,
+) -> pa.Table:
+    """Reads ``limit`` rows starting at ``offset`` from a table stored with
+    `write_table`, only fetching the chunks covering those rows"""
+    end = sum(chunk_rows) if limit is None else offset + limit
+    chunks: List[Tuple[int, int]] = []
+    chunk_start = 0
+    for index, num_rows in enumerate(chunk_rows):
+        if chunk_start < end and chunk_start + num_rows > offset:
+            chunks.append((index, chunk_start))
+        chunk_start += num_rows
+    if not chunks:
+        # the first chunk is still needed for the schema of the table
+        chunks = [(0, 0)]
+
+    tables: List[pa.Table] = []
+    for index, chunk_start in chunks:
+        blob = cache.get(chunk_key(key, index))
+        if blob is None:
+            raise SerializationError(f"Missing chunk {index} of results {key}")
+        table = deserialize_table(blob, columns)
+        start = max(offset - chunk_start, 0)
+        stop = min(end - chunk_start, table.num_rows)
+        tables.append(table.slice(start, max(stop - start, 0)))
+    return pa.concat_tables(tables)
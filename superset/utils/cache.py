@@ -17,10 +17,14 @@
 import hashlib
 import json
 import logging
+import time
+import uuid
 from datetime import datetime, timedelta
 from functools import wraps
-from typing import Any, Callable, Dict, Optional, Union
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 
+import pandas as pd
+import pyarrow as pa
 from flask import current_app as app, request
 from flask_caching import Cache
 from werkzeug.wrappers.etag import ETagResponseMixin
@@ -29,7 +33,9 @@ from superset import db
 from superset.extensions import cache_manager
 from superset.models.cache import CacheKey
 from superset.stats_logger import BaseStatsLogger
+from superset.utils import arrow_ipc
 from superset.utils.core import json_int_dttm_ser
+from superset.utils.dates import now_as_float
 
 config = app.config  # type: ignore
 stats_logger: BaseStatsLogger = config["STATS_LOGGER"]
@@ -53,11 +59,16 @@ def set_and_log_cache(
     cache_value: Dict[str, Any],
     cache_timeout: Optional[int] = None,
     datasource_uid: Optional[str] = None,
+    stale_timeout: Optional[int] = None,
 ) -> None:
     timeout = cache_timeout if cache_timeout else config["CACHE_DEFAULT_TIMEOUT"]
     try:
         dttm = datetime.utcnow().isoformat().split(".")[0]
         value = {**cache_value, "dttm": dttm}
+        if stale_timeout:
+            # keep the value past its timeout, flagging it as stale from then on
+            value["stale_after"] = time.time() + timeout
+            timeout += stale_timeout
         cache_instance.set(cache_key, value, timeout=timeout)
         stats_logger.incr("set_cache_key")
 
@@ -75,6 +86,100 @@ def set_and_log_cache(
         logger.exception(ex)
 
 
+def encode_dataframe(df: pd.DataFrame) -> Union[pd.DataFrame, bytes]:
+    """
+    Encode a DataFrame to be stored in the data cache as a compressed Arrow IPC
+    stream if `DATA_CACHE_USE_ARROW` is set, rather than having it pickled.
+    DataFrames Arrow can't represent faithfully are left as they are.
+    """
+    if not config["DATA_CACHE_USE_ARROW"] or not all(
+        isinstance(column, str) for column in df.columns
+    ):
+        return df
+    start_ts = now_as_float()
+    try:
+        blob = arrow_ipc.serialize_dataframe(df, config["DATA_CACHE_ARROW_COMPRESSION"])
+    except (pa.ArrowException, TypeError, ValueError) as ex:
+        logger.info("Could not encode DataFrame as Arrow: %s", ex)
+        return df
+    stats_logger.timing("data_cache.arrow_encode", now_as_float() - start_ts)
+    stats_logger.gauge("data_cache.arrow_encoded_size", len(blob))
+    return blob
+
+
+def decode_dataframe(value: Union[pd.DataFrame, bytes]) -> pd.DataFrame:
+    """Decode a DataFrame encoded by `encode_dataframe`"""
+    if not isinstance(value, bytes):
+        return value
+    start_ts = now_as_float()
+    df = arrow_ipc.deserialize_dataframe(value)
+    stats_logger.timing("data_cache.arrow_decode", now_as_float() - start_ts)
+    return df
+
+
+def _lock_key(cache_key: str) -> str:
+    return f"{cache_key}__lock"
+
+
+def acquire_cache_lock(
+    cache_instance: Cache, cache_key: str
+) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """
+    Coalesce the computation of a missing cache value across concurrent requests.
+
+    The first caller takes a lock on the key and is expected to compute and cache
+    the value, then release the lock with `release_cache_lock`. Other callers wait
+    for the value to be cached, and take the lock over if it is released or expires
+    without a value being cached. They give up after `DATA_CACHE_LOCK_TIMEOUT`
+    seconds, while the lock only expires after `DATA_CACHE_LOCK_EXPIRY` seconds.
+
+    :param cache_instance: the cache holding the value and the lock
+    :param cache_key: the key of the missing value
+    :returns: the token of the lock if it was acquired, and the value cached while
+        waiting
+    """
+    lock_timeout = config["DATA_CACHE_LOCK_TIMEOUT"]
+    if not lock_timeout:
+        return None, None
+    lock_expiry = max(config["DATA_CACHE_LOCK_EXPIRY"], lock_timeout)
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + lock_timeout
+    while True:
+        try:
+            if cache_instance.add(_lock_key(cache_key), token, timeout=lock_expiry):
+                return token, None
+            cache_value = cache_instance.get(cache_key)
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.warning("Could not acquire lock on cache key %s", cache_key)
+            logger.exception(ex)
+            return None, None
+        if cache_value:
+            stats_logger.incr("loaded_from_cache_lock")
+            return None, cache_value
+        if time.monotonic() >= deadline:
+            logger.warning("Timed out waiting for cache key %s", cache_key)
+            stats_logger.incr("cache_lock_timeout")
+            return None, None
+        time.sleep(config["DATA_CACHE_LOCK_POLL_INTERVAL"])
+
+
+def release_cache_lock(cache_instance: Cache, cache_key: str, token: str) -> None:
+    """Release a lock taken with `acquire_cache_lock`, unless it expired and was
+    taken by another caller since"""
+    try:
+        if cache_instance.get(_lock_key(cache_key)) == token:
+            cache_instance.delete(_lock_key(cache_key))
+    except Exception as ex:  # pylint: disable=broad-except
+        logger.warning("Could not release lock on cache key %s", cache_key)
+        logger.exception(ex)
+
+
+def is_stale(cache_value: Dict[str, Any]) -> bool:
+    """Whether a value cached with a `stale_timeout` is past its cache timeout"""
+    stale_after = cache_value.get("stale_after")
+    return stale_after is not None and stale_after <= time.time()
+
+
 # If a user sets `max_age` to 0, for long the browser should cache the
 # resource? Flask-Caching will cache forever, but for the HTTP header we need
 # to specify a "far future" date.
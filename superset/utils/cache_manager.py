@@ -14,10 +14,128 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+from cachelib.base import BaseCache
 from flask import Flask
 from flask_caching import Cache
 
 
+def _estimate_size(value: Any) -> int:
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(map(_estimate_size, value.values()))
+    return sys.getsizeof(value)
+
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    return value
+
+
+class TwoTierCache(BaseCache):
+    """
+    A cache keeping the most recently used values of a remote cache in memory.
+
+    Values are kept deserialized in a per-process LRU cache bounded by the
+    estimated size of its values, and are copied when read so that callers can't
+    modify them. Keys are expected to change when the values they were computed
+    from do (e.g. the `changed_on` of datasources in chart data cache keys), so
+    values are only dropped from memory when the LRU cache is full, when they are
+    deleted through this cache, or after `local_timeout` seconds.
+
+    Locks taken with `add` are always taken in the remote cache.
+    """
+
+    def __init__(
+        self, remote_cache: BaseCache, max_bytes: int, local_timeout: int,
+    ) -> None:
+        super().__init__()
+        self.remote_cache = remote_cache
+        self.max_bytes = max_bytes
+        self.local_timeout = local_timeout
+        self._values: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _get_local(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._values.get(key)
+            if item is None:
+                return None
+            if item[2] <= time.monotonic():
+                self._pop_local(key)
+                return None
+            self._values.move_to_end(key)
+            return item[0]
+
+    def _pop_local(self, key: str) -> None:
+        item = self._values.pop(key, None)
+        if item is not None:
+            self._size -= item[1]
+
+    def _set_local(self, key: str, value: Any, timeout: Optional[int]) -> None:
+        size = _estimate_size(value)
+        with self._lock:
+            self._pop_local(key)
+            if size > self.max_bytes:
+                return
+            while self._values and self._size + size > self.max_bytes:
+                self._pop_local(next(iter(self._values)))
+            if timeout:
+                timeout = min(timeout, self.local_timeout)
+            else:
+                timeout = self.local_timeout
+            self._values[key] = (value, size, time.monotonic() + timeout)
+            self._size += size
+
+    def get(self, key: str) -> Any:
+        value = self._get_local(key)
+        if value is None:
+            value = self.remote_cache.get(key)
+            if value is None:
+                return None
+            self._set_local(key, value, None)
+        return _copy(value)
+
+    def set(self, key: str, value: Any, timeout: Optional[int] = None) -> bool:
+        result = self.remote_cache.set(key, value, timeout=timeout)
+        if result:
+            self._set_local(key, _copy(value), timeout)
+        else:
+            with self._lock:
+                self._pop_local(key)
+        return result
+
+    def add(self, key: str, value: Any, timeout: Optional[int] = None) -> bool:
+        with self._lock:
+            self._pop_local(key)
+        return self.remote_cache.add(key, value, timeout=timeout)
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            self._pop_local(key)
+        return self.remote_cache.delete(key)
+
+    def has(self, key: str) -> bool:
+        return self._get_local(key) is not None or self.remote_cache.has(key)
+
+    def clear(self) -> bool:
+        with self._lock:
+            self._values.clear()
+            self._size = 0
+        return self.remote_cache.clear()
+
+
 class CacheManager:
     def __init__(self) -> None:
         super().__init__()
@@ -41,6 +159,13 @@ class CacheManager:
                 **app.config["DATA_CACHE_CONFIG"],
             },
         )
+        if app.config["DATA_CACHE_LOCAL_MAX_BYTES"]:
+            cache_backends: Dict[Cache, BaseCache] = app.extensions["cache"]
+            cache_backends[self._data_cache] = TwoTierCache(
+                cache_backends[self._data_cache],
+                app.config["DATA_CACHE_LOCAL_MAX_BYTES"],
+                app.config["DATA_CACHE_LOCAL_TIMEOUT"],
+            )
         self._thumbnail_cache.init_app(
             app,
             {
@@ -32,6 +32,7 @@ import threading
 import traceback
 import uuid
 import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, time, timedelta
 from distutils.util import strtobool
 from email.mime.application import MIMEApplication
@@ -40,6 +41,7 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.utils import formatdate
 from enum import Enum, IntEnum
+from time import sleep
 from timeit import default_timer
 from types import TracebackType
 from typing import (
@@ -71,6 +73,7 @@ from cryptography import x509
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.backends.openssl.x509 import _Certificate
 from flask import current_app, flash, g, Markup, render_template, request
+from flask.globals import _request_ctx_stack
 from flask_appbuilder import SQLA
 from flask_appbuilder.security.sqla.models import Role, User
 from flask_babel import gettext as __
@@ -113,6 +116,7 @@ DTTM_ALIAS = "__timestamp"
 JS_MAX_INTEGER = 9007199254740991  # Largest int Java Script can handle 2^53-1
 
 InputType = TypeVar("InputType")
+OutputType = TypeVar("OutputType")
 
 
 class LenientEnum(Enum):
@@ -161,6 +165,8 @@ class ChartDataResultFormat(str, Enum):
 
     CSV = "csv"
     JSON = "json"
+    # column-oriented JSON: the data is a list of columns aligned with `colnames`
+    JSON_COLUMNAR = "json_columnar"
 
 
 class ChartDataResultType(str, Enum):
@@ -353,7 +359,7 @@ def flasher(msg: str, severity: str = "message") -> None:
             logger.info(msg)
 
 
-class _memoized:
+class _memoized:  # pylint: disable=too-many-instance-attributes
     """Decorator that caches a function's return value each time it is called
 
     If called later with the same arguments, the cached value is returned, and
@@ -361,32 +367,93 @@ class _memoized:
 
     Define ``watch`` as a tuple of attribute names if this Decorator
     should account for instance variable changes.
+
+    Define ``max_size`` to keep at most that many values, evicting the least
+    recently used ones, and ``max_age`` to re-evaluate values cached more than that
+    many seconds ago. ``on_evict`` is called with the values evicted either way,
+    e.g. to release the resources they hold. Hits, misses and evictions are
+    counted, and reported to the stats logger under ``stats_key`` if defined.
     """
 
-    def __init__(
-        self, func: Callable[..., Any], watch: Optional[Tuple[str, ...]] = None
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        func: Callable[..., Any],
+        watch: Optional[Tuple[str, ...]] = None,
+        max_size: Optional[int] = None,
+        max_age: Optional[float] = None,
+        on_evict: Optional[Callable[[Any], None]] = None,
+        stats_key: Optional[str] = None,
     ) -> None:
         self.func = func
-        self.cache: Dict[Any, Any] = {}
+        self.cache: "collections.OrderedDict[Any, Tuple[Any, float]]" = (
+            collections.OrderedDict()
+        )
         self.is_method = False
         self.watch = watch or ()
+        self.max_size = max_size
+        self.max_age = max_age
+        self.on_evict = on_evict
+        self.stats_key = stats_key
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
 
     def __call__(self, *args: Any, **kwargs: Any) -> Any:
         key = [args, frozenset(kwargs.items())]
         if self.is_method:
             key.append(tuple([getattr(args[0], v, None) for v in self.watch]))
         key = tuple(key)  # type: ignore
-        if key in self.cache:
-            return self.cache[key]
+        now = default_timer()
         try:
-            value = self.func(*args, **kwargs)
-            self.cache[key] = value
-            return value
+            with self._lock:
+                item = self.cache.get(key)
+                if item is not None:
+                    self.cache.move_to_end(key)
         except TypeError:
             # uncachable -- for instance, passing a list as an argument.
             # Better to not cache than to blow up entirely.
             return self.func(*args, **kwargs)
 
+        if item is not None and self.max_age is not None:
+            if now - item[1] >= self.max_age:
+                with self._lock:
+                    expired = self.cache.get(key) is item
+                    if expired:
+                        del self.cache[key]
+                if expired:
+                    self._evict([item[0]])
+                item = None
+        if item is not None:
+            self._count("hits")
+            return item[0]
+        self._count("misses")
+        value = self.func(*args, **kwargs)
+        evicted: List[Any] = []
+        with self._lock:
+            if key in self.cache:
+                evicted.append(self.cache.pop(key)[0])
+            self.cache[key] = (value, now)
+            while self.max_size is not None and len(self.cache) > self.max_size:
+                evicted.append(self.cache.popitem(last=False)[1][0])
+        self._evict(evicted)
+        return value
+
+    def _count(self, counter: str) -> None:
+        setattr(self, counter, getattr(self, counter) + 1)
+        if self.stats_key and current_app:
+            stats_logger = current_app.config["STATS_LOGGER"]
+            stats_logger.incr(f"{self.stats_key}.{counter}")
+
+    def _evict(self, values: List[Any]) -> None:
+        for value in values:
+            self._count("evictions")
+            if self.on_evict:
+                try:
+                    self.on_evict(value)
+                except Exception as ex:  # pylint: disable=broad-except
+                    logger.exception(ex)
+
     def __repr__(self) -> str:
         """Return the function's docstring."""
         return self.func.__doc__ or ""
@@ -400,14 +467,19 @@ class _memoized:
         return functools.partial(self.__call__, obj)
 
 
-def memoized(
-    func: Optional[Callable[..., Any]] = None, watch: Optional[Tuple[str, ...]] = None
+def memoized(  # pylint: disable=too-many-arguments
+    func: Optional[Callable[..., Any]] = None,
+    watch: Optional[Tuple[str, ...]] = None,
+    max_size: Optional[int] = None,
+    max_age: Optional[float] = None,
+    on_evict: Optional[Callable[[Any], None]] = None,
+    stats_key: Optional[str] = None,
 ) -> Callable[..., Any]:
     if func:
         return _memoized(func)
 
     def wrapper(f: Callable[..., Any]) -> Callable[..., Any]:
-        return _memoized(f, watch)
+        return _memoized(f, watch, max_size, max_age, on_evict, stats_key)
 
     return wrapper
 
@@ -810,6 +882,64 @@ class TimerTimeout:
             )
 
 
+def parallel_map(
+    func: Callable[[InputType], OutputType],
+    items: Sequence[InputType],
+    max_workers: int,
+) -> List[OutputType]:
+    """
+    Apply a function to each item using a pool of at most `max_workers` threads,
+    preserving the order of the items.
+
+    Each call runs in a copy of the caller's request context (or in a new app
+    context outside of requests) with the caller's `g.user`, so that security
+    checks and Jinja macros behave as they would in the calling thread. With a
+    single worker or a single item, the calls are made in the calling thread.
+
+    :param func: the function to apply
+    :param items: the items to apply the function to
+    :param max_workers: the maximum number of threads to use
+    :returns: the results of the calls, in the order of the items
+    """
+    if max_workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+
+    app = current_app._get_current_object()  # pylint: disable=protected-access
+    request_ctx = _request_ctx_stack.top
+    user = g.get("user")
+
+    def run(item: InputType) -> OutputType:
+        with request_ctx.copy() if request_ctx else app.app_context():
+            if user is not None:
+                g.user = user
+            return func(item)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(run, items))
+
+
+class RateLimiter:
+    """
+    Space calls out so that at most `rate` of them proceed per second, across
+    threads. A `rate` of None doesn't limit calls.
+    """
+
+    def __init__(self, rate: Optional[float] = None) -> None:
+        self.rate = rate
+        self._next_call = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.rate:
+            return
+        with self._lock:
+            now = default_timer()
+            call = max(now, self._next_call)
+            self._next_call = call + 1 / self.rate
+        if call > now:
+            sleep(call - now)
+
+
 # Windows has no support for SIGALRM, so we use the timer based timeout
 timeout: Union[Type[TimerTimeout], Type[SigalrmTimeout]] = (
     TimerTimeout if platform.system() == "Windows" else SigalrmTimeout
@@ -0,0 +1,133 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+from flask import Flask
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.url import URL
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+
+class EngineManager:
+    """
+    Keeps pooled SQLAlchemy engines connected to the analytics databases, so that
+    queries reuse open connections rather than connecting anew each time.
+
+    Engines are keyed by database and by their URL and parameters, which hold the
+    effective user and the schema. Engines unused for `DB_ENGINE_IDLE_TIMEOUT`
+    seconds are disposed of, as are the least recently used engines of databases
+    with more than `DB_ENGINE_MAX_ENGINES_PER_DATABASE` engines.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self._enabled = False
+        self._pool_size = 5
+        self._max_overflow = 10
+        self._max_engines_per_database = 10
+        self._idle_timeout = 600
+        self._engines: "OrderedDict[Tuple[int, str], Tuple[Engine, float]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def init_app(self, app: Flask) -> None:
+        self.dispose_all()
+        self._enabled = app.config["DB_ENGINE_POOLING"]
+        self._pool_size = app.config["DB_ENGINE_POOL_SIZE"]
+        self._max_overflow = app.config["DB_ENGINE_MAX_OVERFLOW"]
+        self._max_engines_per_database = app.config[
+            "DB_ENGINE_MAX_ENGINES_PER_DATABASE"
+        ]
+        self._idle_timeout = app.config["DB_ENGINE_IDLE_TIMEOUT"]
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def get_engine(self, database_id: int, url: URL, params: Dict[str, Any]) -> Engine:
+        """
+        Return a pooled engine for the URL and parameters, creating it if needed.
+
+        The pool size and overflow default to `DB_ENGINE_POOL_SIZE` and
+        `DB_ENGINE_MAX_OVERFLOW`, and can be set per database through the
+        `engine_params` of its extra.
+        """
+        params_json = json.dumps(params, sort_keys=True, default=str)
+        digest = hashlib.sha256(f"{url}|{params_json}".encode("utf-8")).hexdigest()
+        key = (database_id, digest)
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            if key in self._engines:
+                engine = self._engines.pop(key)[0]
+                self._engines[key] = (engine, now)
+                return engine
+
+            params = {"pool_pre_ping": True, **params}
+            poolclass = params.get("poolclass") or url.get_dialect().get_pool_class(url)
+            if issubclass(poolclass, QueuePool):
+                params.setdefault("pool_size", self._pool_size)
+                params.setdefault("max_overflow", self._max_overflow)
+            engine = create_engine(url, **params)
+            self._engines[key] = (engine, now)
+            self._evict_excess(database_id)
+            return engine
+
+    def release(self, engine: Engine) -> None:
+        """Dispose of an engine no longer used, unless it is kept by the manager"""
+        with self._lock:
+            if any(engine is kept for kept, _ in self._engines.values()):
+                return
+        engine.dispose()
+
+    def dispose(self, database_id: int) -> None:
+        """Dispose of the engines of a database, e.g. once its URI was changed"""
+        with self._lock:
+            for key in [key for key in self._engines if key[0] == database_id]:
+                self._engines.pop(key)[0].dispose()
+
+    def dispose_all(self) -> None:
+        with self._lock:
+            for engine, _ in self._engines.values():
+                engine.dispose()
+            self._engines.clear()
+
+    def _evict_idle(self, now: float) -> None:
+        # engines are ordered from the least to the most recently used
+        while self._engines:
+            key, (engine, last_used) = next(iter(self._engines.items()))
+            if now - last_used < self._idle_timeout:
+                break
+            logger.debug("Disposing of idle engine of database %s", key[0])
+            del self._engines[key]
+            engine.dispose()
+
+    def _evict_excess(self, database_id: int) -> None:
+        keys = [key for key in self._engines if key[0] == database_id]
+        for key in keys[: max(len(keys) - self._max_engines_per_database, 0)]:
+            self._engines.pop(key)[0].dispose()
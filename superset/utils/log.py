@@ -14,19 +14,30 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import atexit
 import functools
+import glob
 import inspect
 import json
 import logging
+import os
+import queue
 import textwrap
+import threading
+import time
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Any, Callable, cast, Dict, Iterator, Optional, Type, Union
+from typing import Any, Callable, cast, Dict, Iterator, List, Optional, Type, Union
 
 from flask import current_app, g, request
 from flask_appbuilder.const import API_URI_RIS_KEY
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import (
+    InterfaceError,
+    OperationalError,
+    SQLAlchemyError,
+    TimeoutError as PoolTimeoutError,
+)
 from typing_extensions import Literal
 
 from superset.stats_logger import BaseStatsLogger
@@ -324,3 +335,247 @@ class DBEventLogger(AbstractEventLogger):
         except SQLAlchemyError as ex:
             logging.error("DBEventLogger failed to log event(s)")
             logging.exception(ex)
+
+
+class BufferedDBEventLogger(DBEventLogger):
+    """
+    Event logger that commits logs to Superset DB in batches, from a background
+    thread, rather than in the requests logging them.
+
+    Logs are queued in memory, at most `max_queue_size` of them, and written every
+    `flush_interval` seconds, or as soon as `batch_size` of them are queued. When
+    the queue is full, logs are appended to a file named after `spill_path` and the
+    process id, to be written once the queue has room again, or dropped if
+    `spill_path` isn't set. The logs still queued are written when the process
+    exits.
+
+    Writing spilled logs back is retried with an exponential backoff while the
+    database can't be reached, and starts over only once live logs are written
+    again. Logs which can't be inserted at all, e.g. too long, are dropped.
+
+        EVENT_LOGGER = BufferedDBEventLogger(spill_path="/var/lib/superset/logs")
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        batch_size: int = 100,
+        flush_interval: float = 1,
+        max_queue_size: int = 10000,
+        spill_path: Optional[str] = None,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.spill_path = spill_path
+        self.max_backoff = 300
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(max_queue_size)
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._app: Any = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    def log(  # pylint: disable=too-many-arguments
+        self,
+        user_id: Optional[int],
+        action: str,
+        dashboard_id: Optional[int],
+        duration_ms: Optional[int],
+        slice_id: Optional[int],
+        referrer: Optional[str],
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        self._start()
+        dttm = datetime.utcnow()
+        for record in kwargs.get("records", []):
+            log = {
+                "action": action,
+                "record": record,
+                "dashboard_id": dashboard_id,
+                "slice_id": slice_id,
+                "duration_ms": duration_ms,
+                "referrer": referrer,
+                "user_id": user_id,
+                "dttm": dttm,
+            }
+            try:
+                self._queue.put_nowait(log)
+            except queue.Full:
+                self._spill([self._to_row(log)])
+
+    def _start(self) -> None:
+        """Start the background thread, again in processes forked since"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._app = (
+                current_app._get_current_object()  # pylint: disable=protected-access
+            )
+            self._queue = queue.Queue(self.max_queue_size)
+            self._stopped = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run, name="BufferedDBEventLogger", daemon=True
+            )
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _run(self) -> None:
+        backoff = self.flush_interval
+        replay_after = 0.0
+        while not self._stopped.is_set():
+            logs = self._next_batch()
+            if logs and not self._write([self._to_row(log) for log in logs]):
+                backoff = min(backoff * 2, self.max_backoff)
+                replay_after = time.monotonic() + backoff
+                continue
+            if (
+                self.spill_path
+                and time.monotonic() >= replay_after
+                and self._queue.qsize() < self.max_queue_size / 2
+            ):
+                if self._replay_spilled():
+                    backoff = self.flush_interval
+                else:
+                    backoff = min(backoff * 2, self.max_backoff)
+                    replay_after = time.monotonic() + backoff
+
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        logs: List[Dict[str, Any]] = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(logs) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                logs.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return logs
+
+    @staticmethod
+    def _to_row(log: Dict[str, Any]) -> Dict[str, Any]:
+        row = dict(log)
+        try:
+            row["json"] = json.dumps(row.pop("record"))
+        except Exception:  # pylint: disable=broad-except
+            row["json"] = None
+        return row
+
+    def _insert(self, rows: List[Dict[str, Any]]) -> Optional[SQLAlchemyError]:
+        """Insert the rows in a single transaction, returning the error if any"""
+        from superset.models.core import Log
+
+        with self._app.app_context():
+            sesh = self._app.appbuilder.get_session
+            try:
+                sesh.bulk_insert_mappings(Log, rows)
+                sesh.commit()
+            except SQLAlchemyError as ex:
+                sesh.rollback()
+                return ex
+        return None
+
+    def _write(self, rows: List[Dict[str, Any]]) -> bool:
+        """Write the rows, spilling them if they couldn't be"""
+        error = self._insert(rows)
+        if error is None:
+            return True
+        logging.error(
+            "BufferedDBEventLogger failed to log %i event(s): %s", len(rows), error
+        )
+        self._spill(rows)
+        return False
+
+    def _write_replayed(self, rows: List[Dict[str, Any]]) -> bool:
+        """
+        Write spilled rows, one at a time should they fail together, dropping those
+        which can't be inserted. The rows left are spilled again if the database
+        can't be reached.
+        """
+        if self._insert(rows) is None:
+            return True
+        for i, row in enumerate(rows):
+            error = self._insert([row])
+            if error is None:
+                continue
+            if isinstance(error, (OperationalError, InterfaceError, PoolTimeoutError)):
+                logging.error("BufferedDBEventLogger failed to log events: %s", error)
+                self._spill(rows[i:])
+                return False
+            logging.warning("BufferedDBEventLogger dropped an event: %s", error)
+        return True
+
+    def _spill(self, rows: List[Dict[str, Any]]) -> None:
+        if not self.spill_path:
+            logging.warning("BufferedDBEventLogger dropped %i event(s)", len(rows))
+            return
+        with self._spill_lock:
+            with open(f"{self.spill_path}.{os.getpid()}", "a") as spill_file:
+                for row in rows:
+                    spill_file.write(
+                        json.dumps({**row, "dttm": row["dttm"].isoformat()}) + "\n"
+                    )
+
+    def _replay_spilled(self) -> bool:
+        """
+        Write the logs spilled by this process, or by processes since gone
+
+        :returns: whether the database could be reached
+        """
+        for path in glob.glob(f"{self.spill_path}.[0-9]*"):
+            pid = int(path.rsplit(".", 1)[1])
+            if pid != os.getpid() and self._is_running(pid):
+                continue
+            replay_path = f"{self.spill_path}.replay.{os.getpid()}"
+            with self._spill_lock:
+                try:
+                    os.rename(path, replay_path)
+                except OSError:
+                    continue  # replayed by another process
+            rows = []
+            with open(replay_path) as replay_file:
+                for line in replay_file:
+                    try:
+                        row = json.loads(line)
+                    except ValueError:
+                        continue  # the process died writing the line
+                    row["dttm"] = datetime.fromisoformat(row["dttm"])
+                    rows.append(row)
+            os.remove(replay_path)
+            for i in range(0, len(rows), self.batch_size):
+                if not self._write_replayed(rows[i : i + self.batch_size]):
+                    self._spill(rows[i + self.batch_size :])
+                    return False
+        return True
+
+    @staticmethod
+    def _is_running(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            pass
+        return True
+
+    def shutdown(self) -> None:
+        """Stop the background thread and write the logs still queued"""
+        if self._pid != os.getpid():
+            return
+        self._stopped.set()
+        if self._thread:
+            self._thread.join(self.flush_interval * 2)
+        logs: List[Dict[str, Any]] = []
+        while True:
+            try:
+                logs.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        for i in range(0, len(logs), self.batch_size):
+            self._write([self._to_row(log) for log in logs[i : i + self.batch_size]])
+        self._pid = None
@@ -0,0 +1,215 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Listings of the tables and views of database schemas, kept in the metadata
+database and refreshed schema by schema as they expire."""
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from flask import current_app as app
+from sqlalchemy.exc import SQLAlchemyError
+
+from superset import db
+from superset.models.table_listing import SchemaListing, TableListing
+from superset.stats_logger import BaseStatsLogger
+from superset.utils import table_search
+from superset.utils.core import DatasourceName
+
+if TYPE_CHECKING:
+    from superset.models.core import Database
+
+config = app.config  # type: ignore
+stats_logger: BaseStatsLogger = config["STATS_LOGGER"]
+logger = logging.getLogger(__name__)
+
+# keeps the number of bound parameters of a statement below the SQLite limit
+DELETE_BATCH_SIZE = 500
+
+
+def get_listing_timeout(database: "Database") -> int:
+    if database.table_cache_enabled and database.table_cache_timeout is not None:
+        return database.table_cache_timeout
+    return config["TABLE_LISTING_TIMEOUT"]
+
+
+def _list_names(database: "Database", schema: str) -> Set[Tuple[str, str]]:
+    engine_spec = database.db_engine_spec
+    inspector = database.inspector
+    tables = engine_spec.get_table_names(
+        database=database, inspector=inspector, schema=schema
+    )
+    views = engine_spec.get_view_names(
+        database=database, inspector=inspector, schema=schema
+    )
+    return {(name, "table") for name in tables} | {(name, "view") for name in views}
+
+
+def refresh_schema(
+    database: "Database", schema: str, force: bool = False
+) -> Optional[SchemaListing]:
+    """Refreshes the listing of a schema if it expired, only storing the changes
+    since the previous listing
+
+    :param database: Database instance
+    :param schema: Schema name
+    :param force: whether to refresh the listing even if it didn't expire
+    :return: the listing of the schema, or None if it couldn't be listed
+    """
+    listing = (
+        db.session.query(SchemaListing)
+        .filter_by(database_id=database.id, schema=schema)
+        .one_or_none()
+    )
+    return _refresh_listing(database, schema, listing, force)
+
+
+def _refresh_listing(
+    database: "Database",
+    schema: str,
+    listing: Optional[SchemaListing],
+    force: bool = False,
+) -> Optional[SchemaListing]:
+    now = datetime.now()
+    timeout = timedelta(seconds=get_listing_timeout(database))
+    if listing and not force and listing.refreshed_on + timeout > now:
+        stats_logger.incr("table_listing.hit")
+        return listing
+
+    try:
+        change_marker = database.db_engine_spec.get_schema_change_marker(
+            database, database.inspector, schema
+        )
+    except Exception as ex:  # pylint: disable=broad-except
+        logger.warning("Unable to get the change marker of schema %s: %s", schema, ex)
+        change_marker = None
+    if (
+        listing
+        and not force
+        and change_marker is not None
+        and change_marker == listing.change_marker
+    ):
+        stats_logger.incr("table_listing.unchanged")
+        listing.refreshed_on = now
+        db.session.commit()
+        return listing
+
+    try:
+        names = _list_names(database, schema)
+    except Exception as ex:  # pylint: disable=broad-except
+        # a stale listing is better than none
+        logger.warning("Unable to list the tables of schema %s: %s", schema, ex)
+        return listing
+
+    stats_logger.incr("table_listing.refresh")
+    try:
+        if listing is None:
+            listing = SchemaListing(database_id=database.id, schema=schema)
+            db.session.add(listing)
+            db.session.flush()
+        stored: Dict[Tuple[str, str], int] = {
+            (name, type_): id_
+            for id_, name, type_ in db.session.query(
+                TableListing.id, TableListing.name, TableListing.type
+            ).filter_by(schema_listing_id=listing.id)
+        }
+        removed = [stored[key] for key in stored.keys() - names]
+        for i in range(0, len(removed), DELETE_BATCH_SIZE):
+            db.session.query(TableListing).filter(
+                TableListing.id.in_(removed[i : i + DELETE_BATCH_SIZE])
+            ).delete(synchronize_session=False)
+        added = names - stored.keys()
+        db.session.bulk_save_objects(
+            [
+                TableListing(schema_listing_id=listing.id, name=name, type=type_)
+                for name, type_ in added
+            ]
+        )
+        listing.refreshed_on = now
+        listing.change_marker = change_marker
+        db.session.commit()
+    except SQLAlchemyError as ex:
+        # e.g. when another request stored the listing of the schema concurrently
+        logger.warning("Unable to store the listing of schema %s: %s", schema, ex)
+        db.session.rollback()
+        return None
+    if removed or added:
+        table_search.index_cache.invalidate(database.id)
+    return listing
+
+
+def get_datasource_names(
+    database: "Database",
+    schema: Optional[str],
+    schemas: Optional[Iterable[str]] = None,
+    force: bool = False,
+) -> Tuple[List[DatasourceName], List[DatasourceName]]:
+    """Returns the tables and views of a schema, or of all the schemas of a database,
+    refreshing the expired listings beforehand. Like
+    `Database.get_all_table_names_in_database`, nothing is listed across schemas
+    unless the database allows multi schema metadata fetch.
+
+    :param database: Database instance
+    :param schema: Schema name, or None for all the schemas
+    :param schemas: Schemas to restrict the names to when no schema is given
+    :param force: whether to refresh the listings even if they didn't expire
+    :return: the table names and the view names, sorted by label, which are their
+        names when a schema is given and their qualified names otherwise
+    """
+    if schema:
+        schemas = [schema]
+    elif not database.allow_multi_schema_metadata_fetch:
+        return [], []
+    elif schemas is None:
+        schemas = database.get_all_schema_names(
+            cache=database.schema_cache_enabled,
+            cache_timeout=database.schema_cache_timeout,
+            force=force,
+        )
+    # the stored listings are fetched at once, only the expired ones being refreshed
+    # one by one
+    listings_query = db.session.query(SchemaListing).filter(
+        SchemaListing.database_id == database.id
+    )
+    if schema:
+        listings_query = listings_query.filter(SchemaListing.schema == schema)
+    listings = {listing.schema: listing for listing in listings_query}
+    listed = {
+        schema_
+        for schema_ in schemas
+        if _refresh_listing(database, schema_, listings.get(schema_), force)
+    }
+
+    label = (
+        TableListing.name if schema else SchemaListing.schema + "." + TableListing.name
+    )
+    query = (
+        db.session.query(SchemaListing.schema, TableListing.name, TableListing.type)
+        .join(TableListing, TableListing.schema_listing_id == SchemaListing.id)
+        .filter(SchemaListing.database_id == database.id)
+    )
+    if schema:
+        query = query.filter(SchemaListing.schema == schema)
+
+    tables: List[DatasourceName] = []
+    views: List[DatasourceName] = []
+    for schema_, name, type_ in query.order_by(label):
+        # skips the schemas which were dropped or filtered out
+        if schema_ not in listed:
+            continue
+        names = views if type_ == "view" else tables
+        names.append(DatasourceName(table=name, schema=schema_))
+    return tables, views
@@ -0,0 +1,193 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""In-memory indexes of the table and view names of databases, answering the
+prefix and substring searches of the SQL Lab table selector.
+
+Indexes are kept per worker and rebuilt once they expire or are invalidated.
+"""
+import threading
+from array import array
+from collections import defaultdict, OrderedDict
+from datetime import datetime, timedelta
+from typing import (
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from flask import current_app as app
+
+from superset.stats_logger import BaseStatsLogger
+from superset.utils.core import DatasourceName
+
+config = app.config  # type: ignore
+stats_logger: BaseStatsLogger = config["STATS_LOGGER"]
+
+# characters after which a match is ranked as the start of a word
+WORD_SEPARATORS = " ._-"
+
+
+class TableSearchEntry(NamedTuple):
+    datasource_name: DatasourceName
+    label: str
+    type: str  # either "table" or "view"
+
+
+def get_trigrams(text: str) -> List[str]:
+    return [text[i : i + 3] for i in range(len(text) - 2)]
+
+
+class TableSearchIndex:
+    """Trigram index of the labels of tables and views, which are their names, or
+    their qualified names when they come from several schemas"""
+
+    def __init__(
+        self,
+        tables: Sequence[DatasourceName],
+        views: Sequence[DatasourceName],
+        qualified: bool = False,
+    ) -> None:
+        def get_label(name: DatasourceName) -> str:
+            return f"{name.schema}.{name.table}" if qualified else name.table
+
+        self.entries = sorted(
+            [TableSearchEntry(name, get_label(name), "table") for name in tables]
+            + [TableSearchEntry(name, get_label(name), "view") for name in views],
+            key=lambda entry: entry.label,
+        )
+        self._labels = [entry.label.lower() for entry in self.entries]
+        postings: DefaultDict[str, "array[int]"] = defaultdict(lambda: array("I"))
+        for i, label in enumerate(self._labels):
+            for trigram in set(get_trigrams(label)):
+                postings[trigram].append(i)
+        self._postings: Dict[str, "array[int]"] = dict(postings)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _get_candidates(self, query: str) -> Sequence[int]:
+        trigrams = get_trigrams(query)
+        if not trigrams:
+            return range(len(self._labels))
+        # every label containing the query contains all of its trigrams, so the
+        # rarest trigram is enough to narrow down the labels to look into
+        candidates: Sequence[int] = range(len(self._labels))
+        for trigram in trigrams:
+            posting = self._postings.get(trigram)
+            if posting is None:
+                return []
+            if len(posting) < len(candidates):
+                candidates = posting
+        return candidates
+
+    def search(
+        self, query: Optional[str], offset: int = 0, limit: Optional[int] = None
+    ) -> List[TableSearchEntry]:
+        """Returns the entries whose label contains a string, ignoring case
+
+        Entries are ranked by how well their label matches: exact matches come
+        first, then the labels starting with the query, then the labels in which a
+        word starts with it, then the others. Ties are sorted by label.
+
+        :param query: String to look for, or None for all the entries
+        :param offset: Number of ranked entries to skip
+        :param limit: Maximum number of entries to return
+        :return: the ranked entries
+        """
+        if not query:
+            entries = self.entries
+        else:
+            query = query.lower()
+            matches: List[Tuple[int, int, int]] = []
+            for i in self._get_candidates(query):
+                label = self._labels[i]
+                position = label.find(query)
+                if position < 0:
+                    continue
+                if position == 0:
+                    rank = 0 if len(label) == len(query) else 1
+                elif label[position - 1] in WORD_SEPARATORS:
+                    rank = 2
+                else:
+                    rank = 3
+                matches.append((rank, i, position))
+            matches.sort()
+            entries = [self.entries[i] for _, i, _ in matches]
+        end = None if limit is None else offset + limit
+        return entries[offset:end]
+
+
+class TableSearchIndexCache:
+    """Least recently used indexes, each kept until it expires or is invalidated"""
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._indexes: "OrderedDict[Tuple[Any, ...], Tuple[TableSearchIndex, datetime]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(  # pylint: disable=too-many-arguments
+        self,
+        key: Tuple[Any, ...],
+        load: Callable[[], Tuple[List[DatasourceName], List[DatasourceName]]],
+        timeout: int,
+        qualified: bool = False,
+        force: bool = False,
+    ) -> TableSearchIndex:
+        """Returns the index stored under a key, (re)building it when missing,
+        expired or forced
+
+        :param key: Key of the index, starting with the id of the database
+        :param load: Function returning the tables and the views to index
+        :param timeout: Number of seconds after which the index expires
+        :param qualified: Whether labels are the qualified names of the tables
+        :param force: whether to rebuild the index even if it didn't expire
+        """
+        now = datetime.now()
+        with self._lock:
+            cached = self._indexes.get(key)
+            if cached and not force and cached[1] > now:
+                self._indexes.move_to_end(key)
+                stats_logger.incr("table_search_index.hit")
+                return cached[0]
+
+        # loading the names is slow, and rebuilding the same index twice harmless
+        tables, views = load()
+        index = TableSearchIndex(tables, views, qualified=qualified)
+        stats_logger.incr("table_search_index.build")
+        with self._lock:
+            self._indexes[key] = (index, now + timedelta(seconds=timeout))
+            self._indexes.move_to_end(key)
+            while len(self._indexes) > self.max_size:
+                self._indexes.popitem(last=False)
+        return index
+
+    def invalidate(self, database_id: int) -> None:
+        """Drops the indexes of the tables and views of a database"""
+        with self._lock:
+            for key in [key for key in self._indexes if key[0] == database_id]:
+                del self._indexes[key]
+
+
+index_cache = TableSearchIndexCache(config["TABLE_SEARCH_INDEX_CACHE_SIZE"])
@@ -15,10 +15,25 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import atexit
 import logging
+import threading
 import time
-from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+)
 
+from celery.signals import worker_process_shutdown
 from flask import current_app
 from retry.api import retry_call
 from selenium.common.exceptions import TimeoutException, WebDriverException
@@ -36,13 +51,37 @@ logger = logging.getLogger(__name__)
 # Time in seconds, we will wait for the page to load and render
 SELENIUM_CHECK_INTERVAL = 2
 SELENIUM_RETRIES = 5
-SELENIUM_HEADSTART = 3
+# Time in seconds between checks of whether the page is rendered
+SELENIUM_RENDER_POLL_INTERVAL = 0.25
 
 
 if TYPE_CHECKING:
     from flask_appbuilder.security.sqla.models import User
 
 
+class PageRendered:  # pylint: disable=too-few-public-methods
+    """
+    Expected condition of a page being loaded, none of its elements having been
+    loading for `settle` seconds, as charts show a loading element until rendered.
+    """
+
+    def __init__(self, settle: float) -> None:
+        self.settle = settle
+        self._rendered_since: Optional[float] = None
+
+    def __call__(self, driver: WebDriver) -> bool:
+        rendered = driver.execute_script(
+            "return document.readyState"
+        ) == "complete" and not driver.find_elements(By.CLASS_NAME, "loading")
+        if not rendered:
+            self._rendered_since = None
+            return False
+        now = time.monotonic()
+        if self._rendered_since is None:
+            self._rendered_since = now
+        return now - self._rendered_since >= self.settle
+
+
 class WebDriverProxy:
     def __init__(
         self, driver_type: str, window: Optional[WindowSize] = None,
@@ -51,6 +90,7 @@ class WebDriverProxy:
         self._window: WindowSize = window or (800, 600)
         self._screenshot_locate_wait = current_app.config["SCREENSHOT_LOCATE_WAIT"]
         self._screenshot_load_wait = current_app.config["SCREENSHOT_LOAD_WAIT"]
+        self._screenshot_render_settle = current_app.config["SCREENSHOT_RENDER_SETTLE"]
 
     def create(self) -> WebDriver:
         if self._driver_type == "firefox":
@@ -101,21 +141,35 @@ class WebDriverProxy:
         user: "User",
         retries: int = SELENIUM_RETRIES,
     ) -> Optional[bytes]:
+        if current_app.config["WEBDRIVER_POOL_SIZE"]:
+            with webdriver_pool.driver(
+                (self._driver_type, user.id), lambda: self.auth(user)
+            ) as driver:
+                return self._get_screenshot(driver, url, element_name)
+
         driver = self.auth(user)
+        try:
+            return self._get_screenshot(driver, url, element_name)
+        finally:
+            self.destroy(driver, retries)
+
+    def _get_screenshot(
+        self, driver: WebDriver, url: str, element_name: str
+    ) -> Optional[bytes]:
         driver.set_window_size(*self._window)
         driver.get(url)
         img: Optional[bytes] = None
-        logger.debug("Sleeping for %i seconds", SELENIUM_HEADSTART)
-        time.sleep(SELENIUM_HEADSTART)
         try:
             logger.debug("Wait for the presence of %s", element_name)
             element = WebDriverWait(driver, self._screenshot_locate_wait).until(
                 EC.presence_of_element_located((By.CLASS_NAME, element_name))
             )
-            logger.debug("Wait for .loading to be done")
-            WebDriverWait(driver, self._screenshot_load_wait).until_not(
-                EC.presence_of_all_elements_located((By.CLASS_NAME, "loading"))
-            )
+            logger.debug("Wait for the page to be rendered")
+            WebDriverWait(
+                driver,
+                self._screenshot_load_wait,
+                poll_frequency=SELENIUM_RENDER_POLL_INTERVAL,
+            ).until(PageRendered(self._screenshot_render_settle))
             logger.info("Taking a PNG screenshot or url %s", url)
             img = element.screenshot_as_png
         except TimeoutException:
@@ -125,6 +179,110 @@ class WebDriverProxy:
             # Some webdrivers do not support screenshots for elements.
             # In such cases, take a screenshot of the entire page.
             img = driver.screenshot()  # pylint: disable=no-member
-        finally:
-            self.destroy(driver, retries)
         return img
+
+
+@dataclass(eq=False)
+class PooledWebDriver:
+    key: Hashable
+    driver: WebDriver
+    uses: int = 0
+    last_used: float = 0.0
+
+
+class WebDriverPool:
+    """
+    Drivers kept open between screenshots by each worker, logged in as the users
+    the screenshots are taken for, rather than started for each screenshot.
+
+    A driver is used for one screenshot at a time, checked to still respond before
+    being reused, and quit once used `WEBDRIVER_POOL_MAX_USES` times, unused for
+    `WEBDRIVER_POOL_MAX_IDLE` seconds, or when more than `WEBDRIVER_POOL_SIZE`
+    drivers are unused, the least recently used first.
+    """
+
+    def __init__(self) -> None:
+        self._idle: List[PooledWebDriver] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def driver(
+        self, key: Hashable, create: Callable[[], WebDriver]
+    ) -> Iterator[WebDriver]:
+        """
+        Use a driver, reusing an unused one for the same key if any.
+
+        :param key: What the driver is for, e.g. its type and user
+        :param create: Creates a driver when there is none to reuse
+        """
+        pooled = self._checkout(key)
+        if pooled is None:
+            pooled = PooledWebDriver(key, create())
+        try:
+            yield pooled.driver
+        except Exception:
+            WebDriverProxy.destroy(pooled.driver)
+            raise
+        pooled.uses += 1
+        self._checkin(pooled)
+
+    def _checkout(self, key: Hashable) -> Optional[PooledWebDriver]:
+        max_idle = current_app.config["WEBDRIVER_POOL_MAX_IDLE"]
+        now = time.monotonic()
+        found = None
+        expired = []
+        with self._lock:
+            for pooled in reversed(self._idle):
+                if now - pooled.last_used >= max_idle:
+                    expired.append(pooled)
+                elif found is None and pooled.key == key:
+                    found = pooled
+            self._idle = [
+                pooled
+                for pooled in self._idle
+                if pooled is not found and pooled not in expired
+            ]
+        for pooled in expired:
+            WebDriverProxy.destroy(pooled.driver)
+        if found is not None and not self._is_alive(found.driver):
+            WebDriverProxy.destroy(found.driver)
+            found = None
+        return found
+
+    def _checkin(self, pooled: PooledWebDriver) -> None:
+        config = current_app.config
+        evicted = []
+        if pooled.uses >= config["WEBDRIVER_POOL_MAX_USES"]:
+            evicted.append(pooled)
+        else:
+            pooled.last_used = time.monotonic()
+            with self._lock:
+                self._idle.append(pooled)
+                while len(self._idle) > config["WEBDRIVER_POOL_SIZE"]:
+                    evicted.append(self._idle.pop(0))
+        for pooled in evicted:
+            WebDriverProxy.destroy(pooled.driver)
+
+    @staticmethod
+    def _is_alive(driver: WebDriver) -> bool:
+        try:
+            return driver.current_url is not None
+        except Exception:  # pylint: disable=broad-except
+            return False
+
+    def clear(self) -> None:
+        """Quit the unused drivers"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for pooled in idle:
+            WebDriverProxy.destroy(pooled.driver)
+
+
+webdriver_pool = WebDriverPool()
+atexit.register(webdriver_pool.clear)
+
+
+@worker_process_shutdown.connect
+def clear_webdriver_pool(**kwargs: Any) -> None:  # pylint: disable=unused-argument
+    # prefork Celery workers exit with os._exit, skipping the atexit handlers
+    webdriver_pool.clear()
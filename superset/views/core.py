@@ -19,14 +19,35 @@ import logging
 import re
 from contextlib import closing
 from datetime import datetime, timedelta
-from typing import Any, Callable, cast, Dict, List, Optional, Union
+from typing import (
+    Any,
+    Callable,
+    cast,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 from urllib import parse
 
 import backoff
 import humanize
 import pandas as pd
 import simplejson as json
-from flask import abort, flash, g, Markup, redirect, render_template, request, Response
+from flask import (
+    abort,
+    flash,
+    g,
+    Markup,
+    redirect,
+    render_template,
+    request,
+    Response,
+    stream_with_context,
+)
 from flask_appbuilder import expose
 from flask_appbuilder.models.sqla.interface import SQLAInterface
 from flask_appbuilder.security.decorators import (
@@ -98,7 +119,7 @@ from superset.sql_parse import CtasMethod, ParsedQuery, Table
 from superset.sql_validators import get_validator_by_name
 from superset.tasks.async_queries import load_explore_json_into_cache
 from superset.typing import FlaskResponse
-from superset.utils import core as utils, csv
+from superset.utils import core as utils, csv, table_listing, table_search
 from superset.utils.async_query_manager import AsyncQueryTokenException
 from superset.utils.cache import etag_cache
 from superset.utils.core import ReservedUrlParameters
@@ -131,6 +152,7 @@ from superset.views.utils import (
     check_slice_perms,
     get_cta_schema_name,
     get_dashboard_extra_filters,
+    get_dataset_extras,
     get_datasource_info,
     get_form_data,
     get_viz,
@@ -1027,92 +1049,94 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
         schema_parsed = utils.parse_js_uri_path_item(schema, eval_undefined=True)
         substr_parsed = utils.parse_js_uri_path_item(substr, eval_undefined=True)
 
-        if schema_parsed:
-            tables = (
-                database.get_all_table_names_in_schema(
-                    schema=schema_parsed,
+        valid_schemas: Optional[Set[str]] = None
+        if not schema_parsed and database.default_schemas:
+            user_schema = g.user.email.split("@")[0]
+            valid_schemas = set(database.default_schemas + [user_schema])
+
+        def get_datasource_names() -> Tuple[
+            List[utils.DatasourceName], List[utils.DatasourceName]
+        ]:
+            if config["TABLE_LISTING_STORE_ENABLED"]:
+                return table_listing.get_datasource_names(
+                    database,
+                    schema_parsed,
+                    schemas=valid_schemas,
                     force=force_refresh_parsed,
-                    cache=database.table_cache_enabled,
-                    cache_timeout=database.table_cache_timeout,
                 )
-                or []
-            )
-            views = (
-                database.get_all_view_names_in_schema(
-                    schema=schema_parsed,
-                    force=force_refresh_parsed,
-                    cache=database.table_cache_enabled,
-                    cache_timeout=database.table_cache_timeout,
+            if schema_parsed:
+                tables = (
+                    database.get_all_table_names_in_schema(
+                        schema=schema_parsed,
+                        force=force_refresh_parsed,
+                        cache=database.table_cache_enabled,
+                        cache_timeout=database.table_cache_timeout,
+                    )
+                    or []
                 )
-                or []
-            )
-        else:
+                views = (
+                    database.get_all_view_names_in_schema(
+                        schema=schema_parsed,
+                        force=force_refresh_parsed,
+                        cache=database.table_cache_enabled,
+                        cache_timeout=database.table_cache_timeout,
+                    )
+                    or []
+                )
+                return tables, views
             tables = database.get_all_table_names_in_database(
                 cache=True, force=False, cache_timeout=24 * 60 * 60
             )
             views = database.get_all_view_names_in_database(
                 cache=True, force=False, cache_timeout=24 * 60 * 60
             )
-        tables = security_manager.get_datasources_accessible_by_user(
-            database, tables, schema_parsed
-        )
-        views = security_manager.get_datasources_accessible_by_user(
-            database, views, schema_parsed
-        )
+            return tables, views
 
-        def get_datasource_label(ds_name: utils.DatasourceName) -> str:
-            return (
-                ds_name.table if schema_parsed else f"{ds_name.schema}.{ds_name.table}"
+        index = table_search.index_cache.get(
+            (database.id, schema_parsed, frozenset(valid_schemas or ())),
+            get_datasource_names,
+            # a table cache timeout of 0 (no expiry) or None (default) falls back
+            timeout=database.table_cache_timeout
+            or config["TABLE_SEARCH_INDEX_TIMEOUT"],
+            qualified=not schema_parsed,
+            force=force_refresh_parsed,
+        )
+        entries = index.search(substr_parsed)
+        accessible_names = set(
+            security_manager.get_datasources_accessible_by_user(
+                database, [entry.datasource_name for entry in entries], schema_parsed
             )
+        )
+        entries = [
+            entry
+            for entry in entries
+            if entry.datasource_name in accessible_names
+            and (valid_schemas is None or entry.datasource_name.schema in valid_schemas)
+        ]
 
-        if substr_parsed:
-            tables = [tn for tn in tables if substr_parsed in get_datasource_label(tn)]
-            views = [vn for vn in views if substr_parsed in get_datasource_label(vn)]
-
-        if not schema_parsed and database.default_schemas:
-            user_schema = g.user.email.split("@")[0]
-            valid_schemas = set(database.default_schemas + [user_schema])
-
-            tables = [tn for tn in tables if tn.schema in valid_schemas]
-            views = [vn for vn in views if vn.schema in valid_schemas]
-
-        max_items = config["MAX_TABLE_NAMES"] or len(tables)
-        total_items = len(tables) + len(views)
-        max_tables = len(tables)
-        max_views = len(views)
-        if total_items and substr_parsed:
-            max_tables = max_items * len(tables) // total_items
-            max_views = max_items * len(views) // total_items
-
-        dataset_tables = {table.name: table for table in database.tables}
-
-        table_options = [
-            {
-                "value": tn.table,
-                "schema": tn.schema,
-                "label": get_datasource_label(tn),
-                "title": get_datasource_label(tn),
-                "type": "table",
-                "extra": dataset_tables[f"{tn.schema}.{tn.table}"].extra_dict
-                if (f"{tn.schema}.{tn.table}" in dataset_tables)
-                else None,
+        # matches are ranked, so only the best ones are returned
+        max_items = config["MAX_TABLE_NAMES"] if substr_parsed else None
+        page = entries[: max_items or None]
+        extras = get_dataset_extras(
+            database,
+            [entry.datasource_name for entry in page if entry.type == "table"],
+        )
+
+        options = []
+        for entry in page:
+            option: Dict[str, Any] = {
+                "value": entry.datasource_name.table,
+                "schema": entry.datasource_name.schema,
+                "label": entry.label,
+                "title": entry.label,
+                "type": entry.type,
             }
-            for tn in tables[:max_tables]
-        ]
-        table_options.extend(
-            [
-                {
-                    "value": vn.table,
-                    "schema": vn.schema,
-                    "label": get_datasource_label(vn),
-                    "title": get_datasource_label(vn),
-                    "type": "view",
-                }
-                for vn in views[:max_views]
-            ]
-        )
-        table_options.sort(key=lambda value: value["label"])
-        payload = {"tableLength": len(tables) + len(views), "options": table_options}
+            if entry.type == "table":
+                option["extra"] = extras.get(
+                    (entry.datasource_name.schema, entry.datasource_name.table)
+                )
+            options.append(option)
+        payload = {"tableLength": len(entries), "options": options}
         return json_success(json.dumps(payload))
 
     @api
@@ -1837,6 +1861,18 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
                         f"/superset/request_access/?dashboard_id={dashboard.id}"
                     )
 
+        if is_feature_enabled("ROW_LEVEL_SECURITY"):
+            # resolves the row level security filters of all the tables of the
+            # dashboard at once, sparing the data requests of its charts from doing it
+            # one by one
+            security_manager.get_rls_filters_by_table(
+                [
+                    datasource
+                    for datasource in dashboard.datasources
+                    if datasource and datasource.type == "table"
+                ]
+            )
+
         dash_edit_perm = check_ownership(
             dashboard, raise_if_false=False
         ) and security_manager.can_access("can_save_dash", "Superset")
@@ -2163,11 +2199,24 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
         """Serves a key off of the results backend
 
         It is possible to pass the `rows` query argument to limit the number
-        of rows returned.
+        of rows returned, the `offset` query argument to skip rows, and the
+        `columns` query argument (repeated) to only return some of the columns.
         """
         if not results_backend:
             return json_error_response("Results backend isn't configured")
 
+        try:
+            rows = int(request.args["rows"]) if "rows" in request.args else None
+        except ValueError:
+            return json_error_response("Invalid `rows` argument", status=400)
+        try:
+            offset = int(request.args.get("offset", 0))
+        except ValueError:
+            return json_error_response("Invalid `offset` argument", status=400)
+        if offset < 0:
+            return json_error_response("Invalid `offset` argument", status=400)
+        columns = request.args.getlist("columns") or None
+
         read_from_results_backend_start = now_as_float()
         blob = results_backend.get(key)
         stats_logger.timing(
@@ -2195,7 +2244,12 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
         payload = utils.zlib_decompress(blob, decode=not results_backend_use_msgpack)
         try:
             obj = _deserialize_results_payload(
-                payload, query, cast(bool, results_backend_use_msgpack)
+                payload,
+                query,
+                cast(bool, results_backend_use_msgpack),
+                offset=offset,
+                limit=(rows or config["DISPLAY_MAX_ROW"]) if rows is not None else None,
+                columns=columns,
             )
         except SerializationError:
             return json_error_response(
@@ -2203,12 +2257,8 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
                 status=404,
             )
 
-        if "rows" in request.args:
-            try:
-                rows = int(request.args["rows"])
-            except ValueError:
-                return json_error_response("Invalid `rows` argument", status=400)
-            obj = apply_display_max_row_limit(obj, rows)
+        if rows is not None:
+            obj = apply_display_max_row_limit(obj, rows, offset)
 
         return json_success(
             json.dumps(obj, default=utils.json_iso_dttm_ser, ignore_nan=True)
@@ -2610,6 +2660,21 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
             flash(ex.error.message)
             return redirect("/")
 
+        def log_export(row_count: int) -> None:
+            event_info = {
+                "event_type": "data_export",
+                "client_id": client_id,
+                "row_count": row_count,
+                "database": query.database.name,
+                "schema": query.schema,
+                "sql": query.sql,
+                "exported_format": "csv",
+            }
+            event_rep = repr(event_info)
+            logger.info(
+                "CSV exported: %s", event_rep, extra={"superset_event": event_info}
+            )
+
         blob = None
         if results_backend and query.results_key:
             logger.info("Fetching CSV from results backend [%s]", query.results_key)
@@ -2625,6 +2690,27 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
             columns = [c["name"] for c in obj["columns"]]
             df = pd.DataFrame.from_records(obj["data"], columns=columns)
             logger.info("Using pandas to convert to CSV")
+        elif config["SQLLAB_FETCH_BATCH_SIZE"]:
+            logger.info("Running a query to stream as CSV")
+            sql = query.select_sql or query.executed_sql
+            dfs = query.database.iter_df(
+                sql, config["SQLLAB_FETCH_BATCH_SIZE"], query.schema
+            )
+
+            def generate_csv() -> Iterator[str]:
+                # only the first batch carries the header row
+                csv_export = {"header": True, **config["CSV_EXPORT"]}
+                row_count = 0
+                for df in dfs:
+                    row_count += len(df.index)
+                    yield csv.df_to_escaped_csv(df, index=False, **csv_export)
+                    csv_export["header"] = False
+                log_export(row_count)
+
+            return CsvResponse(
+                stream_with_context(generate_csv()),
+                headers=generate_download_headers("csv", parse.quote(query.name)),
+            )
         else:
             logger.info("Running a query to turn into CSV")
             sql = query.select_sql or query.executed_sql
@@ -2634,17 +2720,7 @@ class Superset(BaseSupersetView):  # pylint: disable=too-many-public-methods
         response = CsvResponse(
             csv_data, headers=generate_download_headers("csv", quoted_csv_name)
         )
-        event_info = {
-            "event_type": "data_export",
-            "client_id": client_id,
-            "row_count": len(df.index),
-            "database": query.database.name,
-            "schema": query.schema,
-            "sql": query.sql,
-            "exported_format": "csv",
-        }
-        event_rep = repr(event_info)
-        logger.info("CSV exported: %s", event_rep, extra={"superset_event": event_info})
+        log_export(len(df.index))
         return response
 
     @api
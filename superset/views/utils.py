@@ -31,8 +31,9 @@ from flask_babel import _
 from sqlalchemy.orm.exc import NoResultFound
 
 import superset.models.core as models
-from superset import app, dataframe, db, result_set, viz
+from superset import app, dataframe, db, result_set, results_backend, viz
 from superset.connectors.connector_registry import ConnectorRegistry
+from superset.connectors.sqla.models import SqlaTable
 from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
 from superset.exceptions import (
     CacheLoadError,
@@ -47,7 +48,8 @@ from superset.models.dashboard import Dashboard
 from superset.models.slice import Slice
 from superset.models.sql_lab import Query
 from superset.typing import FormData
-from superset.utils.core import QueryStatus, TimeRangeEndpoint
+from superset.utils import arrow_ipc
+from superset.utils.core import DatasourceName, QueryStatus, TimeRangeEndpoint
 from superset.utils.decorators import stats_timing
 from superset.viz import BaseViz
 
@@ -231,7 +233,7 @@ def get_datasource_info(
 
 
 def apply_display_max_row_limit(
-    sql_results: Dict[str, Any], rows: Optional[int] = None
+    sql_results: Dict[str, Any], rows: Optional[int] = None, offset: int = 0
 ) -> Dict[str, Any]:
     """
     Given a `sql_results` nested structure, applies a limit to the number of rows
@@ -242,6 +244,8 @@ def apply_display_max_row_limit(
     metadata.
 
     :param sql_results: The results of a sql query from sql_lab.get_sql_results
+    :param rows: The number of rows to display
+    :param offset: The number of rows preceding the ones in `sql_results`
     :returns: The mutated sql_results structure
     """
 
@@ -250,7 +254,7 @@ def apply_display_max_row_limit(
     if (
         display_limit
         and sql_results["status"] == QueryStatus.SUCCESS
-        and display_limit < sql_results["query"]["rows"]
+        and offset + display_limit < sql_results["query"]["rows"]
     ):
         sql_results["data"] = sql_results["data"][:display_limit]
         sql_results["displayLimitReached"] = True
@@ -558,9 +562,20 @@ def check_slice_perms(_self: Any, slice_id: int) -> None:
         viz_obj.raise_for_access()
 
 
-def _deserialize_results_payload(
-    payload: Union[bytes, str], query: Query, use_msgpack: Optional[bool] = False
+def _deserialize_results_payload(  # pylint: disable=too-many-arguments
+    payload: Union[bytes, str],
+    query: Query,
+    use_msgpack: Optional[bool] = False,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    columns: Optional[List[str]] = None,
 ) -> Dict[str, Any]:
+    """Deserializes a payload from the results backend
+
+    Only the ``limit`` rows starting at ``offset`` and the given ``columns`` are
+    returned. For data stored as Arrow IPC chunks this is pushed down into the
+    read, so only the chunks covering the requested rows are loaded.
+    """
     logger.debug("Deserializing from msgpack: %r", use_msgpack)
     if use_msgpack:
         with stats_timing(
@@ -568,27 +583,92 @@ def _deserialize_results_payload(
         ):
             ds_payload = msgpack.loads(payload, raw=False)
 
+        if "data_chunks" in ds_payload:
+            return _load_arrow_ipc_data(ds_payload, query, offset, limit, columns)
+
         with stats_timing("sqllab.query.results_backend_pa_deserialize", stats_logger):
             try:
                 pa_table = pa.deserialize(ds_payload["data"])
             except pa.ArrowSerializationError:
                 raise SerializationError("Unable to deserialize table")
 
-        df = result_set.SupersetResultSet.convert_table_to_df(pa_table)
-        ds_payload["data"] = dataframe.df_to_records(df) or []
+        pa_table = pa_table.slice(offset, limit)
+        if columns is not None:
+            pa_table = pa_table.select(
+                [name for name in columns if name in pa_table.column_names]
+            )
+        return _expand_results_data(ds_payload, pa_table, query, columns)
 
-        db_engine_spec = query.database.db_engine_spec
-        all_columns, data, expanded_columns = db_engine_spec.expand_data(
-            ds_payload["selected_columns"], ds_payload["data"]
-        )
-        ds_payload.update(
-            {"data": data, "columns": all_columns, "expanded_columns": expanded_columns}
+    with stats_timing("sqllab.query.results_backend_json_deserialize", stats_logger):
+        ds_payload = json.loads(payload)
+
+    if "data_chunks" in ds_payload:
+        return _load_arrow_ipc_data(ds_payload, query, offset, limit, columns)
+
+    if offset or limit is not None:
+        end = None if limit is None else offset + limit
+        ds_payload["data"] = ds_payload["data"][offset:end]
+    if columns is not None:
+        ds_payload["data"] = [
+            {name: row[name] for name in columns if name in row}
+            for row in ds_payload["data"]
+        ]
+        for key in ("columns", "selected_columns"):
+            ds_payload[key] = _project_columns(ds_payload[key], columns)
+    return ds_payload
+
+
+def _project_columns(
+    columns: List[Dict[str, Any]], names: Optional[List[str]]
+) -> List[Dict[str, Any]]:
+    if names is None:
+        return columns
+    return [column for column in columns if column["name"] in names]
+
+
+def _load_arrow_ipc_data(  # pylint: disable=too-many-arguments
+    ds_payload: Dict[str, Any],
+    query: Query,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    columns: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Loads the data stored as Arrow IPC chunks next to the payload metadata"""
+    with stats_timing(
+        "sqllab.query.results_backend_arrow_ipc_deserialize", stats_logger
+    ):
+        pa_table = arrow_ipc.read_table(
+            results_backend,
+            query.results_key,
+            ds_payload.pop("data_chunks"),
+            offset=offset,
+            limit=limit,
+            columns=columns,
         )
+    return _expand_results_data(ds_payload, pa_table, query, columns)
 
-        return ds_payload
 
-    with stats_timing("sqllab.query.results_backend_json_deserialize", stats_logger):
-        return json.loads(payload)
+def _expand_results_data(
+    ds_payload: Dict[str, Any],
+    pa_table: pa.Table,
+    query: Query,
+    columns: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    df = result_set.SupersetResultSet.convert_table_to_df(pa_table)
+    ds_payload["data"] = dataframe.df_to_records(df) or []
+    ds_payload["selected_columns"] = _project_columns(
+        ds_payload["selected_columns"], columns
+    )
+
+    db_engine_spec = query.database.db_engine_spec
+    all_columns, data, expanded_columns = db_engine_spec.expand_data(
+        ds_payload["selected_columns"], ds_payload["data"]
+    )
+    ds_payload.update(
+        {"data": data, "columns": all_columns, "expanded_columns": expanded_columns}
+    )
+
+    return ds_payload
 
 
 def get_cta_schema_name(
@@ -600,3 +680,32 @@ def get_cta_schema_name(
     if not func:
         return None
     return func(database, user, schema, sql)
+
+
+def get_dataset_extras(
+    database: Database, datasource_names: List[DatasourceName]
+) -> Dict[Tuple[Optional[str], str], Dict[str, Any]]:
+    """Returns the extra attributes of the datasets of some tables, without loading
+    the datasets themselves
+
+    :param database: Database of the tables
+    :param datasource_names: Tables to get the extra attributes of
+    :return: the extra attributes of the tables having a dataset, keyed by schema
+        and table name
+    """
+    query = db.session.query(
+        SqlaTable.schema, SqlaTable.table_name, SqlaTable.extra
+    ).filter(SqlaTable.database_id == database.id)
+    table_names = {datasource_name.table for datasource_name in datasource_names}
+    # past a few hundred names, fetching all the datasets is cheaper than a long
+    # IN clause, which some backends limit the size of
+    if len(table_names) <= 500:
+        query = query.filter(SqlaTable.table_name.in_(table_names))
+
+    extras: Dict[Tuple[Optional[str], str], Dict[str, Any]] = {}
+    for schema, table_name, extra in query:
+        try:
+            extras[(schema, table_name)] = json.loads(extra)
+        except (TypeError, json.JSONDecodeError):
+            extras[(schema, table_name)] = {}
+    return extras
@@ -48,7 +48,7 @@ import pandas as pd
 import polyline
 import simplejson as json
 from dateutil import relativedelta as rdelta
-from flask import request
+from flask import g, request
 from flask_babel import lazy_gettext as _
 from geopy.point import Point
 from pandas.tseries.frequencies import to_offset
@@ -67,7 +67,14 @@ from superset.models.cache import CacheKey
 from superset.models.helpers import QueryResult
 from superset.typing import QueryObjectDict, VizData, VizPayload
 from superset.utils import core as utils, csv
-from superset.utils.cache import set_and_log_cache
+from superset.utils.cache import (
+    acquire_cache_lock,
+    decode_dataframe,
+    encode_dataframe,
+    is_stale,
+    release_cache_lock,
+    set_and_log_cache,
+)
 from superset.utils.core import (
     DTTM_ALIAS,
     JS_MAX_INTEGER,
@@ -436,6 +443,42 @@ class BaseViz:
         json_data = self.json_dumps(cache_dict, sort_keys=True)
         return md5_sha_from_str(json_data)
 
+    def refresh_in_background(self) -> None:
+        """
+        Refresh the cached data of the chart in a Celery task as the current user,
+        unless a refresh was already requested by a concurrent request of the same
+        user.
+        """
+        from superset.tasks.async_queries import (  # pylint: disable=import-outside-toplevel
+            load_explore_json_into_cache,
+        )
+
+        # the row level security filters and impersonation of the user are part of
+        # the cache keys of the queries, so they are refreshed as the same user
+        user_id = getattr(getattr(g, "user", None), "id", None)
+        refresh_key = "{}__refresh".format(
+            md5_sha_from_str(
+                self.json_dumps(
+                    {"form_data": self.form_data, "user_id": user_id}, sort_keys=True
+                )
+            )
+        )
+        try:
+            if not cache_manager.data_cache.add(
+                refresh_key, True, timeout=config["DATA_CACHE_REFRESH_TIMEOUT"]
+            ):
+                return
+            load_explore_json_into_cache.delay(
+                None,
+                self.form_data,
+                force=True,
+                user_id=user_id,
+                refresh_key=refresh_key,
+            )
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.warning("Could not refresh cache key %s", refresh_key)
+            logger.exception(ex)
+
     def get_payload(self, query_obj: Optional[QueryObjectDict] = None) -> VizPayload:
         """Returns a payload of metadata and data"""
 
@@ -489,16 +532,24 @@ class BaseViz:
         is_loaded = False
         stacktrace = None
         df = None
+        lock_token = None
         if cache_key and cache_manager.data_cache and not self.force:
             cache_value = cache_manager.data_cache.get(cache_key)
+            if not cache_value and not self.force_cached:
+                lock_token, cache_value = acquire_cache_lock(
+                    cache_manager.data_cache, cache_key
+                )
             if cache_value:
                 stats_logger.incr("loading_from_cache")
                 try:
-                    df = cache_value["df"]
+                    df = decode_dataframe(cache_value["df"])
                     self.query = cache_value["query"]
                     self.status = utils.QueryStatus.SUCCESS
                     is_loaded = True
                     stats_logger.incr("loaded_from_cache")
+                    if is_stale(cache_value):
+                        stats_logger.incr("loaded_stale_from_cache")
+                        self.refresh_in_background()
                 except Exception as ex:
                     logger.exception(ex)
                     logger.error(
@@ -566,10 +617,13 @@ class BaseViz:
                 set_and_log_cache(
                     cache_manager.data_cache,
                     cache_key,
-                    {"df": df, "query": self.query},
+                    {"df": encode_dataframe(df), "query": self.query},
                     self.cache_timeout,
                     self.datasource.uid,
+                    stale_timeout=config["DATA_CACHE_STALE_TIMEOUT"],
                 )
+            if lock_token and cache_key:
+                release_cache_lock(cache_manager.data_cache, cache_key, lock_token)
         return {
             "cache_key": cache_key,
             "cached_dttm": cache_value["dttm"] if cache_value is not None else None,
@@ -1221,6 +1275,19 @@ class NVD3TimeSeriesViz(NVD3Viz):
     is_timeseries = True
     pivot_fill_value: Optional[int] = None
 
+    @staticmethod
+    def series_x_values(index: pd.Index) -> List[Any]:
+        """
+        The x values shared by all the series of a frame. Timestamps are converted
+        to epoch milliseconds in one go, as ``json_int_dttm_ser`` would one at a
+        time, with the wall time of timezone aware timestamps taken as UTC.
+        """
+        if isinstance(index, pd.DatetimeIndex) and not index.hasnans:
+            if index.tz is not None:
+                index = index.tz_localize(None)
+            return (index.asi8 / 1e6).tolist()
+        return index.tolist()
+
     def to_series(
         self, df: pd.DataFrame, classed: str = "", title_suffix: str = ""
     ) -> List[Dict[str, Any]]:
@@ -1233,12 +1300,14 @@ class NVD3TimeSeriesViz(NVD3Viz):
             else:
                 cols.append(col)
         df.columns = cols
-        series = df.to_dict("series")
 
+        xs = self.series_x_values(df.index)
         chart_data = []
-        for name in df.T.index.tolist():
-            ys = series[name]
-            if df[name].dtype.kind not in "biufc":
+        for name, col in df.items():
+            if col.dtype.kind not in "biufc":
+                continue
+            ys = col.to_numpy()
+            if np.isnan(ys).all():
                 continue
             series_title: Union[List[str], str, Tuple[str, ...]]
             if isinstance(name, list):
@@ -1262,20 +1331,7 @@ class NVD3TimeSeriesViz(NVD3Viz):
                 elif isinstance(series_title, tuple):
                     series_title = series_title + (title_suffix,)
 
-            values = []
-            non_nan_cnt = 0
-            for ds in df.index:
-                if ds in ys:
-                    d = {"x": ds, "y": ys[ds]}
-                    if not np.isnan(ys[ds]):
-                        non_nan_cnt += 1
-                else:
-                    d = {}
-                values.append(d)
-
-            if non_nan_cnt == 0:
-                continue
-
+            values = [{"x": x, "y": y} for x, y in zip(xs, ys.tolist())]
             d = {"key": series_title, "values": values}
             if classed:
                 d["classed"] = classed
@@ -1321,8 +1377,7 @@ class NVD3TimeSeriesViz(NVD3Viz):
 
         df = self.apply_rolling(df)
         if fd.get("contribution"):
-            dft = df.T
-            df = (dft / dft.sum()).T
+            df = df.div(df.sum(axis=1), axis=0)
 
         return df
 
@@ -2890,6 +2945,11 @@ class RoseViz(NVD3TimeSeriesViz):
                 d["orderby"] = [(sort_by, not self.form_data.get("order_desc", True))]
         return d
 
+    @staticmethod
+    def series_x_values(index: pd.Index) -> List[Any]:
+        # results are keyed and labelled by timestamp below
+        return index.tolist()
+
     def get_data(self, df: pd.DataFrame) -> VizData:
         if df.empty:
             return None
@@ -16,11 +16,20 @@
 # under the License.
 """Unit tests for Superset with caching"""
 import json
+from unittest import mock
 
+import pandas as pd
 import pytest
+from cachelib import SimpleCache
 
 from superset import app, db
 from superset.extensions import cache_manager
+from superset.utils.cache import (
+    acquire_cache_lock,
+    decode_dataframe,
+    encode_dataframe,
+    release_cache_lock,
+)
 from superset.utils.core import QueryStatus
 from tests.fixtures.birth_names_dashboard import load_birth_names_dashboard_with_slices
 
@@ -55,6 +64,7 @@ class TestCache(SupersetTestCase):
         )
         # restore DATA_CACHE_CONFIG
         app.config["DATA_CACHE_CONFIG"] = data_cache_config
+        cache_manager.init_app(app)
         self.assertFalse(resp["is_cached"])
         self.assertFalse(resp_from_cache["is_cached"])
 
@@ -100,3 +110,103 @@ class TestCache(SupersetTestCase):
         app.config["DATA_CACHE_CONFIG"] = data_cache_config
         app.config["CACHE_DEFAULT_TIMEOUT"] = cache_default_timeout
         cache_manager.init_app(app)
+
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_slice_data_local_cache(self):
+        app.config["DATA_CACHE_LOCAL_MAX_BYTES"] = 10 ** 6
+        cache_manager.init_app(app)
+
+        slc = self.get_slice("Boys", db.session)
+        json_endpoint = "/superset/explore_json/{}/{}/".format(
+            slc.datasource_type, slc.datasource_id
+        )
+        resp = self.get_json_resp(
+            json_endpoint, {"form_data": json.dumps(slc.viz.form_data)}
+        )
+        cache_manager.data_cache.cache.remote_cache.clear()
+        resp_from_cache = self.get_json_resp(
+            json_endpoint, {"form_data": json.dumps(slc.viz.form_data)}
+        )
+
+        # reset cache config
+        app.config["DATA_CACHE_LOCAL_MAX_BYTES"] = 0
+        cache_manager.init_app(app)
+        self.assertFalse(resp["is_cached"])
+        self.assertTrue(resp_from_cache["is_cached"])
+        self.assertEqual(resp["data"], resp_from_cache["data"])
+
+    @mock.patch.dict(
+        "superset.utils.cache.config",
+        {
+            "DATA_CACHE_LOCK_TIMEOUT": 0.1,
+            "DATA_CACHE_LOCK_EXPIRY": 60,
+            "DATA_CACHE_LOCK_POLL_INTERVAL": 0.01,
+        },
+    )
+    def test_cache_lock(self):
+        cache = SimpleCache()
+
+        # the first request takes the lock
+        token, cache_value = acquire_cache_lock(cache, "key")
+        self.assertIsNotNone(token)
+        self.assertIsNone(cache_value)
+
+        # the others wait for the value and give up if it isn't cached in time
+        self.assertEqual(acquire_cache_lock(cache, "key"), (None, None))
+        cache.set("key", {"df": None})
+        self.assertEqual(acquire_cache_lock(cache, "key"), (None, {"df": None}))
+
+        # the lock is taken over once released without a value
+        release_cache_lock(cache, "key", token)
+        cache.delete("key")
+        other_token, _ = acquire_cache_lock(cache, "key")
+        self.assertNotIn(other_token, (None, token))
+
+        # a lock is only released by its holder, e.g. once it expired and was taken
+        # over by another request
+        release_cache_lock(cache, "key", token)
+        self.assertEqual(acquire_cache_lock(cache, "key"), (None, None))
+        release_cache_lock(cache, "key", other_token)
+        self.assertIsNotNone(acquire_cache_lock(cache, "key")[0])
+
+    @mock.patch.dict("superset.utils.cache.config", {"DATA_CACHE_LOCK_TIMEOUT": 0})
+    def test_cache_lock_disabled(self):
+        cache = SimpleCache()
+        self.assertEqual(acquire_cache_lock(cache, "key"), (None, None))
+        self.assertEqual(acquire_cache_lock(cache, "key"), (None, None))
+
+    @mock.patch.dict("superset.utils.cache.config", {"DATA_CACHE_USE_ARROW": True})
+    def test_encode_dataframe(self):
+        df = pd.DataFrame({"__timestamp": pd.to_datetime(["2021-01-01"]), "a": [1]})
+        encoded = encode_dataframe(df)
+        self.assertIsInstance(encoded, bytes)
+        pd.testing.assert_frame_equal(decode_dataframe(encoded), df)
+
+        # DataFrames that can't be encoded faithfully are left as they are
+        for df in (
+            pd.DataFrame({"a": [1, "b"]}),
+            pd.DataFrame({"a": [[1], [2]]}),
+            pd.DataFrame({0: [1]}),
+        ):
+            self.assertIs(encode_dataframe(df), df)
+            self.assertIs(decode_dataframe(df), df)
+
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    @mock.patch.dict("superset.utils.cache.config", {"DATA_CACHE_USE_ARROW": True})
+    def test_slice_data_arrow_cache(self):
+        slc = self.get_slice("Boys", db.session)
+        json_endpoint = "/superset/explore_json/{}/{}/".format(
+            slc.datasource_type, slc.datasource_id
+        )
+        resp = self.get_json_resp(
+            json_endpoint, {"form_data": json.dumps(slc.viz.form_data)}
+        )
+        resp_from_cache = self.get_json_resp(
+            json_endpoint, {"form_data": json.dumps(slc.viz.form_data)}
+        )
+        self.assertFalse(resp["is_cached"])
+        self.assertTrue(resp_from_cache["is_cached"])
+        self.assertEqual(resp["data"], resp_from_cache["data"])
+        self.assertIsInstance(
+            cache_manager.data_cache.get(resp_from_cache["cache_key"])["df"], bytes
+        )
@@ -1181,6 +1181,27 @@ class TestChartApi(SupersetTestCase, ApiOwnersTestCaseMixin, InsertChartMixin):
         rv = self.post_assert_metric(CHART_DATA_URI, request_payload, "data")
         self.assertEqual(rv.status_code, 200)
 
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_chart_data_json_columnar_result_format(self):
+        """
+        Chart data API: Test chart data with columnar JSON result format
+        """
+        self.login(username="admin")
+        request_payload = get_query_context("birth_names")
+        request_payload["queries"][0]["row_limit"] = 10
+        rv = self.post_assert_metric(CHART_DATA_URI, request_payload, "data")
+        records = json.loads(rv.data.decode("utf-8"))["result"][0]
+
+        request_payload["result_format"] = "json_columnar"
+        rv = self.post_assert_metric(CHART_DATA_URI, request_payload, "data")
+        self.assertEqual(rv.status_code, 200)
+        result = json.loads(rv.data.decode("utf-8"))["result"][0]
+        self.assertEqual(result["colnames"], records["colnames"])
+        self.assertEqual(
+            [dict(zip(result["colnames"], row)) for row in zip(*result["data"])],
+            records["data"],
+        )
+
     @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
     def test_chart_data_mixed_case_filter_op(self):
         """
@@ -36,6 +36,7 @@ from unittest import mock, skipUnless
 
 import pandas as pd
 import sqlalchemy as sqla
+from cachelib import SimpleCache
 from sqlalchemy.exc import SQLAlchemyError
 from superset.models.cache import CacheKey
 from superset.utils.core import get_example_database
@@ -54,15 +55,17 @@ from superset.connectors.sqla.models import SqlaTable
 from superset.db_engine_specs.base import BaseEngineSpec
 from superset.db_engine_specs.mssql import MssqlEngineSpec
 from superset.exceptions import SupersetException
-from superset.extensions import async_query_manager
+from superset.extensions import async_query_manager, cache_manager
 from superset.models import core as models
 from superset.models.annotations import Annotation, AnnotationLayer
 from superset.models.dashboard import Dashboard
 from superset.models.datasource_access_request import DatasourceAccessRequest
 from superset.models.slice import Slice
 from superset.models.sql_lab import Query
+from superset.models.table_listing import SchemaListing, TableListing
 from superset.result_set import SupersetResultSet
-from superset.utils import core as utils
+from superset.tasks.async_queries import load_explore_json_into_cache
+from superset.utils import arrow_ipc, core as utils, table_search
 from superset.views import core as views
 from superset.views.database.views import DatabaseView
 
@@ -179,6 +182,56 @@ class TestCore(SupersetTestCase):
         }
         self.assertEqual(response, expected_response)
 
+    @mock.patch.dict("superset.views.core.config", TABLE_LISTING_STORE_ENABLED=True)
+    def test_get_superset_tables_substr_listing_store(self):
+        example_db = utils.get_example_database()
+        if example_db.backend in {"presto", "hive"}:
+            return
+        # drops the index of the tables listed without the store
+        table_search.index_cache.invalidate(example_db.id)
+        self.login(username="admin")
+        schema_name = self.default_schema_backend_map[example_db.backend]
+        uri = f"superset/tables/{example_db.id}/{schema_name}/ab_role/"
+        rv = self.client.get(uri)
+        response = json.loads(rv.data.decode("utf-8"))
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(
+            [option["value"] for option in response["options"]], ["ab_role"]
+        )
+        listing = (
+            db.session.query(SchemaListing)
+            .filter_by(database_id=example_db.id, schema=schema_name)
+            .one()
+        )
+        self.assertIsNotNone(listing.refreshed_on)
+        db.session.query(TableListing).filter_by(schema_listing_id=listing.id).delete()
+        db.session.delete(listing)
+        db.session.commit()
+
+    @mock.patch.dict("superset.views.core.config", TABLE_SEARCH_INDEX_TIMEOUT=300)
+    def test_get_superset_tables_index_timeout(self):
+        example_db = utils.get_example_database()
+        schema_name = self.default_schema_backend_map[example_db.backend]
+        self.login(username="admin")
+        uri = f"superset/tables/{example_db.id}/{schema_name}/ab_role/"
+        for table_cache_timeout, index_timeout in ((None, 300), (0, 300), (60, 60)):
+            with mock.patch.object(
+                models.Database,
+                "table_cache_enabled",
+                new_callable=mock.PropertyMock,
+                return_value=True,
+            ), mock.patch.object(
+                models.Database,
+                "table_cache_timeout",
+                new_callable=mock.PropertyMock,
+                return_value=table_cache_timeout,
+            ), mock.patch.object(
+                table_search.index_cache, "get", wraps=table_search.index_cache.get
+            ) as get_index:
+                rv = self.client.get(uri)
+            self.assertEqual(rv.status_code, 200)
+            self.assertEqual(get_index.call_args[1]["timeout"], index_timeout)
+
     def test_get_superset_tables_not_found(self):
         self.login(username="admin")
         uri = f"superset/tables/invalid/public/undefined/"
@@ -716,6 +769,27 @@ class TestCore(SupersetTestCase):
         self.assertEqual(list(expected_data), list(data))
         self.logout()
 
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    @mock.patch.dict("superset.views.core.config", SQLLAB_FETCH_BATCH_SIZE=2)
+    def test_csv_endpoint_fetch_in_batches(self):
+        self.login()
+        sql = """
+            SELECT name
+            FROM birth_names
+            ORDER BY name
+            LIMIT 5
+        """
+        client_id = "{}".format(random.getrandbits(64))[:10]
+        resp = self.run_sql(sql, client_id, raise_on_error=True)
+        names = [row["name"] for row in resp["data"]]
+
+        resp = self.get_resp("/superset/csv/{}".format(client_id))
+        data = csv.reader(io.StringIO(resp))
+        expected_data = csv.reader(io.StringIO("\n".join(["name", *names]) + "\n"))
+
+        self.assertEqual(list(expected_data), list(data))
+        self.logout()
+
     @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
     def test_extra_table_metadata(self):
         self.login()
@@ -914,6 +988,54 @@ class TestCore(SupersetTestCase):
         self.assertEqual(rv.status_code, 200)
         self.assertEqual(data["rowcount"], 2)
 
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    @mock.patch.dict("superset.viz.config", {"DATA_CACHE_STALE_TIMEOUT": 60})
+    @mock.patch("superset.tasks.async_queries.load_explore_json_into_cache.delay")
+    def test_explore_json_stale_cache_refresh(self, mock_delay):
+        tbl_id = self.table_ids.get("birth_names")
+        form_data = {
+            "datasource": f"{tbl_id}__table",
+            "viz_type": "dist_bar",
+            "time_range_endpoints": ["inclusive", "exclusive"],
+            "granularity_sqla": "ds",
+            "time_range": "No filter",
+            "metrics": ["count"],
+            "adhoc_filters": [],
+            "groupby": ["gender"],
+            "row_limit": 99,
+        }
+        self.login(username="admin")
+
+        def explore_json():
+            rv = self.client.post(
+                "/superset/explore_json/", data={"form_data": json.dumps(form_data)},
+            )
+            return json.loads(rv.data.decode("utf-8"))
+
+        def make_stale(cache_key):
+            cache_value = cache_manager.data_cache.get(cache_key)
+            cache_manager.data_cache.set(cache_key, {**cache_value, "stale_after": 0})
+
+        cache_key = explore_json()["cache_key"]
+        self.addCleanup(cache_manager.data_cache.delete, cache_key)
+        make_stale(cache_key)
+        for _ in range(2):
+            self.assertTrue(explore_json()["is_cached"])
+        mock_delay.assert_called_once()
+        refresh_key = mock_delay.call_args[1]["refresh_key"]
+        self.addCleanup(cache_manager.data_cache.delete, refresh_key)
+
+        # the refresh caches fresh data under the same key, and another refresh is
+        # queued once it completed
+        load_explore_json_into_cache(
+            *mock_delay.call_args[0], **mock_delay.call_args[1]
+        )
+        self.assertIsNone(cache_manager.data_cache.get(refresh_key))
+        self.assertGreater(cache_manager.data_cache.get(cache_key)["stale_after"], 0)
+        make_stale(cache_key)
+        self.assertTrue(explore_json()["is_cached"])
+        self.assertEqual(mock_delay.call_count, 2)
+
     @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
     def test_explore_json_dist_bar_order(self):
         tbl_id = self.table_ids.get("birth_names")
@@ -1091,9 +1213,12 @@ class TestCore(SupersetTestCase):
 
         class MockCache:
             def get(self, key):
-                return form_data
+                return form_data if key == "valid-cache-key" else None
 
-            def set(self):
+            def set(self, key, value, timeout=None):
+                return None
+
+            def add(self, key, value, timeout=None):
                 return None
 
         mock_cache.return_value = MockCache()
@@ -1235,6 +1360,83 @@ class TestCore(SupersetTestCase):
 
         app.config["RESULTS_BACKEND_USE_MSGPACK"] = use_msgpack
 
+    @mock.patch("superset.views.core.results_backend_use_msgpack", False)
+    @mock.patch("superset.views.core.results_backend")
+    def test_results_pagination(self, mock_results_backend):
+        self.login()
+
+        data = [{"col_0": i, "col_1": str(i)} for i in range(100)]
+        columns = [
+            {"name": "col_0", "type": "INT", "is_date": False},
+            {"name": "col_1", "type": "STRING", "is_date": False},
+        ]
+        payload = {
+            "status": utils.QueryStatus.SUCCESS,
+            "query": {"rows": 100},
+            "data": data,
+            "columns": columns,
+            "selected_columns": columns,
+        }
+        serialized_payload = sql_lab._serialize_payload(payload, False)
+        mock_results_backend.get.return_value = utils.zlib_compress(serialized_payload)
+
+        with mock.patch("superset.views.core.db") as mock_superset_db:
+            mock_superset_db.session.query().filter_by().one_or_none.return_value = (
+                mock.Mock()
+            )
+            page = json.loads(self.get_resp("/superset/results/key/?rows=10&offset=20"))
+            last_page = json.loads(
+                self.get_resp("/superset/results/key/?rows=10&offset=90")
+            )
+            projected = json.loads(
+                self.get_resp("/superset/results/key/?rows=2&columns=col_1")
+            )
+            resp = self.client.get("/superset/results/key/?offset=x")
+
+        self.assertEqual(page["data"], data[20:30])
+        self.assertTrue(page["displayLimitReached"])
+        self.assertEqual(last_page["data"], data[90:])
+        self.assertNotIn("displayLimitReached", last_page)
+        self.assertEqual(projected["data"], [{"col_1": "0"}, {"col_1": "1"}])
+        self.assertEqual(projected["columns"], columns[1:])
+        self.assertEqual(resp.status_code, 400)
+
+    @mock.patch("superset.views.utils.results_backend", new_callable=SimpleCache)
+    def test_results_arrow_ipc_pagination(self, results_backend):
+        data = [(i, str(i)) for i in range(10)]
+        cursor_descr = (("a", "int"), ("b", "string"))
+        db_engine_spec = BaseEngineSpec()
+        results = SupersetResultSet(data, cursor_descr, db_engine_spec)
+        payload = {
+            "data": [],
+            "columns": results.columns,
+            "selected_columns": results.columns,
+            "expanded_columns": [],
+            "data_chunks": arrow_ipc.write_table(
+                results_backend, "key", results.pa_table, 3
+            ),
+        }
+        query_mock = mock.Mock()
+        query_mock.results_key = "key"
+        query_mock.database.db_engine_spec = db_engine_spec
+
+        with mock.patch.object(
+            results_backend, "get", wraps=results_backend.get
+        ) as get:
+            deserialized_payload = superset.views.utils._deserialize_results_payload(
+                sql_lab._serialize_payload(payload, True),
+                query_mock,
+                True,
+                offset=4,
+                limit=2,
+                columns=["b"],
+            )
+            # only the chunk holding rows 3 to 5 is read
+            get.assert_called_once_with("key:1")
+
+        self.assertEqual(deserialized_payload["data"], [{"b": "4"}, {"b": "5"}])
+        self.assertEqual(deserialized_payload["columns"], results.columns[1:])
+
     def test_results_default_deserialization(self):
         use_new_deserialization = False
         data = [("a", 4, 4.0, "2019-08-18T16:39:16.660000")]
@@ -1338,6 +1540,40 @@ class TestCore(SupersetTestCase):
             self.assertDictEqual(deserialized_payload, payload)
             expand_data.assert_called_once()
 
+    @mock.patch("superset.views.utils.results_backend", new_callable=SimpleCache)
+    def test_results_arrow_ipc_deserialization(self, results_backend):
+        data = [("a", 4, 4.0), ("b", 5, 5.0), ("c", 6, 6.0)]
+        cursor_descr = (("a", "string"), ("b", "int"), ("c", "float"))
+        db_engine_spec = BaseEngineSpec()
+        results = SupersetResultSet(data, cursor_descr, db_engine_spec)
+        payload = {
+            "query_id": 1,
+            "status": utils.QueryStatus.SUCCESS,
+            "data": [],
+            "columns": results.columns,
+            "selected_columns": results.columns,
+            "expanded_columns": [],
+            "data_chunks": arrow_ipc.write_table(
+                results_backend, "key", results.pa_table, 2, "zstd"
+            ),
+        }
+        self.assertEqual(payload["data_chunks"], [2, 1])
+
+        for use_msgpack in (False, True):
+            serialized_payload = sql_lab._serialize_payload(dict(payload), use_msgpack)
+            query_mock = mock.Mock()
+            query_mock.results_key = "key"
+            query_mock.database.db_engine_spec = db_engine_spec
+
+            deserialized_payload = superset.views.utils._deserialize_results_payload(
+                serialized_payload, query_mock, use_msgpack
+            )
+            self.assertNotIn("data_chunks", deserialized_payload)
+            self.assertEqual(
+                deserialized_payload["data"],
+                dataframe.df_to_records(results.to_pandas_df()),
+            )
+
     @mock.patch.dict(
         "superset.extensions.feature_flag_manager._feature_flags",
         {"FOO": lambda x: 1},
@@ -19,7 +19,7 @@ import numpy as np
 import pandas as pd
 
 import tests.test_app
-from superset.dataframe import df_to_records
+from superset.dataframe import df_to_columns, df_to_records
 from superset.db_engine_specs import BaseEngineSpec
 from superset.result_set import SupersetResultSet
 
@@ -51,3 +51,36 @@ class TestSupersetDataFrame(SupersetTestCase):
                 {"a": 2, "b": 100, "c": "c2"},
             ],
         )
+
+    def test_js_max_int_numpy(self):
+        df = pd.DataFrame(
+            {
+                "a": np.array([1, -1239162456494753670, 3], dtype=np.int64),
+                "b": np.array([1239162456494753670, 2, 3], dtype=np.uint64),
+                "c": [1.5, 2.5, 3.5],
+            }
+        )
+        self.assertEqual(
+            df_to_records(df),
+            [
+                {"a": 1, "b": "1239162456494753670", "c": 1.5},
+                {"a": "-1239162456494753670", "b": 2, "c": 2.5},
+                {"a": 3, "b": 3, "c": 3.5},
+            ],
+        )
+
+    def test_js_max_int_nullable(self):
+        df = pd.DataFrame({"a": pd.Series([1, None, 2 ** 60], dtype="Int64")})
+        self.assertEqual(
+            df_to_records(df), [{"a": 1}, {"a": pd.NA}, {"a": "1152921504606846976"}]
+        )
+
+    def test_df_to_columns(self):
+        data = [(1, 1239162456494753670, "c1"), (2, None, "c2")]
+        cursor_descr = (("a", "int"), ("b", "int"), ("c", "string"))
+        results = SupersetResultSet(data, cursor_descr, BaseEngineSpec)
+        df = results.to_pandas_df()
+
+        self.assertEqual(
+            df_to_columns(df), [[1, 2], ["1239162456494753670", None], ["c1", "c2"]]
+        )
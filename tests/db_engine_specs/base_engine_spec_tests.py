@@ -28,7 +28,7 @@ from superset.db_engine_specs.base import (
 from superset.db_engine_specs.mysql import MySQLEngineSpec
 from superset.db_engine_specs.sqlite import SqliteEngineSpec
 from superset.sql_parse import ParsedQuery
-from superset.utils.core import get_example_database
+from superset.utils.core import DatasourceName, get_example_database
 from tests.db_engine_specs.base_tests import TestDbEngineSpec
 from tests.test_app import app
 
@@ -326,6 +326,43 @@ class TestDbEngineSpecs(TestDbEngineSpec):
         result = BaseEngineSpec.pyodbc_rows_to_tuples(data)
         self.assertListEqual(result, data)
 
+    @mock.patch.dict(
+        "superset.db_engine_specs.base.config", {"METADATA_CRAWL_MAX_WORKERS": 2}
+    )
+    def test_get_all_datasource_names(self):
+        def get_all_table_names_in_schema(schema, **kwargs):
+            if schema == "b":
+                raise Exception("Access denied")
+            return [DatasourceName(f"{schema}_table", schema)]
+
+        database = mock.Mock()
+        database.get_all_schema_names.return_value = ["a", "b", "c"]
+        database.get_all_table_names_in_schema.side_effect = (
+            get_all_table_names_in_schema
+        )
+        self.assertListEqual(
+            BaseEngineSpec.get_all_datasource_names(database, "table"),
+            [DatasourceName("a_table", "a"), DatasourceName("c_table", "c")],
+        )
+        database.get_all_view_names_in_schema.assert_not_called()
+
+    def test_fetch_data_in_batches(self):
+        cursor = mock.MagicMock()
+        cursor.fetchmany.side_effect = [[(1,), (2,)], [(3,), (4,)], [(5,)], []]
+        batches = list(BaseEngineSpec.fetch_data_in_batches(cursor, batch_size=2))
+        self.assertListEqual(batches, [[(1,), (2,)], [(3,), (4,)], [(5,)]])
+        cursor.fetchmany.assert_called_with(2)
+
+    def test_fetch_data_in_batches_with_limit(self):
+        cursor = mock.MagicMock()
+        cursor.arraysize = 2
+        cursor.fetchmany.side_effect = [[(1,), (2,)], [(3,)]]
+        batches = list(BaseEngineSpec.fetch_data_in_batches(cursor, limit=3))
+        self.assertListEqual(batches, [[(1,), (2,)], [(3,)]])
+        self.assertListEqual(
+            cursor.fetchmany.call_args_list, [mock.call(2), mock.call(1)]
+        )
+
 
 def test_is_readonly():
     def is_readonly(sql: str) -> bool:
@@ -65,6 +65,11 @@ class TestOracleDbEngineSpec(TestDbEngineSpec):
         cursor.fetchall.return_value = result
         assert OracleEngineSpec.fetch_data(cursor) == result
 
+    def test_fetch_data_in_batches_no_description(self):
+        cursor = mock.MagicMock()
+        cursor.description = []
+        assert list(OracleEngineSpec.fetch_data_in_batches(cursor)) == []
+
 
 @pytest.mark.parametrize(
     "date_format,expected",
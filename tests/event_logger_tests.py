@@ -14,7 +14,10 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import json
 import logging
+import os
+import tempfile
 import time
 import unittest
 from datetime import datetime, timedelta
@@ -22,10 +25,13 @@ from typing import Any, Callable, cast, Dict, Iterator, Optional, Type, Union
 from unittest.mock import patch
 
 from freezegun import freeze_time
+from sqlalchemy.exc import IntegrityError, OperationalError
 
-from superset import security_manager
+from superset import db, security_manager
+from superset.models.core import Log
 from superset.utils.log import (
     AbstractEventLogger,
+    BufferedDBEventLogger,
     DBEventLogger,
     get_event_logger_from_cfg_value,
 )
@@ -194,3 +200,100 @@ class TestEventLogger(unittest.TestCase):
                 "duration": 5558756000,
             }
         ]
+
+    def log_events(self, logger, *records):
+        logger.log(
+            None,
+            "buffered",
+            dashboard_id=1,
+            duration_ms=10,
+            slice_id=2,
+            referrer=None,
+            records=list(records),
+        )
+
+    def buffered_logs(self):
+        logs = db.session.query(Log).filter_by(action="buffered").order_by(Log.id)
+        return [json.loads(log.json) for log in logs if log.json]
+
+    def tearDown(self):
+        with app.app_context():
+            db.session.query(Log).filter_by(action="buffered").delete()
+            db.session.commit()
+
+    def test_buffered_db_event_logger(self):
+        logger = BufferedDBEventLogger(batch_size=2, flush_interval=0.05)
+        with app.app_context():
+            self.log_events(logger, {"a": 1}, {"b": 2}, {"c": 3})
+            time.sleep(0.2)
+            self.log_events(logger, {"d": object()})
+            logger.shutdown()
+            self.assertEqual(self.buffered_logs(), [{"a": 1}, {"b": 2}, {"c": 3}])
+            self.assertEqual(
+                db.session.query(Log).filter_by(action="buffered", json=None).count(),
+                1,
+            )
+
+    @patch.object(BufferedDBEventLogger, "_start")
+    def test_buffered_db_event_logger_spill(self, mock_start):
+        with tempfile.TemporaryDirectory() as spill_dir:
+            spill_path = os.path.join(spill_dir, "events")
+            logger = BufferedDBEventLogger(max_queue_size=1, spill_path=spill_path)
+            with app.app_context():
+                logger._app = app
+                self.log_events(logger, {"a": 1}, {"b": 2}, {"c": 3})
+                with open(f"{spill_path}.{os.getpid()}") as spill_file:
+                    self.assertEqual(len(spill_file.readlines()), 2)
+
+                logger._replay_spilled()
+                self.assertEqual(os.listdir(spill_dir), [])
+                self.assertEqual(self.buffered_logs(), [{"b": 2}, {"c": 3}])
+
+                logger._pid = os.getpid()
+                logger.shutdown()
+                self.assertEqual(self.buffered_logs(), [{"b": 2}, {"c": 3}, {"a": 1}])
+
+    @patch.object(BufferedDBEventLogger, "_start")
+    def test_buffered_db_event_logger_replay_errors(self, mock_start):
+        with tempfile.TemporaryDirectory() as spill_dir:
+            spill_path = os.path.join(spill_dir, "events")
+            logger = BufferedDBEventLogger(max_queue_size=1, spill_path=spill_path)
+            insert = logger._insert
+
+            def insert_failing(error):
+                def _insert(rows):
+                    if any(json.loads(row["json"]).get("bad") for row in rows):
+                        return error
+                    return insert(rows)
+
+                return _insert
+
+            with app.app_context():
+                logger._app = app
+                self.log_events(logger, {"a": 1}, {"bad": 1}, {"c": 3})
+
+                # the spilled logs are kept while the database can't be reached
+                outage = OperationalError("INSERT", {}, Exception("server gone"))
+                with patch.object(
+                    logger, "_insert", side_effect=insert_failing(outage)
+                ):
+                    self.assertFalse(logger._replay_spilled())
+                self.assertEqual(self.buffered_logs(), [])
+                with open(f"{spill_path}.{os.getpid()}") as spill_file:
+                    self.assertEqual(len(spill_file.readlines()), 2)
+
+                # the logs which can't be inserted are dropped
+                invalid = IntegrityError("INSERT", {}, Exception("constraint failed"))
+                with patch.object(
+                    logger, "_insert", side_effect=insert_failing(invalid)
+                ), self.assertLogs(level="WARNING"):
+                    self.assertTrue(logger._replay_spilled())
+                self.assertEqual(os.listdir(spill_dir), [])
+                self.assertEqual(self.buffered_logs(), [{"c": 3}])
+
+    @patch.object(BufferedDBEventLogger, "_start")
+    def test_buffered_db_event_logger_drop(self, mock_start):
+        logger = BufferedDBEventLogger(max_queue_size=1)
+        with app.app_context():
+            with self.assertLogs(level="WARNING"):
+                self.log_events(logger, {"a": 1}, {"b": 2})
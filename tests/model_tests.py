@@ -26,6 +26,7 @@ from sqlalchemy.engine.url import make_url
 
 import tests.test_app
 from superset import app, db as metadata_db
+from superset.extensions import engine_manager
 from superset.models.core import Database
 from superset.models.slice import Slice
 from superset.utils.core import get_example_database, QueryStatus
@@ -111,6 +112,38 @@ class TestDatabaseModel(SupersetTestCase):
         user_name = make_url(model.get_sqla_engine(user_name=example_user).url).username
         self.assertNotEqual(example_user, user_name)
 
+    def test_get_sqla_engine_pooled(self):
+        database = get_example_database()
+        other_database = Database(
+            id=database.id,
+            database_name=database.database_name,
+            sqlalchemy_uri=database.sqlalchemy_uri,
+        )
+        with mock.patch.object(engine_manager, "_enabled", True):
+            engine = database.get_sqla_engine(pooled=True)
+            self.assertIs(other_database.get_sqla_engine(pooled=True), engine)
+            self.assertIsNot(other_database.get_sqla_engine(), engine)
+            self.assertEqual(database.get_df("SELECT 1 AS a")["a"].tolist(), [1])
+        engine_manager.dispose(database.id)
+
+    @mock.patch.object(engine_manager, "dispose")
+    def test_engines_disposed_on_change(self, dispose):
+        database = Database(
+            database_name="engines_disposed", sqlalchemy_uri="sqlite://"
+        )
+        metadata_db.session.add(database)
+        metadata_db.session.commit()
+        dispose.assert_not_called()
+
+        database.sqlalchemy_uri = "sqlite:///engines_disposed.db"
+        metadata_db.session.commit()
+        dispose.assert_called_once_with(database.id)
+
+        database_id = database.id
+        metadata_db.session.delete(database)
+        metadata_db.session.commit()
+        dispose.assert_called_with(database_id)
+
     @mock.patch("superset.models.core.create_engine")
     def test_impersonate_user_presto(self, mocked_create_engine):
         uri = "presto://localhost"
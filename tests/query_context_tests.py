@@ -15,8 +15,10 @@
 # specific language governing permissions and limitations
 # under the License.
 import re
+from unittest import mock
 
 import pytest
+from flask import g
 
 from superset import db
 from superset.charts.schemas import ChartDataQueryContextSchema
@@ -24,6 +26,7 @@ from superset.common.query_context import QueryContext
 from superset.common.query_object import QueryObject
 from superset.connectors.connector_registry import ConnectorRegistry
 from superset.extensions import cache_manager
+from superset.tasks.async_queries import load_chart_data_into_cache
 from superset.models.cache import CacheKey
 from superset.utils.core import (
     AdhocMetricExpressionType,
@@ -101,6 +104,56 @@ class TestQueryContext(SupersetTestCase):
         self.assertEqual(rehydrated_qc.result_format, query_context.result_format)
         self.assertFalse(rehydrated_qc.force)
 
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    @mock.patch.dict(
+        "superset.common.query_context.config", {"DATA_CACHE_STALE_TIMEOUT": 60}
+    )
+    @mock.patch("superset.tasks.async_queries.load_chart_data_into_cache.delay")
+    def test_stale_cache_refresh(self, mock_delay):
+        """
+        Ensure that stale cached data is served while being refreshed
+        """
+        self.login(username="admin")
+        payload = get_query_context("birth_names")
+        payload["force"] = True
+        query_context = ChartDataQueryContextSchema().load(payload)
+        cache_key = query_context.get_payload()["queries"][0]["cache_key"]
+        mock_delay.assert_not_called()
+
+        # the data is served from cache, and refreshed once past its cache timeout
+        del payload["force"]
+        query_context = ChartDataQueryContextSchema().load(payload)
+        response = query_context.get_payload()["queries"][0]
+        self.assertTrue(response["is_cached"])
+        mock_delay.assert_not_called()
+
+        g.user = self.get_user("admin")
+        refresh_key = f"{query_context.cache_key(user_id=g.user.id)}__refresh"
+        self.addCleanup(cache_manager.data_cache.delete, refresh_key)
+
+        def make_stale():
+            cache_value = cache_manager.data_cache.get(cache_key)
+            cache_manager.data_cache.set(cache_key, {**cache_value, "stale_after": 0})
+
+        make_stale()
+        for _ in range(2):
+            response = query_context.get_payload()["queries"][0]
+            self.assertTrue(response["is_cached"])
+        mock_delay.assert_called_once_with(
+            None,
+            {**query_context.cache_values, "force": True},
+            user_id=g.user.id,
+            refresh_key=refresh_key,
+        )
+
+        # another refresh is queued once the previous one completed
+        load_chart_data_into_cache(*mock_delay.call_args[0], **mock_delay.call_args[1])
+        self.assertIsNone(cache_manager.data_cache.get(refresh_key))
+        make_stale()
+        response = query_context.get_payload()["queries"][0]
+        self.assertTrue(response["is_cached"])
+        self.assertEqual(mock_delay.call_count, 2)
+
     def test_query_cache_key_changes_when_datasource_is_updated(self):
         self.login(username="admin")
         payload = get_query_context("birth_names")
@@ -234,6 +287,31 @@ class TestQueryContext(SupersetTestCase):
         self.assertIn("name,sum__num\n", data)
         self.assertEqual(len(data.split("\n")), 12)
 
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    @mock.patch.dict(
+        "superset.common.query_context.config", {"CHART_DATA_MAX_WORKERS": 2}
+    )
+    def test_parallel_queries(self):
+        """
+        Ensure that queries run concurrently return their results in order
+        """
+        self.login(username="admin")
+        payload = get_query_context("birth_names")
+        query = payload["queries"][0]
+        payload["queries"] = [
+            {**query, "row_limit": 5},
+            {**query, "row_limit": 3},
+            {**query, "row_limit": 4},
+        ]
+        query_context = ChartDataQueryContextSchema().load(payload)
+        responses = query_context.get_payload()
+        self.assertEqual(
+            [response["rowcount"] for response in responses["queries"]], [5, 3, 4]
+        )
+        self.assertEqual(
+            {response["status"] for response in responses["queries"]}, {"success"}
+        )
+
     def test_sql_injection_via_groupby(self):
         """
         Ensure that calling invalid columns names in groupby are caught
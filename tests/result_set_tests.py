@@ -17,6 +17,8 @@
 # isort:skip_file
 from datetime import datetime
 
+import pyarrow as pa
+
 import tests.test_app
 from superset.dataframe import df_to_records
 from superset.db_engine_specs import BaseEngineSpec
@@ -248,3 +250,62 @@ class TestSupersetResultSet(SupersetTestCase):
         ]
         results = SupersetResultSet(data, cursor_descr, BaseEngineSpec)
         self.assertEqual(results.columns, [])
+
+    def test_stringify_only_failing_columns(self):
+        data = [(1, 1, "a"), (2, "b", "c")]
+        cursor_descr = [("a",), ("b",), ("c",)]
+        results = SupersetResultSet(data, cursor_descr, BaseEngineSpec)
+        self.assertEqual(results.columns[0]["type"], "INT")
+        self.assertEqual(results.columns[1]["type"], "STRING")
+        self.assertEqual(results.columns[2]["type"], "STRING")
+        df = results.to_pandas_df()
+        self.assertEqual(
+            df_to_records(df),
+            [{"a": 1, "b": "1", "c": "a"}, {"a": 2, "b": '"b"', "c": "c"}],
+        )
+
+    def test_arrow_table_data(self):
+        data = pa.Table.from_arrays(
+            [pa.array([1, 2]), pa.array(["a", "b"])], names=["user_id", "username"]
+        )
+        cursor_descr = [
+            ("user_id", "INT", None, None, None, None, True),
+            ("user_id", "STRING", None, None, None, None, True),
+        ]
+        results = SupersetResultSet(data, cursor_descr, BaseEngineSpec)
+        self.assertEqual(
+            [col["name"] for col in results.columns], ["user_id", "user_id__1"]
+        )
+        df = results.to_pandas_df()
+        self.assertEqual(
+            df_to_records(df),
+            [{"user_id": 1, "user_id__1": "a"}, {"user_id": 2, "user_id__1": "b"}],
+        )
+
+    def test_arrow_record_batch_nested_types(self):
+        data = pa.RecordBatch.from_arrays(
+            [pa.array([1]), pa.array([[1, 2, 3]])], names=["id", "num_arr"]
+        )
+        results = SupersetResultSet(data, None, BaseEngineSpec)
+        self.assertEqual(results.columns[0]["type"], "INT")
+        self.assertEqual(results.columns[1]["type"], "STRING")
+        df = results.to_pandas_df()
+        self.assertEqual(df_to_records(df), [{"id": 1, "num_arr": "[1, 2, 3]"}])
+
+    def test_from_batches(self):
+        batches = [[(1, None), (2, None)], [(3.5, "a")], [(None, None)]]
+        cursor_descr = [("a",), ("b",)]
+        results = SupersetResultSet.from_batches(batches, cursor_descr, BaseEngineSpec)
+        self.assertEqual(results.size, 4)
+        self.assertEqual(results.columns[0]["type"], "FLOAT")
+        self.assertEqual(results.columns[1]["type"], "STRING")
+        self.assertEqual(
+            results.pa_table.to_pydict(),
+            {"a": [1.0, 2.0, 3.5, None], "b": [None, None, "a", None]},
+        )
+
+    def test_from_batches_empty(self):
+        cursor_descr = [("a", "int", None, None, None, None, True)]
+        results = SupersetResultSet.from_batches([], cursor_descr, BaseEngineSpec)
+        self.assertEqual(results.size, 0)
+        self.assertEqual(results.columns, [])
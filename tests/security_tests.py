@@ -19,11 +19,12 @@ import inspect
 import re
 import unittest
 
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, patch, PropertyMock
 from typing import Any, Dict
 
 import prison
 import pytest
+from sqlalchemy import event
 
 from flask import current_app, g
 
@@ -535,6 +536,46 @@ class TestRolePermission(SupersetTestCase):
         self.assertIsNotNone(vm)
         delete_schema_perm("[examples].[2]")
 
+    @patch("superset.security.manager.g")
+    def test_role_permissions_cache(self, mock_g):
+        mock_g.user = security_manager.find_user("gamma")
+        with self.client.application.test_request_context():
+            statements = []
+
+            def before_cursor_execute(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+            self.assertFalse(
+                security_manager.can_access("schema_access", "[examples].[2]")
+            )
+            self.assertFalse(
+                security_manager.can_access("schema_access", "[examples].[4]")
+            )
+            self.assertEqual(
+                security_manager.user_view_menu_names("schema_access"),
+                {"[examples].[temp_schema]"},
+            )
+            event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+            self.assertEqual(
+                len([statement for statement in statements if "ab_role" in statement]),
+                1,
+            )
+
+            # changing permissions invalidates the cached ones
+            create_schema_perm("[examples].[2]")
+            self.assertTrue(
+                security_manager.can_access("schema_access", "[examples].[2]")
+            )
+            self.assertEqual(
+                security_manager.user_view_menu_names("schema_access"),
+                {"[examples].[temp_schema]", "[examples].[2]"},
+            )
+            delete_schema_perm("[examples].[2]")
+            self.assertFalse(
+                security_manager.can_access("schema_access", "[examples].[2]")
+            )
+
     @pytest.mark.usefixtures("load_world_bank_dashboard_with_slices")
     def test_gamma_user_schema_access_to_dashboards(self):
         dash = db.session.query(Dashboard).filter_by(slug="world_health").first()
@@ -980,6 +1021,34 @@ class TestSecurityManager(SupersetTestCase):
         with self.assertRaises(SupersetSecurityException):
             security_manager.raise_for_access(query=query)
 
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    @patch("superset.security.SupersetSecurityManager.can_access")
+    def test_raise_for_access_query_datasources(self, mock_can_access):
+        database = get_example_database()
+        birth_names = (
+            db.session.query(SqlaTable).filter_by(table_name="birth_names").one()
+        )
+        mock_can_access.side_effect = lambda permission_name, view_name: (
+            permission_name == "datasource_access" and view_name == birth_names.perm
+        )
+
+        query = Mock(
+            database=database,
+            schema=None,
+            sql="SELECT * FROM birth_names b JOIN birth_names c ON b.name = c.name",
+        )
+        security_manager.raise_for_access(query=query)
+
+        query.sql = "SELECT * FROM birth_names JOIN foo.bar ON birth_names.ds = bar.ds"
+        with self.assertRaises(SupersetSecurityException) as context:
+            security_manager.raise_for_access(query=query)
+        self.assertIn("foo.bar", context.exception.message)
+        self.assertNotIn("birth_names", context.exception.message)
+
+        query.sql = "SELECT * FROM other_schema.birth_names"
+        with self.assertRaises(SupersetSecurityException):
+            security_manager.raise_for_access(query=query)
+
     @patch("superset.security.SupersetSecurityManager.can_access")
     @patch("superset.security.SupersetSecurityManager.can_access_schema")
     def test_raise_for_access_query_context(
@@ -1191,3 +1260,32 @@ class TestRowLevelSecurity(SupersetTestCase):
         assert not self.NAMES_B_REGEX.search(sql)
         assert not self.NAMES_Q_REGEX.search(sql)
         assert not self.BASE_FILTER_REGEX.search(sql)
+
+    @pytest.mark.usefixtures("load_energy_table_with_slice")
+    def test_get_rls_filters_by_table(self):
+        g.user = self.get_user(username="gamma")
+        energy_usage = self.get_table_by_name("energy_usage")
+        birth_names = self.get_table_by_name("birth_names")
+        filters = security_manager.get_rls_filters_by_table([energy_usage, birth_names])
+        assert [f.id for f in filters[energy_usage.id]] == [self.rls_entry1.id]
+        assert {f.id for f in filters[birth_names.id]} == {
+            self.rls_entry2.id,
+            self.rls_entry3.id,
+            self.rls_entry4.id,
+        }
+
+        # filters are cached until they change
+        with patch(
+            "superset.security.SupersetSecurityManager.get_session",
+            new_callable=PropertyMock,
+        ) as get_session:
+            assert security_manager.get_rls_filters(energy_usage) == (
+                filters[energy_usage.id]
+            )
+            get_session.assert_not_called()
+
+        self.rls_entry1.clause = "value > 2"
+        db.session.commit()
+        assert [f.clause for f in security_manager.get_rls_filters(energy_usage)] == [
+            "value > 2"
+        ]
@@ -15,9 +15,11 @@
 # specific language governing permissions and limitations
 # under the License.
 import unittest
+from unittest import mock
 
 import sqlparse
 
+from superset import sql_parse
 from superset.sql_parse import ParsedQuery, strip_comments_from_sql, Table
 
 
@@ -755,3 +757,77 @@ class TestSupersetSqlParse(unittest.TestCase):
             strip_comments_from_sql("SELECT '--abc' as abc, col2 FROM table1\n")
             == "SELECT '--abc' as abc, col2 FROM table1"
         )
+
+    def test_parse_cache(self):
+        """Test that the parse results of the same SQL text are shared"""
+        sql_parse._parse.cache.clear()
+        sql = "SELECT * FROM birth_names LIMIT 1555"
+        parsed = ParsedQuery(sql)
+        self.assertEqual(parsed.tables, {Table("birth_names")})
+        misses = sql_parse._parse.misses
+
+        other = ParsedQuery(sql + ";\n")
+        self.assertEqual(other.tables, {Table("birth_names")})
+        self.assertEqual(other.limit, 1555)
+        self.assertTrue(other.is_select())
+        self.assertEqual(sql_parse._parse.misses, misses)
+        self.assertEqual(len(sql_parse._parse.cache), 1)
+
+        # the token trees are not shared as setting the limit modifies them
+        self.assertEqual(
+            parsed.set_or_update_query_limit(1000),
+            "SELECT * FROM birth_names LIMIT 1000",
+        )
+        self.assertEqual(
+            other.set_or_update_query_limit(2000),
+            "SELECT * FROM birth_names LIMIT 1555",
+        )
+        parsed.tables.add(Table("other"))
+        self.assertEqual(ParsedQuery(sql).tables, {Table("birth_names")})
+
+    def test_limit_fast_path(self):
+        """Test that the LIMIT clause found by tokens matches the parsed one"""
+        queries = [
+            "SELECT * FROM birth_names",
+            "SELECT * FROM birth_names LIMIT 555",
+            "select * from birth_names limit 1555",
+            "SELECT * FROM birth_names LIMIT 555;",
+            "SELECT * FROM birth_names LIMIT 99990 OFFSET 5",
+            "SELECT * FROM birth_names LIMIT 5, 99990",
+            "SELECT * FROM birth_names LIMIT 5 , 10",
+            "SELECT * FROM birth_names LIMIT /* a comment */ 2000",
+            "SELECT * FROM birth_names LIMIT 2000 -- a comment",
+            "SELECT * FROM birth_names -- a comment with LIMIT 555",
+            "SELECT 'LIMIT 555' AS c FROM birth_names",
+            "SELECT * FROM (SELECT * FROM birth_names LIMIT 10) AS a",
+            "SELECT * FROM (SELECT * FROM birth_names LIMIT 10) AS a LIMIT 2000",
+            "SELECT * FROM birth_names WHERE name = 'x' ORDER BY num DESC LIMIT 2000",
+            "SELECT * FROM birth_names LIMIT 10.5",
+            "SELECT * FROM birth_names LIMIT ALL",
+            "SELECT * FROM birth_names LIMIT 0",
+            "SELECT * FROM birth_names LIMIT 10 UNION SELECT * FROM t LIMIT 2000",
+            "SELECT * FROM birth_names LIMIT 10; SELECT * FROM t LIMIT 2000",
+            "SELECT * FROM birth_names WHERE (a = 1 LIMIT 2000",
+            """
+            WITH cte AS (SELECT * FROM birth_names LIMIT 5)
+            SELECT gender, COUNT(*)
+            FROM cte
+            GROUP BY gender
+            LIMIT 3000
+            """,
+        ]
+        for sql in queries:
+            with mock.patch("superset.sql_parse._scan_limit_clause", return_value=None):
+                expected_limit = ParsedQuery(sql).limit
+                expected_sql = ParsedQuery(sql).set_or_update_query_limit(1000)
+            self.assertEqual(ParsedQuery(sql).limit, expected_limit, sql)
+            self.assertEqual(
+                ParsedQuery(sql).set_or_update_query_limit(1000), expected_sql, sql
+            )
+
+        self.assertEqual(
+            sql_parse._scan_limit_clause("SELECT * FROM t LIMIT 5, 10"),
+            sql_parse.LimitClause(limit=10, offset="5", start=22, end=27),
+        )
+        self.assertIsNone(sql_parse._scan_limit_clause("SELECT 1; SELECT 2 LIMIT 5"))
+        self.assertIsNone(sql_parse._scan_limit_clause("SELECT * FROM t LIMIT x"))
@@ -515,6 +515,16 @@ class TestSqlLab(SupersetTestCase):
         )
         self.assertEqual(len(data["data"]), test_limit)
 
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    @mock.patch("superset.sql_lab.SQLLAB_FETCH_BATCH_SIZE", 3)
+    def test_sql_limit_fetch_in_batches(self):
+        self.login("admin")
+        data = self.run_sql(
+            "SELECT * FROM birth_names", client_id="sql_limit_batch_1", query_limit=10
+        )
+        self.assertEqual(len(data["data"]), 10)
+        self.assertEqual(data["query"]["rows"], 10)
+
     def test_query_api_filter(self) -> None:
         """
         Test query api without can_only_access_owned_queries perm added to
@@ -30,13 +30,17 @@ from superset.models.slice import Slice
 from superset.utils.core import get_example_database
 
 from superset import db
+from superset.extensions import cache_manager
 
+from superset.models.cache import CacheKey
 from superset.models.core import Log
 from superset.models.tags import get_tag, ObjectTypes, TaggedObject, TagTypes
 from superset.tasks.cache import (
     DashboardTagsStrategy,
     get_form_data,
+    HotCacheKeysStrategy,
     TopNDashboardsStrategy,
+    warm_up_charts,
 )
 
 from .base_tests import SupersetTestCase
@@ -199,6 +203,79 @@ class TestCacheWarmUp(SupersetTestCase):
         expected = sorted([f"{URL_PREFIX}{slc.url}" for slc in dash.slices])
         self.assertEqual(result, expected)
 
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_warm_up_charts(self):
+        dash = self.get_dash_by_slug("births")
+        charts = [slc for slc in dash.slices if slc.viz_type == "table"]
+        self.assertGreater(len(charts), 1)
+        payloads = [
+            {"chart_id": slc.id, "form_data": {"slice_id": slc.id}} for slc in charts
+        ]
+        payloads.append({"chart_id": 0, "form_data": {"slice_id": 0}})
+        cache_manager.data_cache.clear()
+
+        results = warm_up_charts(payloads, 2, 2)
+        self.assertEqual(
+            [result["chart_id"] for result in results],
+            [payload["chart_id"] for payload in payloads],
+        )
+        for result in results[:-1]:
+            self.assertIsNone(result["error"])
+            self.assertFalse(result["skipped"])
+            self.assertGreater(result["duration"], 0)
+        self.assertEqual(results[-1]["error"], "Chart 0 not found")
+
+        results = warm_up_charts(payloads, 2, 1)
+        for result in results[:-1]:
+            self.assertIsNone(result["error"])
+            self.assertTrue(result["skipped"])
+
+    @pytest.mark.usefixtures(
+        "load_unicode_dashboard_with_slice", "load_birth_names_dashboard_with_slices"
+    )
+    def test_hot_cache_keys_strategy(self):
+        db.session.query(Log).delete()
+        db.session.query(CacheKey).delete()
+        slc1, slc2 = self.get_dash_by_slug("births").slices[:2]
+        slc3 = self.get_dash_by_slug("unicode-test").slices[0]
+        now = datetime.datetime.utcnow()
+
+        def log(slc, filters, hours_ago, duration_ms):
+            form_data = {"slice_id": slc.id, "adhoc_filters": filters}
+            db.session.add(
+                Log(
+                    action="explore_json",
+                    slice_id=slc.id,
+                    json=json.dumps({"form_data": form_data}),
+                    dttm=now - datetime.timedelta(hours=hours_ago),
+                    duration_ms=duration_ms,
+                )
+            )
+            return {"chart_id": slc.id, "form_data": form_data}
+
+        recent = log(slc1, ["a"], 1, 1000)
+        log(slc1, ["a"], 2, 1000)
+        old = log(slc1, ["b"], 24 * 5, 1000)
+        for _ in range(3):
+            log(slc1, ["b"], 24 * 6, 1000)
+        slow = log(slc2, [], 1, 5000)
+        # 1 out of the 21 requests on the datasource missed the cache
+        cached = log(slc3, [], 1, 3000)
+        for _ in range(20):
+            log(slc3, [], 1, 3000)
+        db.session.add(CacheKey(cache_key="key", datasource_uid=slc3.datasource.uid))
+        db.session.add(Log(action="explore_json", slice_id=slc1.id, json="{}"))
+        db.session.commit()
+
+        strategy = HotCacheKeysStrategy(since="7 days ago")
+        self.assertEqual(strategy.get_payloads(), [slow, cached, recent, old])
+        strategy = HotCacheKeysStrategy(since="7 days ago", budget=2)
+        self.assertEqual(strategy.get_payloads(), [slow, cached])
+
+        db.session.query(Log).delete()
+        db.session.query(CacheKey).delete()
+        db.session.commit()
+
     def reset_tag(self, tag):
         """Remove associated object from tag, used to reset tests"""
         if tag.objects:
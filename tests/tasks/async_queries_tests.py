@@ -20,13 +20,18 @@ from unittest import mock
 from uuid import uuid4
 
 import pytest
+from flask import g
 
 from superset import db
 from superset.charts.commands.data import ChartDataCommand
 from superset.charts.commands.exceptions import ChartDataQueryFailedError
 from superset.connectors.sqla.models import SqlaTable
 from superset.exceptions import SupersetException
-from superset.extensions import async_query_manager
+from superset.extensions import (
+    async_query_manager,
+    cache_manager,
+    security_manager,
+)
 from superset.tasks.async_queries import (
     load_chart_data_into_cache,
     load_explore_json_into_cache,
@@ -60,6 +65,31 @@ class TestAsyncQueries(SupersetTestCase):
 
         mock_update_job.assert_called_with(job_metadata, "done", result_url=mock.ANY)
 
+    @mock.patch.object(ChartDataCommand, "run")
+    @mock.patch.object(async_query_manager, "update_job")
+    def test_load_chart_data_into_cache_refresh(
+        self, mock_update_job, mock_run_command
+    ):
+        query_context = get_query_context("birth_names")
+
+        load_chart_data_into_cache(None, query_context)
+
+        mock_run_command.assert_called_with()
+        mock_update_job.assert_not_called()
+
+        # the refresh runs as the user whose cached data is stale
+        admin = security_manager.find_user("admin")
+        mock_run_command.side_effect = lambda: self.assertEqual(g.user.id, admin.id)
+        load_chart_data_into_cache(None, query_context, user_id=admin.id)
+        mock_run_command.assert_called_with()
+
+        # the refresh key is deleted once done, even when the refresh failed
+        mock_run_command.side_effect = ChartDataQueryFailedError("Error: foo")
+        cache_manager.data_cache.set("refresh_key", True)
+        with pytest.raises(ChartDataQueryFailedError):
+            load_chart_data_into_cache(None, query_context, refresh_key="refresh_key")
+        self.assertIsNone(cache_manager.data_cache.get("refresh_key"))
+
     @mock.patch.object(
         ChartDataCommand, "run", side_effect=ChartDataQueryFailedError("Error: foo")
     )
@@ -0,0 +1,104 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import pandas as pd
+import pyarrow as pa
+import pytest
+from cachelib import SimpleCache
+
+from superset.exceptions import SerializationError
+from superset.utils import arrow_ipc
+
+
+@pytest.fixture
+def table():
+    return pa.Table.from_arrays(
+        [pa.array(range(25)), pa.array([f"name_{i}" for i in range(25)])],
+        names=["id", "name"],
+    )
+
+
+@pytest.mark.parametrize("compression", [None, "zstd", "lz4"])
+def test_serialize_table(table, compression):
+    blob = arrow_ipc.serialize_table(table, compression)
+    assert arrow_ipc.deserialize_table(blob).equals(table)
+    assert arrow_ipc.deserialize_table(blob, ["name"]).column_names == ["name"]
+
+
+def test_deserialize_table_invalid():
+    with pytest.raises(SerializationError):
+        arrow_ipc.deserialize_table(b"not arrow")
+
+
+def test_write_and_read_table(table):
+    cache = SimpleCache()
+    chunk_rows = arrow_ipc.write_table(cache, "key", table, 10, "zstd")
+    assert chunk_rows == [10, 10, 5]
+    assert arrow_ipc.read_table(cache, "key", chunk_rows).equals(table)
+
+    page = arrow_ipc.read_table(cache, "key", chunk_rows, offset=8, limit=5)
+    assert page.column("id").to_pylist() == [8, 9, 10, 11, 12]
+
+    page = arrow_ipc.read_table(
+        cache, "key", chunk_rows, offset=20, limit=10, columns=["name"]
+    )
+    assert page.to_pydict() == {"name": [f"name_{i}" for i in range(20, 25)]}
+
+    page = arrow_ipc.read_table(cache, "key", chunk_rows, offset=30, limit=10)
+    assert page.num_rows == 0
+    assert page.schema == table.schema
+
+
+def test_write_and_read_empty_table(table):
+    cache = SimpleCache()
+    empty_table = table.slice(0, 0)
+    chunk_rows = arrow_ipc.write_table(cache, "key", empty_table, 10)
+    assert chunk_rows == [0]
+    assert arrow_ipc.read_table(cache, "key", chunk_rows).equals(empty_table)
+
+
+def test_read_table_missing_chunk(table):
+    cache = SimpleCache()
+    chunk_rows = arrow_ipc.write_table(cache, "key", table, 10)
+    cache.delete(arrow_ipc.chunk_key("key", 1))
+    with pytest.raises(SerializationError):
+        arrow_ipc.read_table(cache, "key", chunk_rows)
+
+
+def test_serialize_dataframe():
+    df = pd.DataFrame(
+        {
+            "__timestamp": pd.to_datetime(["2021-01-01", "2021-01-02", None]),
+            "name": ["a", None, "c"],
+            "count": [1, 2, 3],
+            "ratio": [0.5, None, 1.5],
+        },
+        index=pd.Index(["x", "y", "z"], name="key"),
+    )
+    blob = arrow_ipc.serialize_dataframe(df, "zstd")
+    pd.testing.assert_frame_equal(arrow_ipc.deserialize_dataframe(blob), df)
+
+
+def test_serialize_dataframe_integer_nulls():
+    df = pd.DataFrame({"id": pd.Series([1, None, 12345678901234567], dtype=object)})
+    blob = arrow_ipc.serialize_dataframe(df)
+    result = arrow_ipc.deserialize_dataframe(blob)
+    assert result["id"].tolist() == [1, None, 12345678901234567]
+
+
+def test_serialize_dataframe_nested():
+    with pytest.raises(ValueError):
+        arrow_ipc.serialize_dataframe(pd.DataFrame({"a": [[1, 2], [3]]}))
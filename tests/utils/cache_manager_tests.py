@@ -0,0 +1,89 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import time
+from unittest import mock
+
+import pandas as pd
+from cachelib import SimpleCache
+
+from superset.utils.cache_manager import TwoTierCache
+
+
+def test_two_tier_cache_get():
+    remote_cache = SimpleCache()
+    remote_cache.set("key", {"df": pd.DataFrame({"a": [1, 2]}), "query": "SELECT"})
+    cache = TwoTierCache(remote_cache, max_bytes=10 ** 6, local_timeout=60)
+
+    with mock.patch.object(remote_cache, "get", wraps=remote_cache.get) as get:
+        value = cache.get("key")
+        value["df"]["a"] = 0
+        value = cache.get("key")
+    get.assert_called_once_with("key")
+    assert value["df"]["a"].tolist() == [1, 2]
+    assert value["query"] == "SELECT"
+    assert cache.get("missing") is None
+
+
+def test_two_tier_cache_set_and_delete():
+    remote_cache = SimpleCache()
+    cache = TwoTierCache(remote_cache, max_bytes=10 ** 6, local_timeout=60)
+    df = pd.DataFrame({"a": [1, 2]})
+
+    cache.set("key", {"df": df})
+    df["a"] = 0
+    remote_cache.delete("key")
+    assert cache.get("key")["df"]["a"].tolist() == [1, 2]
+
+    cache.delete("key")
+    assert cache.get("key") is None
+
+
+def test_two_tier_cache_eviction():
+    remote_cache = SimpleCache()
+    cache = TwoTierCache(remote_cache, max_bytes=4000, local_timeout=60)
+
+    for key in ("a", "b", "c"):
+        cache.set(key, "x" * 1500)
+    with mock.patch.object(remote_cache, "get", return_value=None):
+        assert cache.get("a") is None
+        assert cache.get("b") == "x" * 1500
+        assert cache.get("c") == "x" * 1500
+
+    # values larger than the cache are only kept in the remote cache
+    cache.set("d", "x" * 5000)
+    assert cache.get("d") == "x" * 5000
+    assert cache.get("b") == "x" * 1500
+
+
+def test_two_tier_cache_timeout():
+    remote_cache = SimpleCache()
+    cache = TwoTierCache(remote_cache, max_bytes=10 ** 6, local_timeout=60)
+
+    cache.set("key", "value", timeout=10)
+    remote_cache.set("key", "new value")
+    later = time.monotonic() + 30
+    with mock.patch("superset.utils.cache_manager.time.monotonic", return_value=later):
+        assert cache.get("key") == "new value"
+
+
+def test_two_tier_cache_add():
+    remote_cache = SimpleCache()
+    cache = TwoTierCache(remote_cache, max_bytes=10 ** 6, local_timeout=60)
+
+    assert cache.add("lock", True)
+    assert not cache.add("lock", True)
+    assert remote_cache.get("lock") is True
@@ -0,0 +1,112 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from unittest import mock
+
+import pytest
+from flask import Flask
+from sqlalchemy import create_engine
+from sqlalchemy.engine.url import make_url
+
+from superset.utils.engine_manager import EngineManager
+
+
+@pytest.fixture
+def engine_manager():
+    app = Flask(__name__)
+    app.config.update(
+        DB_ENGINE_POOLING=True,
+        DB_ENGINE_POOL_SIZE=3,
+        DB_ENGINE_MAX_OVERFLOW=4,
+        DB_ENGINE_IDLE_TIMEOUT=60,
+        DB_ENGINE_MAX_ENGINES_PER_DATABASE=2,
+    )
+    manager = EngineManager()
+    manager.init_app(app)
+    yield manager
+    manager.dispose_all()
+
+
+def test_get_engine(engine_manager):
+    url = make_url("sqlite:///")
+    engine = engine_manager.get_engine(1, url, {})
+    assert engine_manager.get_engine(1, url, {}) is engine
+    assert engine_manager.get_engine(2, url, {}) is not engine
+    assert engine_manager.get_engine(1, url, {"echo": True}) is not engine
+    assert engine_manager.get_engine(1, make_url("sqlite:///a.db"), {}) is not engine
+
+
+@mock.patch("superset.utils.engine_manager.create_engine")
+def test_get_engine_pool_params(create_engine, engine_manager):
+    url = make_url("mysql://user@localhost/db")
+    engine_manager.get_engine(1, url, {})
+    create_engine.assert_called_with(
+        url, pool_pre_ping=True, pool_size=3, max_overflow=4
+    )
+
+    # parameters set for the database take precedence
+    engine_manager.get_engine(1, url, {"pool_size": 20})
+    create_engine.assert_called_with(
+        url, pool_pre_ping=True, pool_size=20, max_overflow=4
+    )
+
+    # the pool arguments are only given to pools accepting them
+    url = make_url("sqlite:///a.db")
+    engine_manager.get_engine(1, url, {})
+    create_engine.assert_called_with(url, pool_pre_ping=True)
+
+
+def test_evict_excess_engines(engine_manager):
+    engines = [
+        engine_manager.get_engine(1, make_url(f"sqlite:///{name}.db"), {})
+        for name in ("a", "b")
+    ]
+    engine_manager.get_engine(1, make_url("sqlite:///a.db"), {})
+    with mock.patch.object(engines[1], "dispose") as dispose:
+        engine_manager.get_engine(1, make_url("sqlite:///c.db"), {})
+    dispose.assert_called_once_with()
+    assert engine_manager.get_engine(1, make_url("sqlite:///a.db"), {}) is engines[0]
+
+
+def test_evict_idle_engines(engine_manager):
+    url = make_url("sqlite:///")
+    engine = engine_manager.get_engine(1, url, {})
+    with mock.patch(
+        "superset.utils.engine_manager.time.monotonic", return_value=10 ** 9
+    ):
+        assert engine_manager.get_engine(1, url, {}) is not engine
+
+
+def test_dispose(engine_manager):
+    url = make_url("sqlite:///")
+    engine = engine_manager.get_engine(1, url, {})
+    other_engine = engine_manager.get_engine(2, url, {})
+    engine_manager.dispose(1)
+    assert engine_manager.get_engine(1, url, {}) is not engine
+    assert engine_manager.get_engine(2, url, {}) is other_engine
+
+
+def test_release(engine_manager):
+    url = make_url("sqlite:///")
+    engine = engine_manager.get_engine(1, url, {})
+    with mock.patch.object(engine, "dispose") as dispose:
+        engine_manager.release(engine)
+    dispose.assert_not_called()
+
+    engine = create_engine("sqlite:///")
+    with mock.patch.object(engine, "dispose") as dispose:
+        engine_manager.release(engine)
+    dispose.assert_called_once_with()
@@ -0,0 +1,159 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from datetime import datetime, timedelta
+from unittest import mock
+
+from superset import db
+from superset.db_engine_specs.base import BaseEngineSpec
+from superset.models.table_listing import SchemaListing, TableListing
+from superset.utils import table_listing
+from superset.utils.core import DatasourceName, get_example_database
+from tests.base_tests import SupersetTestCase
+
+
+@mock.patch.object(BaseEngineSpec, "get_view_names", return_value=["v_ab"])
+@mock.patch.object(BaseEngineSpec, "get_table_names", return_value=["ab", "cd"])
+class TableListingTests(SupersetTestCase):
+    def setUp(self):
+        self.database = get_example_database()
+        patcher = mock.patch(
+            "superset.models.core.Database.db_engine_spec",
+            new_callable=mock.PropertyMock,
+            return_value=BaseEngineSpec,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        db.session.query(TableListing).delete()
+        db.session.query(SchemaListing).delete()
+        db.session.commit()
+
+    def get_stored_names(self, schema):
+        return sorted(
+            name
+            for name, in db.session.query(TableListing.name)
+            .join(SchemaListing)
+            .filter(SchemaListing.schema == schema)
+        )
+
+    def test_refresh_schema(self, get_table_names, get_view_names):
+        listing = table_listing.refresh_schema(self.database, "s1")
+        assert listing.database_id == self.database.id
+        assert self.get_stored_names("s1") == ["ab", "cd", "v_ab"]
+
+        # the listing didn't expire
+        get_table_names.return_value = ["ab", "ef"]
+        table_listing.refresh_schema(self.database, "s1")
+        assert self.get_stored_names("s1") == ["ab", "cd", "v_ab"]
+
+        # only the changes are stored
+        ab_id = db.session.query(TableListing.id).filter_by(name="ab").scalar()
+        table_listing.refresh_schema(self.database, "s1", force=True)
+        assert self.get_stored_names("s1") == ["ab", "ef", "v_ab"]
+        assert db.session.query(TableListing.id).filter_by(name="ab").scalar() == (
+            ab_id
+        )
+
+    def test_refresh_schema_expired(self, get_table_names, get_view_names):
+        listing = table_listing.refresh_schema(self.database, "s1")
+        listing.refreshed_on = datetime.now() - timedelta(
+            seconds=table_listing.get_listing_timeout(self.database) + 1
+        )
+        db.session.commit()
+
+        get_table_names.return_value = ["ef"]
+        table_listing.refresh_schema(self.database, "s1")
+        assert self.get_stored_names("s1") == ["ef", "v_ab"]
+        assert listing.refreshed_on > datetime.now() - timedelta(seconds=10)
+
+    @mock.patch.object(BaseEngineSpec, "get_schema_change_marker")
+    def test_refresh_schema_unchanged(
+        self, get_schema_change_marker, get_table_names, get_view_names
+    ):
+        get_schema_change_marker.return_value = "2:2021-03-29"
+        listing = table_listing.refresh_schema(self.database, "s1")
+        assert listing.change_marker == "2:2021-03-29"
+        listing.refreshed_on = datetime.now() - timedelta(
+            seconds=table_listing.get_listing_timeout(self.database) + 1
+        )
+        db.session.commit()
+
+        get_table_names.reset_mock()
+        table_listing.refresh_schema(self.database, "s1")
+        get_table_names.assert_not_called()
+        assert listing.refreshed_on > datetime.now() - timedelta(seconds=10)
+
+        get_schema_change_marker.return_value = "3:2021-03-30"
+        get_table_names.return_value = ["ab", "cd", "ef"]
+        table_listing.refresh_schema(self.database, "s1", force=True)
+        assert self.get_stored_names("s1") == ["ab", "cd", "ef", "v_ab"]
+        assert listing.change_marker == "3:2021-03-30"
+
+    def test_refresh_schema_error(self, get_table_names, get_view_names):
+        get_table_names.side_effect = Exception("Unable to list tables")
+        assert table_listing.refresh_schema(self.database, "s1") is None
+
+        get_table_names.side_effect = None
+        listing = table_listing.refresh_schema(self.database, "s1")
+
+        # the previous listing is kept
+        get_table_names.side_effect = Exception("Unable to list tables")
+        assert table_listing.refresh_schema(self.database, "s1", force=True) is listing
+        assert self.get_stored_names("s1") == ["ab", "cd", "v_ab"]
+
+    def test_get_datasource_names(self, get_table_names, get_view_names):
+        tables, views = table_listing.get_datasource_names(self.database, "s1")
+        assert tables == [
+            DatasourceName(table="ab", schema="s1"),
+            DatasourceName(table="cd", schema="s1"),
+        ]
+        assert views == [DatasourceName(table="v_ab", schema="s1")]
+
+    def set_allow_multi_schema_metadata_fetch(self, value):
+        self.database.allow_multi_schema_metadata_fetch = value
+        db.session.commit()
+
+    def test_get_datasource_names_all_schemas(self, get_table_names, get_view_names):
+        self.addCleanup(
+            self.set_allow_multi_schema_metadata_fetch,
+            self.database.allow_multi_schema_metadata_fetch,
+        )
+        self.set_allow_multi_schema_metadata_fetch(True)
+        with mock.patch.object(
+            self.database, "get_all_schema_names", return_value=["s1", "s2"]
+        ):
+            tables, views = table_listing.get_datasource_names(self.database, None)
+        assert tables == [
+            DatasourceName(table="ab", schema="s1"),
+            DatasourceName(table="cd", schema="s1"),
+            DatasourceName(table="ab", schema="s2"),
+            DatasourceName(table="cd", schema="s2"),
+        ]
+        assert views == [
+            DatasourceName(table="v_ab", schema="s1"),
+            DatasourceName(table="v_ab", schema="s2"),
+        ]
+
+        tables, views = table_listing.get_datasource_names(
+            self.database, None, schemas=["s1"]
+        )
+        assert [table.schema for table in tables + views] == ["s1", "s1", "s1"]
+
+        # nothing is listed across schemas unless the database allows it
+        self.set_allow_multi_schema_metadata_fetch(False)
+        assert table_listing.get_datasource_names(self.database, None) == ([], [])
@@ -0,0 +1,101 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from unittest import mock
+
+from superset.utils.core import DatasourceName
+from superset.utils.table_search import TableSearchIndex, TableSearchIndexCache
+
+
+def get_labels(entries):
+    return [entry.label for entry in entries]
+
+
+def test_table_search_index_search():
+    tables = [
+        DatasourceName(table=name, schema="main")
+        for name in ["fact_orders", "orders", "orders_2020", "customers", "ab"]
+    ]
+    views = [DatasourceName(table="v_orders", schema="main")]
+    index = TableSearchIndex(tables, views)
+
+    assert len(index) == 6
+    assert get_labels(index.search(None)) == [
+        "ab",
+        "customers",
+        "fact_orders",
+        "orders",
+        "orders_2020",
+        "v_orders",
+    ]
+    # exact match, prefixes, then word starts
+    assert get_labels(index.search("Orders")) == [
+        "orders",
+        "orders_2020",
+        "fact_orders",
+        "v_orders",
+    ]
+    assert get_labels(index.search("rder")) == [
+        "fact_orders",
+        "orders",
+        "orders_2020",
+        "v_orders",
+    ]
+    assert get_labels(index.search("orders", offset=1, limit=2)) == [
+        "orders_2020",
+        "fact_orders",
+    ]
+    # queries shorter than a trigram
+    assert get_labels(index.search("b")) == ["ab"]
+    assert index.search("missing") == []
+    assert [entry.type for entry in index.search("v_")] == ["view"]
+
+
+def test_table_search_index_qualified():
+    tables = [
+        DatasourceName(table="orders", schema="sales"),
+        DatasourceName(table="sales", schema="main"),
+    ]
+    index = TableSearchIndex(tables, [], qualified=True)
+    assert get_labels(index.search("sales")) == ["sales.orders", "main.sales"]
+    assert index.search("sales.orders")[0].datasource_name == tables[0]
+
+
+def test_table_search_index_cache():
+    cache = TableSearchIndexCache(max_size=2)
+    load = mock.Mock(return_value=([DatasourceName("ab", "main")], []))
+
+    index = cache.get((1, "main"), load, timeout=60)
+    assert cache.get((1, "main"), load, timeout=60) is index
+    assert load.call_count == 1
+
+    assert cache.get((1, "main"), load, timeout=60, force=True) is not index
+    assert load.call_count == 2
+
+    # expired
+    cache.get((1, "other"), load, timeout=-1)
+    cache.get((1, "other"), load, timeout=60)
+    assert load.call_count == 4
+
+    # least recently used
+    cache.get((2, "main"), load, timeout=60)
+    cache.get((1, "other"), load, timeout=60)
+    cache.get((1, "main"), load, timeout=60)
+    assert load.call_count == 6
+
+    cache.invalidate(1)
+    cache.get((1, "other"), load, timeout=60)
+    assert load.call_count == 7
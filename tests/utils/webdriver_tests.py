@@ -0,0 +1,113 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from unittest import mock
+
+import pytest
+from celery.signals import worker_process_shutdown
+from flask import Flask
+from selenium.common.exceptions import WebDriverException
+
+from superset.utils.webdriver import PageRendered, webdriver_pool, WebDriverPool
+
+
+@pytest.fixture
+def app_context():
+    app = Flask(__name__)
+    app.config.update(
+        WEBDRIVER_POOL_SIZE=2, WEBDRIVER_POOL_MAX_USES=3, WEBDRIVER_POOL_MAX_IDLE=60,
+    )
+    with app.app_context():
+        yield app
+
+
+def use(pool, key):
+    with pool.driver(key, mock.MagicMock) as driver:
+        return driver
+
+
+def test_webdriver_pool_reuse(app_context):
+    pool = WebDriverPool()
+    driver = use(pool, "admin")
+    assert use(pool, "admin") is driver
+    assert use(pool, "gamma") is not driver
+    assert use(pool, "admin") is driver
+
+    # recycled after 3 uses
+    assert use(pool, "admin") is not driver
+    driver.quit.assert_called_once()
+
+
+def test_webdriver_pool_size(app_context):
+    pool = WebDriverPool()
+    drivers = [use(pool, key) for key in ("a", "b", "c")]
+    drivers[0].quit.assert_called_once()
+    assert use(pool, "b") is drivers[1]
+    assert use(pool, "c") is drivers[2]
+
+    pool.clear()
+    drivers[1].quit.assert_called_once()
+    drivers[2].quit.assert_called_once()
+
+
+def test_webdriver_pool_health_check(app_context):
+    pool = WebDriverPool()
+    driver = use(pool, "admin")
+    type(driver).current_url = mock.PropertyMock(side_effect=WebDriverException())
+    assert use(pool, "admin") is not driver
+    driver.quit.assert_called_once()
+
+
+def test_webdriver_pool_max_idle(app_context):
+    pool = WebDriverPool()
+    with mock.patch("superset.utils.webdriver.time.monotonic", return_value=0):
+        driver = use(pool, "admin")
+    with mock.patch("superset.utils.webdriver.time.monotonic", return_value=60):
+        assert use(pool, "admin") is not driver
+    driver.quit.assert_called_once()
+
+
+def test_webdriver_pool_error(app_context):
+    pool = WebDriverPool()
+    with pytest.raises(WebDriverException):
+        with pool.driver("admin", mock.MagicMock) as driver:
+            raise WebDriverException()
+    driver.quit.assert_called_once()
+    assert use(pool, "admin") is not driver
+
+
+@mock.patch("superset.utils.webdriver.time.monotonic")
+def test_page_rendered(monotonic):
+    driver = mock.MagicMock()
+    driver.execute_script.return_value = "complete"
+    condition = PageRendered(1)
+
+    driver.find_elements.return_value = ["loading"]
+    monotonic.return_value = 0
+    assert not condition(driver)
+    driver.find_elements.return_value = []
+    monotonic.return_value = 1
+    assert not condition(driver)
+    monotonic.return_value = 1.5
+    assert not condition(driver)
+    monotonic.return_value = 2
+    assert condition(driver)
+
+
+def test_webdriver_pool_worker_shutdown():
+    with mock.patch.object(webdriver_pool, "clear") as clear:
+        worker_process_shutdown.send(sender=None, pid=1, exitcode=0)
+    clear.assert_called_once()
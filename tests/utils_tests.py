@@ -23,6 +23,8 @@ import hashlib
 import json
 import os
 import re
+import threading
+from timeit import default_timer
 from typing import Any, Tuple, List, Optional
 from unittest.mock import Mock, patch
 from tests.fixtures.birth_names_dashboard import load_birth_names_dashboard_with_slices
@@ -61,7 +63,9 @@ from superset.utils.core import (
     merge_extra_form_data,
     merge_request_params,
     normalize_dttm_col,
+    parallel_map,
     parse_ssl_cert,
+    RateLimiter,
     parse_js_uri_path_item,
     extract_dataframe_dtypes,
     split,
@@ -609,6 +613,38 @@ class TestUtils(SupersetTestCase):
         instance.num = 10
         self.assertEqual(result2, instance.test_method(1, 2, 3))
 
+    def test_memoized_max_size(self):
+        evicted = []
+
+        @memoized(max_size=2, on_evict=evicted.append)
+        def test_function(a):
+            return [a]
+
+        first = test_function(1)
+        test_function(2)
+        self.assertIs(test_function(1), first)
+        test_function(3)
+        self.assertEqual(evicted, [[2]])
+        self.assertIs(test_function(1), first)
+        self.assertEqual(
+            (test_function.hits, test_function.misses, test_function.evictions),
+            (2, 3, 1),
+        )
+
+    def test_memoized_max_age(self):
+        evicted = []
+
+        @memoized(max_age=60, on_evict=evicted.append)
+        def test_function(a):
+            return [a]
+
+        first = test_function(1)
+        self.assertIs(test_function(1), first)
+        later = default_timer() + 60
+        with patch("superset.utils.core.default_timer", return_value=later):
+            self.assertIsNot(test_function(1), first)
+        self.assertEqual(evicted, [first])
+
     def test_memoized_on_methods_with_watches(self):
         class test_class:
             def __init__(self, x, y):
@@ -1193,3 +1229,29 @@ class TestUtils(SupersetTestCase):
         # test numeric epoch_ms format
         df = pd.DataFrame([{"__timestamp": ts.timestamp() * 1000, "a": 1}])
         assert normalize_col(df, "epoch_ms", 0, None)[DTTM_ALIAS][0] == ts
+
+    def test_parallel_map(self):
+        def get_user_and_thread(item):
+            return item, g.user, threading.get_ident()
+
+        with app.test_request_context():
+            g.user = security_manager.find_user(username="admin")
+            results = parallel_map(get_user_and_thread, [1, 2, 3, 4], max_workers=2)
+            assert [item for item, _, _ in results] == [1, 2, 3, 4]
+            assert {user.username for _, user, _ in results} == {"admin"}
+            assert threading.get_ident() not in {ident for _, _, ident in results}
+
+            # a single worker runs the function in the calling thread
+            results = parallel_map(get_user_and_thread, [1, 2], max_workers=1)
+            assert {ident for _, _, ident in results} == {threading.get_ident()}
+
+    @patch("superset.utils.core.sleep")
+    def test_rate_limiter(self, sleep):
+        with patch("superset.utils.core.default_timer", return_value=100.0):
+            rate_limiter = RateLimiter(rate=4)
+            for _ in range(3):
+                rate_limiter.wait()
+        self.assertEqual([call[0][0] for call in sleep.call_args_list], [0.25, 0.5])
+
+        RateLimiter().wait()
+        self.assertEqual(sleep.call_count, 2)
@@ -31,7 +31,7 @@ import superset.viz as viz
 from superset import app
 from superset.constants import NULL_STRING
 from superset.exceptions import QueryObjectValidationError, SpatialException
-from superset.utils.core import DTTM_ALIAS
+from superset.utils.core import DTTM_ALIAS, json_int_dttm_ser
 
 from .base_tests import SupersetTestCase
 from .utils import load_fixture
@@ -1282,6 +1282,39 @@ class TestTimeSeriesViz(SupersetTestCase):
         ]
         self.assertEqual(expected, viz_data)
 
+    def test_to_series_epoch_ms(self):
+        datasource = self.get_datasource_mock()
+        form_data = {"groupby": ["name"], "metrics": ["sum__payout"]}
+        index = pd.DatetimeIndex(["2018-02-20", "2018-03-09 12:30:00.5"])
+        df = pd.DataFrame(
+            {
+                ("sum__payout", "a"): [1.0, 2.0],
+                ("sum__payout", "b"): [np.nan, np.nan],
+                ("sum__payout", "c"): [3, 4],
+            },
+            index=index,
+        )
+        test_viz = viz.NVD3TimeSeriesViz(datasource, form_data)
+        xs = [json_int_dttm_ser(ts) for ts in index]
+        self.assertEqual(
+            [
+                {
+                    "key": ("a",),
+                    "values": [{"x": xs[0], "y": 1.0}, {"x": xs[1], "y": 2.0}],
+                },
+                {
+                    "key": ("c",),
+                    "values": [{"x": xs[0], "y": 3}, {"x": xs[1], "y": 4}],
+                },
+            ],
+            test_viz.to_series(df),
+        )
+
+        # timezone aware timestamps are serialized with their wall time
+        df.index = index.tz_localize("America/New_York")
+        series = test_viz.to_series(df)
+        self.assertEqual(xs, [value["x"] for value in series[0]["values"]])
+
     def test_process_data_resample(self):
         datasource = self.get_datasource_mock()
 